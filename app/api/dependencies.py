@@ -1,15 +1,27 @@
-from functools import lru_cache
 from typing import Dict, Any, Optional
 
 from app.config import get_settings
+from app.core.cache import TTLCache
 from app.infrastructure.ai.openai_client import OpenAIClient
 from app.infrastructure.ai.indobert import IndoBERTClient
 from app.infrastructure.scrapers.bpk_scraper import BPKScraper
 from app.services.document_service import DocumentService
 from app.services.query_service import QueryService
 
+# Number of distinct searches whose scraped documents are kept
+SEARCH_CACHE_SIZE = 256
+
+# Sentinel for singletons that have not been created yet (None is a valid value)
+_UNSET: Any = object()
+
+# Process-wide dependency instances
+_openai_client: Any = _UNSET
+_indobert_client: Any = _UNSET
+_bpk_scraper: Any = _UNSET
+_document_service: Any = _UNSET
+_query_service: Any = _UNSET
+
 
-@lru_cache()
 def get_openai_client() -> Optional[OpenAIClient]:
     """
     Get or create an OpenAI client instance.
@@ -17,11 +29,16 @@ def get_openai_client() -> Optional[OpenAIClient]:
     Returns:
         OpenAI client instance or None if disabled
     """
+    global _openai_client
+    if _openai_client is not _UNSET:
+        return _openai_client
+    
     settings = get_settings()
     
     # Check if OpenAI is enabled
     if not settings.ENABLE_OPENAI:
-        return None
+        _openai_client = None
+        return _openai_client
     
     # Create OpenAI client
     client = OpenAIClient(
@@ -30,11 +47,11 @@ def get_openai_client() -> Optional[OpenAIClient]:
         model=settings.OPENAI_MODEL
     )
     
-    # Return client only if it's available
-    return client if client.is_available else None
+    # Keep client only if it's available
+    _openai_client = client if client.is_available else None
+    return _openai_client
 
 
-@lru_cache()
 def get_indobert_client() -> Optional[IndoBERTClient]:
     """
     Get or create an IndoBERT client instance.
@@ -42,20 +59,31 @@ def get_indobert_client() -> Optional[IndoBERTClient]:
     Returns:
         IndoBERT client instance or None if disabled
     """
+    global _indobert_client
+    if _indobert_client is not _UNSET:
+        return _indobert_client
+    
     settings = get_settings()
     
     # Check if IndoBERT is enabled
     if not settings.ENABLE_INDOBERT:
-        return None
+        _indobert_client = None
+        return _indobert_client
     
     # Create IndoBERT client
-    client = IndoBERTClient(use_gpu=True)
+    client = IndoBERTClient(
+        use_gpu=True,
+        ct2_model_dir=settings.INDOBERT_CT2_MODEL_DIR,
+        model_name=settings.INDOBERT_MODEL_NAME,
+        compile_model=settings.INDOBERT_COMPILE,
+        batch_size=settings.INDOBERT_BATCH_SIZE or None
+    )
     
-    # Return client only if it's available
-    return client if client.is_available else None
+    # Keep client only if it's available
+    _indobert_client = client if client.is_available else None
+    return _indobert_client
 
 
-@lru_cache()
 def get_bpk_scraper() -> BPKScraper:
     """
     Get or create a BPK scraper instance.
@@ -63,6 +91,10 @@ def get_bpk_scraper() -> BPKScraper:
     Returns:
         BPK scraper instance
     """
+    global _bpk_scraper
+    if _bpk_scraper is not _UNSET:
+        return _bpk_scraper
+    
     settings = get_settings()
     
     # Get dependencies
@@ -70,16 +102,16 @@ def get_bpk_scraper() -> BPKScraper:
     indobert_client = get_indobert_client()
     
     # Create BPK scraper
-    scraper = BPKScraper(
+    _bpk_scraper = BPKScraper(
         openai_client=openai_client,
         indobert_client=indobert_client,
-        request_timeout=settings.REQUEST_TIMEOUT
+        request_timeout=settings.REQUEST_TIMEOUT,
+        query_enhance_min_words=settings.QUERY_ENHANCE_MIN_WORDS
     )
     
-    return scraper
+    return _bpk_scraper
 
 
-@lru_cache()
 def get_document_service() -> DocumentService:
     """
     Get or create a document service instance.
@@ -87,22 +119,31 @@ def get_document_service() -> DocumentService:
     Returns:
         Document service instance
     """
+    global _document_service
+    if _document_service is not _UNSET:
+        return _document_service
+    
+    settings = get_settings()
+    
     # Get dependencies
     bpk_scraper = get_bpk_scraper()
     openai_client = get_openai_client()
     indobert_client = get_indobert_client()
     
+    # Cache scraped documents if enabled
+    search_cache = TTLCache(ttl=settings.SEARCH_CACHE_TTL, maxsize=SEARCH_CACHE_SIZE) if settings.CACHE_RESULTS else None
+    
     # Create document service
-    service = DocumentService(
+    _document_service = DocumentService(
         bpk_scraper=bpk_scraper,
         openai_client=openai_client,
-        indobert_client=indobert_client
+        indobert_client=indobert_client,
+        search_cache=search_cache
     )
     
-    return service
+    return _document_service
 
 
-@lru_cache()
 def get_query_service() -> QueryService:
     """
     Get or create a query service instance.
@@ -110,14 +151,24 @@ def get_query_service() -> QueryService:
     Returns:
         Query service instance
     """
+    global _query_service
+    if _query_service is not _UNSET:
+        return _query_service
+    
+    settings = get_settings()
+    
     # Get dependencies
     document_service = get_document_service()
     openai_client = get_openai_client()
     
+    # Cache search results if enabled
+    result_cache = TTLCache(ttl=settings.CACHE_TTL) if settings.CACHE_RESULTS else None
+    
     # Create query service
-    service = QueryService(
+    _query_service = QueryService(
         document_service=document_service,
-        openai_client=openai_client
+        openai_client=openai_client,
+        result_cache=result_cache
     )
     
-    return service
\ No newline at end of file
+    return _query_service
\ No newline at end of file
@@ -1,10 +1,12 @@
-from typing import Dict, Any
-from datetime import datetime
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
+import logging
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+import orjson
+from fastapi import Request, Response, status
 from fastapi.exceptions import RequestValidationError
 
 from app.core.logging import get_logger
+from app.core.time_cache import iso_now
 from app.core.exceptions import (
     BaseAPIException, 
     DocumentNotFoundError, 
@@ -16,177 +18,114 @@ from app.core.exceptions import (
 
 logger = get_logger(__name__)
 
+# Status codes resolved once (starlette's status module may warn on each attribute lookup)
+_HTTP_422 = status.HTTP_422_UNPROCESSABLE_ENTITY
+_HTTP_500 = status.HTTP_500_INTERNAL_SERVER_ERROR
 
-async def validation_exception_handler(
-    request: Request, 
-    exc: RequestValidationError
-) -> JSONResponse:
-    """
-    Handle validation errors.
-    
-    Args:
-        request: FastAPI request
-        exc: Validation exception
-        
-    Returns:
-        JSON response with error details
-    """
-    errors = exc.errors()
-    error_messages = []
-    
-    for error in errors:
-        loc = " -> ".join([str(location) for location in error.get("loc", [])])
-        msg = error.get("msg", "")
-        error_messages.append(f"{loc}: {msg}")
-    
-    error_detail = "; ".join(error_messages)
-    logger.warning(f"Validation error: {error_detail}")
-    
-    return JSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={
-            "detail": error_detail,
-            "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
-            "timestamp": datetime.now().isoformat()
-        }
-    )
+# Error body template; detail is JSON-encoded separately and spliced in
+_ERROR_BODY = b'{"detail":%b,"status_code":%d,"timestamp":"%b"}'
+_JSON_MEDIA_TYPE = "application/json"
 
 
-async def api_exception_handler(
-    request: Request, 
-    exc: BaseAPIException
-) -> JSONResponse:
+def _error_response(
+    status_code: int,
+    detail: str,
+    headers: Optional[Dict[str, Any]] = None
+) -> Response:
     """
-    Handle API exceptions.
+    Build a pre-serialized JSON error response.
     
     Args:
-        request: FastAPI request
-        exc: API exception
+        status_code: HTTP status code
+        detail: Error detail message
+        headers: Optional response headers
         
     Returns:
-        JSON response with error details
+        Response with the JSON-encoded error body
     """
-    logger.error(f"API exception: {exc.detail}")
+    body = _ERROR_BODY % (orjson.dumps(detail), status_code, iso_now().encode())
     
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "detail": exc.detail,
-            "status_code": exc.status_code,
-            "timestamp": datetime.now().isoformat()
-        },
-        headers=exc.headers or {}
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type=_JSON_MEDIA_TYPE
     )
 
 
-async def document_not_found_handler(
-    request: Request, 
-    exc: DocumentNotFoundError
-) -> JSONResponse:
+@lru_cache(maxsize=256)
+def _format_error_location(loc: Tuple[Any, ...]) -> str:
     """
-    Handle document not found errors.
+    Format a validation error location, e.g. ('body', 'query') -> 'body -> query'.
+    
+    Locations repeat across requests for the same models, so results are cached.
     
     Args:
-        request: FastAPI request
-        exc: Document not found exception
+        loc: Location tuple from a validation error
         
     Returns:
-        JSON response with error details
+        Formatted location string
     """
-    logger.warning(f"Document not found: {exc.detail}")
-    
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "detail": exc.detail,
-            "status_code": exc.status_code,
-            "timestamp": datetime.now().isoformat()
-        }
-    )
+    return " -> ".join(map(str, loc))
 
 
-async def invalid_query_handler(
+async def validation_exception_handler(
     request: Request, 
-    exc: InvalidQueryError
-) -> JSONResponse:
+    exc: RequestValidationError
+) -> Response:
     """
-    Handle invalid query errors.
+    Handle validation errors.
     
     Args:
         request: FastAPI request
-        exc: Invalid query exception
+        exc: Validation exception
         
     Returns:
         JSON response with error details
     """
-    logger.warning(f"Invalid query: {exc.detail}")
-    
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "detail": exc.detail,
-            "status_code": exc.status_code,
-            "timestamp": datetime.now().isoformat()
-        }
+    error_detail = "; ".join(
+        f"{_format_error_location(tuple(error.get('loc', ())))}: {error.get('msg', '')}"
+        for error in exc.errors()
     )
+    logger.warning(f"Validation error: {error_detail}")
+    
+    return _error_response(_HTTP_422, error_detail)
 
 
-async def scraper_error_handler(
-    request: Request, 
-    exc: ScraperError
-) -> JSONResponse:
-    """
-    Handle scraper errors.
-    
-    Args:
-        request: FastAPI request
-        exc: Scraper exception
-        
-    Returns:
-        JSON response with error details
-    """
-    logger.error(f"Scraper error: {exc.detail}")
-    
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "detail": exc.detail,
-            "status_code": exc.status_code,
-            "timestamp": datetime.now().isoformat()
-        }
-    )
+# Log level and message prefix per API exception type
+_API_EXCEPTION_LOGGING: Dict[type, Tuple[int, str]] = {
+    DocumentNotFoundError: (logging.WARNING, "Document not found"),
+    InvalidQueryError: (logging.WARNING, "Invalid query"),
+    ScraperError: (logging.ERROR, "Scraper error"),
+    OpenAIError: (logging.ERROR, "OpenAI error"),
+}
+_DEFAULT_API_EXCEPTION_LOGGING: Tuple[int, str] = (logging.ERROR, "API exception")
 
 
-async def openai_error_handler(
+async def api_exception_handler(
     request: Request, 
-    exc: OpenAIError
-) -> JSONResponse:
+    exc: BaseAPIException
+) -> Response:
     """
-    Handle OpenAI errors.
+    Handle API exceptions, including all BaseAPIException subclasses.
     
     Args:
         request: FastAPI request
-        exc: OpenAI exception
+        exc: API exception
         
     Returns:
         JSON response with error details
     """
-    logger.error(f"OpenAI error: {exc.detail}")
+    level, prefix = _API_EXCEPTION_LOGGING.get(type(exc), _DEFAULT_API_EXCEPTION_LOGGING)
+    logger.log(level, f"{prefix}: {exc.detail}")
     
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "detail": exc.detail,
-            "status_code": exc.status_code,
-            "timestamp": datetime.now().isoformat()
-        }
-    )
+    return _error_response(exc.status_code, exc.detail, exc.headers)
 
 
 async def general_exception_handler(
     request: Request, 
     exc: Exception
-) -> JSONResponse:
+) -> Response:
     """
     Handle general exceptions.
     
@@ -199,11 +138,7 @@ async def general_exception_handler(
     """
     logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
     
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "detail": f"Internal server error: {str(exc)}",
-            "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
-            "timestamp": datetime.now().isoformat()
-        }
+    return _error_response(
+        _HTTP_500,
+        f"Internal server error: {str(exc)}"
     )
\ No newline at end of file
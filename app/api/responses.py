@@ -0,0 +1,39 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    """
+    Serialize objects that orjson does not handle natively.
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        A JSON-compatible representation of the object
+        
+    Raises:
+        TypeError: If the object cannot be serialized
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+    
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        """Render content as JSON bytes."""
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
\ No newline at end of file
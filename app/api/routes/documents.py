@@ -1,8 +1,13 @@
-from typing import List, Dict, Any, Optional
+import hashlib
+import mmap
+import tempfile
+from typing import List, Dict, Any, Optional, BinaryIO, Union
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Body, Query, Path
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 
+from app.config import get_settings
 from app.domain.models import Document
+from app.api.responses import ORJSONResponse
 from app.services.document_service import DocumentService
 from app.api.dependencies import get_document_service
 from app.core.exceptions import DocumentNotFoundError, ScraperError
@@ -12,12 +17,67 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+# Chunk size used when spooling uploads to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Accepted PDF media types and the magic bytes every PDF starts with
+_PDF_MIMES = frozenset({"application/pdf", "application/x-pdf", "application/acrobat", "applications/vnd.pdf"})
+_PDF_MAGIC = b"%PDF-"
+
+
+def _upload_document_id(pdf_content: Union[bytes, mmap.mmap]) -> str:
+    """
+    Generate a stable document ID for an uploaded PDF.
+    
+    Args:
+        pdf_content: Binary content of the PDF
+        
+    Returns:
+        Document ID derived from a blake2b digest of the content
+    """
+    return "upload_" + hashlib.blake2b(pdf_content, digest_size=8).hexdigest()
+
+
+async def _spool_upload(file: UploadFile, temp_file: BinaryIO, max_bytes: int) -> int:
+    """
+    Copy an uploaded file to a temporary file in chunks.
+    
+    Args:
+        file: Uploaded file
+        temp_file: Temporary file to write to
+        max_bytes: Maximum allowed upload size in bytes
+        
+    Returns:
+        Number of bytes written
+        
+    Raises:
+        HTTPException: If the upload exceeds the size limit
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Uploaded file exceeds the maximum size of {max_bytes} bytes"
+    )
+    
+    # Reject uploads with a known oversized body before reading them
+    if file.size and file.size > max_bytes:
+        raise too_large
+    
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise too_large
+        temp_file.write(chunk)
+    
+    temp_file.flush()
+    return size
+
 
 @router.get("/{document_id}", response_model=Dict[str, Any])
 async def get_document(
     document_id: str = Path(..., description="The document ID"),
     document_service: DocumentService = Depends(get_document_service)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Get a document by its ID.
     
@@ -32,17 +92,14 @@ async def get_document(
         # Get the document
         document = document_service.get_document_by_id(document_id)
         
-        # Convert document to dict
-        return {
+        # Serialize the document directly
+        return ORJSONResponse(content={
             "content": document.content,
             "metadata": document.metadata
-        }
-    except DocumentNotFoundError as e:
-        logger.warning(f"Document not found: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
-        )
+        })
+    except DocumentNotFoundError:
+        # Logged and rendered as a 404 error body by api_exception_handler
+        raise
     except Exception as e:
         logger.error(f"Unexpected error in get_document: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -56,7 +113,7 @@ async def extract_pdf_content(
     pdf_url: str = Body(..., description="URL of the PDF file"),
     title: Optional[str] = Body("PDF Document", description="Title of the document"),
     document_service: DocumentService = Depends(get_document_service)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Extract content from a PDF file.
     
@@ -69,8 +126,9 @@ async def extract_pdf_content(
         Document data with PDF content and metadata
     """
     try:
-        # Extract PDF content
-        document = document_service.extract_pdf_content(
+        # Extract PDF content in the threadpool (download and parsing are blocking)
+        document = await run_in_threadpool(
+            document_service.extract_pdf_content,
             pdf_url=pdf_url,
             title=title
         )
@@ -82,11 +140,13 @@ async def extract_pdf_content(
                 detail=f"Failed to extract content from PDF: {pdf_url}"
             )
         
-        # Convert document to dict
-        return {
+        # Serialize the document directly
+        return ORJSONResponse(content={
             "content": document.content,
             "metadata": document.metadata
-        }
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error extracting PDF content: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -100,7 +160,7 @@ async def upload_pdf(
     file: UploadFile = File(..., description="PDF file to upload"),
     title: str = Form("Uploaded PDF Document", description="Title of the document"),
     document_service: DocumentService = Depends(get_document_service)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Upload and extract content from a PDF file.
     
@@ -113,23 +173,44 @@ async def upload_pdf(
         Document data with PDF content and metadata
     """
     try:
-        # Check if file is a PDF
-        if not file.content_type or "pdf" not in file.content_type.lower():
+        # Check if file is a PDF (media type without parameters such as charset)
+        content_type = (file.content_type or "").split(";", 1)[0].strip().lower()
+        if content_type not in _PDF_MIMES:
             logger.warning(f"Uploaded file is not a PDF: {file.content_type}")
             raise HTTPException(
                 status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
                 detail="Uploaded file must be a PDF"
             )
         
-        # Read file content
-        pdf_content = await file.read()
+        # Check the magic bytes so a spoofed content type is rejected early
+        header = await file.read(len(_PDF_MAGIC))
+        if header != _PDF_MAGIC:
+            logger.warning(f"Uploaded file does not have a PDF header: {file.filename}")
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Uploaded file must be a PDF"
+            )
+        await file.seek(0)
         
-        # Extract content from PDF
-        content, metadata = document_service.pdf_extractor.extract_from_binary(
-            pdf_binary=pdf_content,
-            source=f"uploaded:{file.filename}",
-            title=title
-        )
+        with tempfile.TemporaryFile(suffix=".pdf") as temp_pdf:
+            # Spool the upload to disk instead of reading it into memory
+            size = await _spool_upload(file, temp_pdf, get_settings().MAX_UPLOAD_BYTES)
+        
+            content, metadata, doc_id = None, None, None
+            if size:
+                # Parse from a memory-mapped view so the PDF is paged in on demand
+                with mmap.mmap(temp_pdf.fileno(), 0, access=mmap.ACCESS_READ) as pdf_view:
+                    # Extract content from PDF in the threadpool (parsing is CPU-bound)
+                    content, metadata = await run_in_threadpool(
+                        document_service.pdf_extractor.extract_from_binary,
+                        pdf_binary=pdf_view,
+                        source=f"uploaded:{file.filename}",
+                        title=title
+                    )
+                    
+                    # Generate a document ID (hashed off the event loop for large files)
+                    if content:
+                        doc_id = await run_in_threadpool(_upload_document_id, pdf_view)
         
         if not content:
             logger.warning(f"Failed to extract content from uploaded PDF: {file.filename}")
@@ -140,19 +221,16 @@ async def upload_pdf(
         
         # Create a document
         document = Document(content=content, metadata=metadata)
-        
-        # Generate a document ID
-        doc_id = f"upload_{hash(content)}"
         document.metadata['id'] = doc_id
         
         # Store the document
         document_service.documents[doc_id] = document
         
-        # Convert document to dict
-        return {
+        # Serialize the document directly
+        return ORJSONResponse(content={
             "content": document.content,
             "metadata": document.metadata
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -1,9 +1,13 @@
+import re
 from typing import List, Dict, Any
+from urllib.parse import quote
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Body, Query
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import ValidationError
 
 from app.domain.models import SearchRequest, SearchResult, UserPreferences, Document
+from app.api.responses import ORJSONResponse
 from app.services.query_service import QueryService
 from app.api.dependencies import get_query_service
 from app.core.exceptions import InvalidQueryError, ScraperError
@@ -13,12 +17,58 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+# Characters kept as-is in the plain ``filename=`` fallback
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
 
-@router.post("/query", response_model=SearchResult)
+
+def _attachment_disposition(filename: str) -> str:
+    """
+    Build a Content-Disposition header for a file download (RFC 6266).
+    
+    Args:
+        filename: Download filename, possibly containing non-ASCII characters
+        
+    Returns:
+        Header value with an ASCII ``filename`` fallback and a UTF-8 ``filename*``
+    """
+    ascii_name = _UNSAFE_FILENAME_CHARS.sub("_", filename)
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def _render_search_report(
+    query_service: QueryService,
+    query: str,
+    preferences: UserPreferences
+) -> str:
+    """
+    Process a query and render its results as an HTML report.
+    
+    Args:
+        query_service: Query service instance
+        query: The search query
+        preferences: User preferences for response formatting
+        
+    Returns:
+        HTML report content
+    """
+    result = query_service.process_query(query=query, user_preferences=preferences)
+    
+    # Convert documents back to Document objects (built by the service, so skip revalidation)
+    documents = [Document.from_dict(doc, _trusted=True) for doc in result.documents]
+    
+    # Render the report in memory
+    return query_service.render_report(
+        query=result.original_query,
+        documents=documents,
+        response=result.response
+    )
+
+
+@router.post("/query", response_model=None, responses={200: {"model": SearchResult}})
 async def search_query(
     request: SearchRequest,
     query_service: QueryService = Depends(get_query_service)
-) -> SearchResult:
+) -> ORJSONResponse:
     """
     Search for legal documents based on a query.
     
@@ -30,13 +80,14 @@ async def search_query(
         Search result with documents and response
     """
     try:
-        # Process the query
-        result = query_service.process_query(
+        # Process the query in the threadpool (scraping is blocking)
+        result = await run_in_threadpool(
+            query_service.process_query,
             query=request.query,
             user_preferences=request.preferences
         )
         
-        return result
+        return ORJSONResponse(content=result.model_dump())
     except InvalidQueryError as e:
         logger.warning(f"Invalid query: {str(e)}")
         raise HTTPException(
@@ -57,7 +108,7 @@ async def search_query(
         )
 
 
-@router.get("/simple", response_model=SearchResult)
+@router.get("/simple", response_model=None, responses={200: {"model": SearchResult}})
 async def simple_search(
     query: str = Query(..., description="The search query"),
     max_results: int = Query(10, ge=1, le=50, description="Maximum number of results to return"),
@@ -65,7 +116,7 @@ async def simple_search(
     format: str = Query("simple", description="Response format (simple, legal, technical)"),
     citations: bool = Query(True, description="Whether to include citations"),
     query_service: QueryService = Depends(get_query_service)
-) -> SearchResult:
+) -> ORJSONResponse:
     """
     Simple search endpoint with query parameters.
     
@@ -89,13 +140,14 @@ async def simple_search(
             max_results=max_results
         )
         
-        # Process the query
-        result = query_service.process_query(
+        # Process the query in the threadpool (scraping is blocking)
+        result = await run_in_threadpool(
+            query_service.process_query,
             query=query,
             user_preferences=preferences
         )
         
-        return result
+        return ORJSONResponse(content=result.model_dump())
     except InvalidQueryError as e:
         logger.warning(f"Invalid query: {str(e)}")
         raise HTTPException(
@@ -110,11 +162,11 @@ async def simple_search(
         )
 
 
-@router.post("/report", response_class=FileResponse)
+@router.post("/report", response_class=HTMLResponse)
 async def generate_report(
     request: SearchRequest,
     query_service: QueryService = Depends(get_query_service)
-) -> FileResponse:
+) -> HTMLResponse:
     """
     Generate an HTML report of search results.
     
@@ -123,36 +175,22 @@ async def generate_report(
         query_service: Query service instance
         
     Returns:
-        HTML report file
+        HTML report as a file download
     """
     try:
-        # Process the query
-        result = query_service.process_query(
-            query=request.query,
-            user_preferences=request.preferences
-        )
-        
-        # Convert documents back to Document objects
-        documents = [
-            Document(
-                content=doc["content"],
-                metadata=doc["metadata"]
-            )
-            for doc in result.documents
-        ]
-        
-        # Generate the report
-        report_path = query_service.generate_report(
-            query=result.original_query,
-            documents=documents,
-            response=result.response
+        # Search and render in one threadpool call (scraping is blocking)
+        report_html = await run_in_threadpool(
+            _render_search_report,
+            query_service,
+            request.query,
+            request.preferences
         )
         
-        # Return the report file
-        return FileResponse(
-            path=report_path,
-            media_type="text/html",
-            filename=f"legal_report_{request.query.replace(' ', '_')}.html"
+        # Return the report as a download (the query is escaped inside the header)
+        filename = f"legal_report_{request.query.replace(' ', '_')}.html"
+        return HTMLResponse(
+            content=report_html,
+            headers={"Content-Disposition": _attachment_disposition(filename)}
         )
     except Exception as e:
         logger.error(f"Error generating report: {str(e)}", exc_info=True)
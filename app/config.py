@@ -1,50 +1,93 @@
 import os
-from functools import lru_cache
+from dataclasses import dataclass, field
 from typing import Optional
-from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 
-class Settings(BaseSettings):
+def _env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Read a string environment variable."""
+    return os.environ.get(name, default)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable."""
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+_TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "f", "no", "n", "off"})
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable, rejecting unrecognised values."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    normalized = value.strip().lower()
+    if normalized in _TRUE_VALUES:
+        return True
+    if normalized in _FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid boolean value for {name}: {value!r}")
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """Application settings loaded from environment variables."""
     
     # API settings
-    API_V1_STR: str = "/api/v1"
-    PROJECT_NAME: str = "BPK Legal Document API"
-    DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+    API_V1_STR: str = field(default_factory=lambda: _env_str("API_V1_STR", "/api/v1"))
+    PROJECT_NAME: str = field(default_factory=lambda: _env_str("PROJECT_NAME", "BPK Legal Document API"))
+    DEBUG: bool = field(default_factory=lambda: _env_bool("DEBUG", False))
+    THREADPOOL_SIZE: int = field(default_factory=lambda: _env_int("THREADPOOL_SIZE", 40))
     
     # OpenAI settings
-    OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
-    OPENAI_BASE_URL: Optional[str] = os.getenv(
+    OPENAI_API_KEY: Optional[str] = field(default_factory=lambda: _env_str("OPENAI_API_KEY"))
+    OPENAI_BASE_URL: Optional[str] = field(default_factory=lambda: _env_str(
         "OPENAI_BASE_URL", 
         "https://dashscope-intl.aliyuncs.com/compatible-mode/v1"
-    )
-    OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "qwen2.5-72b-instruct")
+    ))
+    OPENAI_MODEL: str = field(default_factory=lambda: _env_str("OPENAI_MODEL", "qwen2.5-72b-instruct"))
+    QUERY_ENHANCE_MIN_WORDS: int = field(default_factory=lambda: _env_int("QUERY_ENHANCE_MIN_WORDS", 3))
     
     # Scraper settings
-    MAX_PAGES_DEFAULT: int = int(os.getenv("MAX_PAGES_DEFAULT", "5"))
-    MAX_RESULTS_DEFAULT: int = int(os.getenv("MAX_RESULTS_DEFAULT", "10"))
-    REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
+    MAX_PAGES_DEFAULT: int = field(default_factory=lambda: _env_int("MAX_PAGES_DEFAULT", 5))
+    MAX_RESULTS_DEFAULT: int = field(default_factory=lambda: _env_int("MAX_RESULTS_DEFAULT", 10))
+    REQUEST_TIMEOUT: int = field(default_factory=lambda: _env_int("REQUEST_TIMEOUT", 30))
+    MAX_UPLOAD_BYTES: int = field(default_factory=lambda: _env_int("MAX_UPLOAD_BYTES", 50 * 1024 * 1024))  # 50 MB
     
     # Feature toggles
-    ENABLE_BPK_SCRAPER: bool = os.getenv("ENABLE_BPK_SCRAPER", "True").lower() == "true"
-    ENABLE_PERATURAN_SCRAPER: bool = os.getenv("ENABLE_PERATURAN_SCRAPER", "True").lower() == "true"
-    ENABLE_OPENAI: bool = os.getenv("ENABLE_OPENAI", "True").lower() == "true"
-    ENABLE_INDOBERT: bool = os.getenv("ENABLE_INDOBERT", "True").lower() == "true"
+    ENABLE_BPK_SCRAPER: bool = field(default_factory=lambda: _env_bool("ENABLE_BPK_SCRAPER", True))
+    ENABLE_PERATURAN_SCRAPER: bool = field(default_factory=lambda: _env_bool("ENABLE_PERATURAN_SCRAPER", True))
+    ENABLE_OPENAI: bool = field(default_factory=lambda: _env_bool("ENABLE_OPENAI", True))
+    ENABLE_INDOBERT: bool = field(default_factory=lambda: _env_bool("ENABLE_INDOBERT", True))
     
-    # Cache settings
-    CACHE_RESULTS: bool = os.getenv("CACHE_RESULTS", "True").lower() == "true"
-    CACHE_TTL: int = int(os.getenv("CACHE_TTL", "3600"))  # 1 hour in seconds
+    # IndoBERT settings
+    INDOBERT_MODEL_NAME: str = field(default_factory=lambda: _env_str(
+        "INDOBERT_MODEL_NAME", 
+        "indolem/indobert-base-uncased"
+    ))
+    INDOBERT_COMPILE: bool = field(default_factory=lambda: _env_bool("INDOBERT_COMPILE", False))
+    INDOBERT_BATCH_SIZE: int = field(default_factory=lambda: _env_int("INDOBERT_BATCH_SIZE", 0))  # 0 picks one for the device
+    INDOBERT_CT2_MODEL_DIR: Optional[str] = field(default_factory=lambda: _env_str("INDOBERT_CT2_MODEL_DIR"))
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # Cache settings
+    CACHE_RESULTS: bool = field(default_factory=lambda: _env_bool("CACHE_RESULTS", True))
+    CACHE_TTL: int = field(default_factory=lambda: _env_int("CACHE_TTL", 3600))  # 1 hour in seconds
+    SEARCH_CACHE_TTL: int = field(default_factory=lambda: _env_int("SEARCH_CACHE_TTL", 300))  # 5 minutes in seconds
+
+
+# Process-wide settings instance
+_settings: Optional[Settings] = None
 
 
-@lru_cache()
 def get_settings() -> Settings:
     """Get the application settings from cache."""
-    return Settings()
\ No newline at end of file
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
\ No newline at end of file
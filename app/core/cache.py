@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory LRU cache with per-entry expiry.
+    
+    Keys are tuples so that related entries can be invalidated together
+    by a shared key prefix, e.g. ``invalidate("query text")`` drops every
+    cached variant of that query.
+    """
+    
+    def __init__(self, ttl: int = 3600, maxsize: int = 1024):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl: Time to live for each entry in seconds
+            maxsize: Maximum number of entries before the least recently used is evicted
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """
+        Store a value in the cache.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            
+            # Evict least recently used entries
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def invalidate(self, *prefix: Hashable) -> int:
+        """
+        Remove every entry whose key starts with the given prefix.
+        
+        Args:
+            prefix: Leading key elements to match (empty clears the cache)
+            
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if not prefix:
+                removed = len(self._data)
+                self._data.clear()
+                return removed
+            
+            size = len(prefix)
+            stale = [key for key in self._data if key[:size] == prefix]
+            for key in stale:
+                del self._data[key]
+            return len(stale)
+    
+    def __len__(self) -> int:
+        """Get the number of stored entries (including expired ones not yet purged)."""
+        return len(self._data)
\ No newline at end of file
@@ -4,6 +4,8 @@ from typing import Any, Dict, Optional
 class BaseAPIException(Exception):
     """Base exception for API errors."""
     
+    __slots__ = ("status_code", "detail", "headers", "_str")
+    
     def __init__(
         self,
         status_code: int = 500,
@@ -13,15 +15,18 @@ class BaseAPIException(Exception):
         self.status_code = status_code
         self.detail = detail
         self.headers = headers
+        self._str = f"{status_code}: {detail}"
         super().__init__(self.detail)
     
     def __str__(self) -> str:
-        return f"{self.status_code}: {self.detail}"
+        return self._str
 
 
 class DocumentNotFoundError(BaseAPIException):
     """Exception raised when a document is not found."""
     
+    __slots__ = ()
+    
     def __init__(self, document_id: str):
         super().__init__(
             status_code=404,
@@ -32,6 +37,8 @@ class DocumentNotFoundError(BaseAPIException):
 class InvalidQueryError(BaseAPIException):
     """Exception raised when a query is invalid."""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Invalid query"):
         super().__init__(
             status_code=400,
@@ -42,6 +49,8 @@ class InvalidQueryError(BaseAPIException):
 class ScraperError(BaseAPIException):
     """Exception raised when there's an error with the scraper."""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Error scraping data"):
         super().__init__(
             status_code=500,
@@ -52,6 +61,8 @@ class ScraperError(BaseAPIException):
 class OpenAIError(BaseAPIException):
     """Exception raised when there's an error with OpenAI."""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "OpenAI API error"):
         super().__init__(
             status_code=500,
@@ -62,6 +73,8 @@ class OpenAIError(BaseAPIException):
 class InternalServerError(BaseAPIException):
     """Exception raised for internal server errors."""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Internal server error"):
         super().__init__(
             status_code=500,
@@ -72,6 +85,8 @@ class InternalServerError(BaseAPIException):
 class UnauthorizedError(BaseAPIException):
     """Exception raised when a user is not authorized."""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Unauthorized"):
         super().__init__(
             status_code=401,
@@ -82,6 +97,8 @@ class UnauthorizedError(BaseAPIException):
 class ResourceExistsError(BaseAPIException):
     """Exception raised when a resource already exists."""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Resource already exists"):
         super().__init__(
             status_code=409,
@@ -92,6 +109,8 @@ class ResourceExistsError(BaseAPIException):
 class DependencyNotFoundError(BaseAPIException):
     """Exception raised when a required dependency is not found."""
     
+    __slots__ = ()
+    
     def __init__(self, dependency_name: str):
         super().__init__(
             status_code=500,
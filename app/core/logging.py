@@ -1,14 +1,84 @@
+import atexit
 import logging
+import queue
 import sys
-from typing import Any, Dict, List, Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel
-import json
+import orjson
 from datetime import datetime
 
 # Configure logging
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_LEVEL = logging.INFO
 
+# Standard LogRecord attributes that are not copied into JSON logs as extras
+_RESERVED_ATTRS = frozenset({
+    "args", "asctime", "created", "exc_info", "exc_text", "filename",
+    "funcName", "id", "levelname", "levelno", "lineno", "module",
+    "msecs", "message", "msg", "name", "pathname", "process",
+    "processName", "relativeCreated", "stack_info", "taskName", "thread", "threadName"
+})
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """Queue handler for records consumed by a listener in the same process."""
+    
+    def __init__(self, log_queue: "queue.SimpleQueue", targets: List[logging.Handler]):
+        """
+        Initialize the handler.
+        
+        Args:
+            log_queue: Queue shared with the background listener
+            targets: Handlers the listener writes this logger's records to
+        """
+        super().__init__(log_queue)
+        self.targets = targets
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Prepare a record for queuing.
+        
+        The default implementation formats the record and drops exc_info so it
+        can be pickled. Records never leave the process here, so only the message
+        is resolved and exception info is kept for the downstream formatters.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue the record together with the handlers it is written to."""
+        self.queue.put_nowait((self.targets, record))
+
+
+class _DispatchingQueueListener(QueueListener):
+    """Queue listener that writes each record to the handlers queued with it."""
+    
+    def handle(self, item: Tuple[List[logging.Handler], logging.LogRecord]) -> None:
+        """Write a queued record to its logger's handlers."""
+        targets, record = item
+        for handler in targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class _LogState:
+    """Queue, listener and output handlers shared by every configured logger."""
+    
+    def __init__(self):
+        self.queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.listener: Optional[_DispatchingQueueListener] = None
+        
+        # Console/file handlers keyed by (log file, JSON format) so a file is opened once
+        self.outputs: Dict[Tuple[Optional[str], bool], List[logging.Handler]] = {}
+        
+        # Queue handler installed on each configured logger, keyed by logger name
+        self.queued: Dict[str, _InProcessQueueHandler] = {}
+
+
+_state = _LogState()
+
 
 class JsonFormatter(logging.Formatter):
     """Formatter for JSON-structured logs."""
@@ -24,10 +94,34 @@ class JsonFormatter(logging.Formatter):
     ):
         super().__init__(fmt, datefmt, style, validate, defaults=defaults)
     
+        # Per-second cache of the formatted timestamp without microseconds
+        self._cached_second = None
+        self._cached_second_iso = ""
+    
+    def _format_timestamp(self, created: float) -> str:
+        """
+        Format a record creation time as an ISO 8601 string.
+        
+        Args:
+            created: Record creation time (seconds since the epoch)
+            
+        Returns:
+            ISO 8601 timestamp, identical to datetime.isoformat()
+        """
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_second_iso = datetime.fromtimestamp(second).isoformat()
+            self._cached_second = second
+        
+        microsecond = round((created - second) * 1_000_000)
+        if microsecond <= 0 or microsecond >= 1_000_000:
+            return datetime.fromtimestamp(created).isoformat()
+        return f"{self._cached_second_iso}.{microsecond:06d}"
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format LogRecord as JSON."""
         log_data = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": self._format_timestamp(record.created),
             "level": record.levelname,
             "name": record.name,
             "message": record.getMessage(),
@@ -36,21 +130,18 @@ class JsonFormatter(logging.Formatter):
             "thread": record.thread
         }
         
-        # Add exception info if present
+        # Add exception info if present (cached on the record like logging.Formatter)
         if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            log_data["exception"] = record.exc_text
         
         # Add any extra attributes
         for key, value in record.__dict__.items():
-            if key not in [
-                "args", "asctime", "created", "exc_info", "exc_text", "filename",
-                "funcName", "id", "levelname", "levelno", "lineno", "module",
-                "msecs", "message", "msg", "name", "pathname", "process",
-                "processName", "relativeCreated", "stack_info", "thread", "threadName"
-            ]:
+            if key not in _RESERVED_ATTRS:
                 log_data[key] = value
         
-        return json.dumps(log_data)
+        return orjson.dumps(log_data, default=str).decode("utf-8")
 
 
 def setup_logging(
@@ -77,27 +168,67 @@ def setup_logging(
     
     # Clear existing handlers
     logger.handlers = []
+    _state.queued.pop(name, None)
     
-    # Create formatter
-    if json_format:
-        formatter = JsonFormatter()
-    else:
-        formatter = logging.Formatter(LOG_FORMAT)
+    # Console and file handlers are shared by loggers with the same output
+    key = (log_file, json_format)
+    handlers = _state.outputs.get(key)
+    if handlers is None:
+        # Create formatter
+        if json_format:
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(LOG_FORMAT)
+        
+        # Console handler
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+        handlers = [console_handler]
+        
+        # File handler (if log_file is provided)
+        if log_file:
+            file_handler = logging.FileHandler(log_file)
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+        
+        _state.outputs[key] = handlers
     
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    # Queue records and write them from a single background thread so that
+    # console/file I/O stays off the request path
+    queue_handler = _InProcessQueueHandler(_state.queue, handlers)
+    logger.addHandler(queue_handler)
+    _state.queued[name] = queue_handler
     
-    # File handler (if log_file is provided)
-    if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+    if _state.listener is None:
+        _state.listener = _DispatchingQueueListener(_state.queue, respect_handler_level=True)
+        _state.listener.start()
     
     return logger
 
 
+def shutdown_logging() -> None:
+    """
+    Flush queued log records and stop the background listener.
+    
+    Loggers set up through the queue write directly to their handlers afterwards,
+    so records logged later (e.g. during interpreter exit) are not lost.
+    """
+    # Detach the queue first so no record is queued after the listener stops
+    while _state.queued:
+        name, queue_handler = _state.queued.popitem()
+        logger = logging.getLogger(name)
+        logger.removeHandler(queue_handler)
+        for handler in queue_handler.targets:
+            logger.addHandler(handler)
+    
+    if _state.listener is not None:
+        _state.listener.stop()
+        _state.listener = None
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger with the given name.
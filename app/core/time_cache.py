@@ -0,0 +1,25 @@
+import time
+from datetime import datetime
+
+# Last formatted second and its ISO representation
+_cached_epoch: int = 0
+_cached_iso: str = ""
+
+
+def iso_now() -> str:
+    """
+    Get the current local time as an ISO 8601 string, cached per second.
+    
+    Concurrent callers may occasionally format the same second twice,
+    which is harmless.
+    
+    Returns:
+        ISO 8601 timestamp with one-second resolution
+    """
+    global _cached_epoch, _cached_iso
+    
+    now = int(time.time())
+    if now != _cached_epoch:
+        _cached_iso = datetime.fromtimestamp(now).isoformat()
+        _cached_epoch = now
+    return _cached_iso
\ No newline at end of file
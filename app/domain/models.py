@@ -1,10 +1,18 @@
 from typing import Dict, Any, Optional, List, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
+# LangChain is optional; resolve its Document class once at import time
+try:
+    from langchain_core.documents import Document as _LangChainDocument
+except ImportError:
+    _LangChainDocument = None
+
 
 class Document(BaseModel):
     """Document model representing a legal document."""
+    model_config = ConfigDict(frozen=True)
+    
     content: str = Field(..., description="The document content")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Document metadata")
     
@@ -15,26 +23,37 @@ class Document(BaseModel):
     
     def to_langchain_document(self):
         """Convert to LangChain Document format if available."""
-        try:
-            from langchain_core.documents import Document as LangChainDocument
-            return LangChainDocument(page_content=self.content, metadata=self.metadata)
-        except ImportError:
+        if _LangChainDocument is None:
             return self
+        return _LangChainDocument(page_content=self.content, metadata=self.metadata)
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "Document":
-        """Create a Document from a dictionary."""
+    def from_dict(cls, data: Dict[str, Any], *, _trusted: bool = False) -> "Document":
+        """
+        Create a Document from a dictionary.
+        
+        Args:
+            data: Dictionary with ``content`` (or ``page_content``) and ``metadata``
+            _trusted: Skip validation for dictionaries built internally
+            
+        Returns:
+            Document instance
+        """
         if not isinstance(data, dict):
             raise ValueError("Data must be a dictionary")
         
         content = data.get("page_content") or data.get("content", "")
         metadata = data.get("metadata", {})
         
+        if _trusted:
+            return cls.model_construct(content=content, metadata=metadata)
         return cls(content=content, metadata=metadata)
 
 
 class SearchQuery(BaseModel):
     """Model representing a search query."""
+    model_config = ConfigDict(frozen=True)
+    
     query: str = Field(..., min_length=1, description="The search query")
     max_pages: int = Field(default=5, ge=1, le=20, description="Maximum number of pages to search")
     max_results: int = Field(default=10, ge=1, le=50, description="Maximum number of results to return")
@@ -42,6 +61,8 @@ class SearchQuery(BaseModel):
 
 class UserPreferences(BaseModel):
     """Model representing user preferences for response formatting."""
+    model_config = ConfigDict(frozen=True, use_enum_values=True)
+    
     verbosity: str = Field(
         default="detailed", 
         description="Response verbosity level"
@@ -60,13 +81,12 @@ class UserPreferences(BaseModel):
         le=20, 
         description="Maximum number of results to return"
     )
-    
-    class Config:
-        use_enum_values = True
 
 
 class SearchRequest(BaseModel):
     """Model representing a search request with query and preferences."""
+    model_config = ConfigDict(frozen=True)
+    
     query: str = Field(..., min_length=1, description="The search query")
     preferences: Optional[UserPreferences] = Field(
         default=None, 
@@ -76,6 +96,8 @@ class SearchRequest(BaseModel):
 
 class SearchResult(BaseModel):
     """Model representing a search result."""
+    model_config = ConfigDict(frozen=True)
+    
     original_query: str = Field(..., description="The original search query")
     keywords: List[str] = Field(default_factory=list, description="Keywords extracted from the query")
     documents: List[Dict[str, Any]] = Field(default_factory=list, description="Retrieved documents")
@@ -85,6 +107,8 @@ class SearchResult(BaseModel):
 
 class ErrorResponse(BaseModel):
     """Model representing an error response."""
+    model_config = ConfigDict(frozen=True)
+    
     detail: str = Field(..., description="Error detail")
     status_code: int = Field(..., description="HTTP status code")
     timestamp: datetime = Field(default_factory=datetime.now, description="Time of the error")
\ No newline at end of file
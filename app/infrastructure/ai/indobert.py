@@ -1,27 +1,56 @@
+import hashlib
 import os
 import numpy as np
-from typing import List, Any, Dict, Optional
+from typing import List, Any, Dict, Optional, Tuple, Union
+from app.core.cache import TTLCache
 from app.core.logging import get_logger
 from app.core.exceptions import DependencyNotFoundError
 
 logger = get_logger(__name__)
 
+# Default encoder (smaller distilled encoders with the same interface can be used instead)
+DEFAULT_MODEL_NAME = "indolem/indobert-base-uncased"
+
+# Size of IndoBERT base embeddings
+EMBEDDING_DIM = 768
+
+# Embedding cache limits (keys are content digests, so the TTL only bounds idle memory)
+EMBEDDING_CACHE_SIZE = 10_000
+EMBEDDING_CACHE_TTL = 24 * 3600
+
 
 class IndoBERTClient:
     """Client for generating embeddings using IndoBERT model."""
     
-    def __init__(self, use_gpu: bool = True):
+    def __init__(
+        self,
+        use_gpu: bool = True,
+        ct2_model_dir: Optional[str] = None,
+        model_name: str = DEFAULT_MODEL_NAME,
+        compile_model: bool = False,
+        batch_size: Optional[int] = None
+    ):
         """
         Initialize the IndoBERT embeddings model.
         
         Args:
             use_gpu: Whether to use GPU if available
+            ct2_model_dir: Directory of a CTranslate2-converted IndoBERT model
+                (used instead of the Transformers model when set and available)
+            model_name: Hugging Face name of the encoder model and tokenizer
+            compile_model: Whether to compile the Transformers model with torch.compile
+            batch_size: Number of texts embedded per forward pass (None picks one for the device)
         """
         self.model = None
+        self.encoder = None
         self.tokenizer = None
         self.device = None
+        self.batch_size = batch_size or 16
         self.is_available = False
         
+        # Embeddings of recently seen texts (queries and document excerpts repeat)
+        self._embedding_cache = TTLCache(ttl=EMBEDDING_CACHE_TTL, maxsize=EMBEDDING_CACHE_SIZE)
+        
         try:
             # Try importing required packages
             import torch
@@ -34,22 +63,42 @@ class IndoBERTClient:
             # Set environment variables to suppress warnings
             os.environ["TOKENIZERS_PARALLELISM"] = "false"
             
-            # Load IndoBERT tokenizer and model
-            model_name = "indolem/indobert-base-uncased"
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModel.from_pretrained(model_name)
-            
-            # Move model to GPU if available and requested
+            # Use GPU if available and requested
             if use_gpu and torch.cuda.is_available():
                 self.device = torch.device("cuda")
                 logger.info("Using GPU for IndoBERT model")
+                
+                # Allow TF32 tensor cores for any float32 matmuls left outside autocast
+                torch.backends.cuda.matmul.allow_tf32 = True
+                torch.set_float32_matmul_precision("high")
             else:
                 self.device = torch.device("cpu")
                 logger.info("Using CPU for IndoBERT model")
             
-            self.model.to(self.device)
+            # Load IndoBERT tokenizer
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+            
+            # Prefer the quantized CTranslate2 encoder when one has been converted
+            if ct2_model_dir:
+                self.encoder = self._load_ct2_encoder(ct2_model_dir)
+            
+            if self.encoder is None:
+                # Load IndoBERT model (PyTorch scaled-dot-product attention)
+                self.model = AutoModel.from_pretrained(model_name, attn_implementation="sdpa")
+                self.model.to(self.device)
+            
+                # Run in half precision on GPU (embeddings are only used for cosine ranking)
+                if self.device.type == "cuda":
+                    self.model = self.model.half()
+                
+                # Graph-compile the forward pass (torch 2.x, shapes vary with batch padding)
+                if compile_model and hasattr(torch, "compile"):
+                    self.model = torch.compile(self.model, dynamic=True)
+            
+            # Larger batches pay off on GPU; keep CPU batches small
+            self.batch_size = batch_size or (32 if self.device.type == "cuda" else 16)
             self.is_available = True
-            logger.info("IndoBERT model loaded successfully")
+            logger.info(f"IndoBERT model {model_name} loaded successfully")
         except ImportError as e:
             logger.warning(f"IndoBERT dependencies not available: {str(e)}")
             self.is_available = False
@@ -57,7 +106,30 @@ class IndoBERTClient:
             logger.error(f"Error loading IndoBERT model: {str(e)}")
             self.is_available = False
     
-    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def _load_ct2_encoder(self, model_dir: str) -> Optional[Any]:
+        """
+        Load a CTranslate2 IndoBERT encoder.
+        
+        Args:
+            model_dir: Directory of the converted model
+            
+        Returns:
+            CTranslate2 encoder, or None if CTranslate2 is not installed
+        """
+        try:
+            import ctranslate2
+        except ImportError:
+            logger.warning("CTranslate2 not available, using the Transformers IndoBERT model")
+            return None
+        
+        # int8 weights, with float16 activations on GPU
+        compute_type = "int8_float16" if self.device.type == "cuda" else "int8"
+        encoder = ctranslate2.Encoder(model_dir, device=self.device.type, compute_type=compute_type)
+        logger.info(f"Using CTranslate2 IndoBERT encoder ({compute_type}) from {model_dir}")
+        
+        return encoder
+    
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for a list of texts.
         
@@ -65,30 +137,97 @@ class IndoBERTClient:
             texts: List of texts to generate embeddings for
             
         Returns:
-            List of embeddings as lists of floats
+            Array of embeddings with one row per text
         """
         if not self.is_available:
             logger.warning("IndoBERT is not available, returning empty embeddings")
-            return [[0.0] * 768] * len(texts)  # Return dummy embeddings
+            return np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)  # Return dummy embeddings
+        
+        if not texts:
+            return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
         
         try:
-            import torch
+            keys = [self._embedding_cache_key(text) for text in texts]
+            embeddings = [self._embedding_cache.get(key) for key in keys]
             
-            embeddings = []
+            # Unique texts that are not cached yet
+            pending = {key: text for key, text, embedding in zip(keys, texts, embeddings) if embedding is None}
             
-            # Process texts in batches
-            batch_size = 8  # Adjust based on available memory
-            for i in range(0, len(texts), batch_size):
-                batch_texts = texts[i:i+batch_size]
-                batch_embeddings = self._get_batch_embeddings(batch_texts)
-                embeddings.extend(batch_embeddings)
+            if pending:
+                computed = dict(zip(pending, self._embed_sorted_by_length(list(pending.values()))))
+                for key, embedding in computed.items():
+                    self._embedding_cache.set(key, embedding)
+                
+                embeddings = [
+                    computed[key] if embedding is None else embedding
+                    for key, embedding in zip(keys, embeddings)
+                ]
             
-            return embeddings
+            return np.stack(embeddings)
         except Exception as e:
             logger.error(f"Error generating embeddings: {str(e)}")
-            return [[0.0] * 768] * len(texts)  # Return dummy embeddings
+            return np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)  # Return dummy embeddings
+    
+    def get_embeddings_as_list(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for a list of texts as JSON-serializable lists.
+        
+        Args:
+            texts: List of texts to generate embeddings for
+            
+        Returns:
+            List of embeddings as lists of floats
+        """
+        return self.get_embeddings(texts).tolist()
+    
+    @staticmethod
+    def _embedding_cache_key(text: str) -> Tuple[bytes]:
+        """
+        Get the embedding cache key for a text.
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Cache key derived from a digest of the text
+        """
+        return (hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(),)
     
-    def _get_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def _embed_sorted_by_length(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings in batches of texts with similar token lengths.
+        
+        Args:
+            texts: List of texts to generate embeddings for
+            
+        Returns:
+            Array of embeddings in the order of the input texts
+        """
+        # Token length of each text (one fast batched tokenizer call, no tensors)
+        token_ids = self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            truncation=True,
+            max_length=512
+        )["input_ids"]
+        
+        # Batch texts of similar length together to minimize padding
+        order = sorted(range(len(texts)), key=lambda i: len(token_ids[i]))
+        
+        embeddings: Optional[np.ndarray] = None
+        for start in range(0, len(order), self.batch_size):
+            batch_indexes = order[start:start + self.batch_size]
+            batch_embeddings = self._get_batch_embeddings([texts[i] for i in batch_indexes])
+            
+            if embeddings is None:
+                embeddings = np.empty((len(texts), batch_embeddings.shape[1]), dtype=batch_embeddings.dtype)
+            
+            # Restore the original order
+            embeddings[batch_indexes] = batch_embeddings
+        
+        return embeddings
+    
+    def _get_batch_embeddings(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for a batch of texts.
         
@@ -96,10 +235,13 @@ class IndoBERTClient:
             texts: Batch of texts to generate embeddings for
             
         Returns:
-            List of embeddings
+            Array of embeddings with shape (batch size, embedding size)
         """
         import torch
         
+        if self.encoder is not None:
+            return self._get_ct2_batch_embeddings(texts)
+        
         # Tokenize texts
         inputs = self.tokenizer(
             texts,
@@ -109,20 +251,59 @@ class IndoBERTClient:
             max_length=512
         )
         
-        # Move inputs to the correct device
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        # Move inputs to the correct device (pinned, asynchronous copies on GPU)
+        if self.device.type == "cuda":
+            inputs = {k: v.pin_memory().to(self.device, non_blocking=True) for k, v in inputs.items()}
+        else:
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        
+        # Generate embeddings (fp16 autocast on GPU, full precision on CPU)
+        use_autocast = self.device.type == "cuda"
+        with torch.inference_mode(), torch.autocast(device_type=self.device.type, dtype=torch.float16, enabled=use_autocast):
+            outputs = self.model(
+                **inputs,
+                output_attentions=False,
+                output_hidden_states=False,
+                return_dict=True
+            )
+        
+        # Mean of last hidden states over real tokens only (pooled in float32)
+        hidden = outputs.last_hidden_state.float()
+        mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+        return pooled.cpu().numpy()
+    
+    def _get_ct2_batch_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for a batch of texts with the CTranslate2 encoder.
         
-        # Generate embeddings
-        with torch.no_grad():
-            outputs = self.model(**inputs)
+        Args:
+            texts: Batch of texts to generate embeddings for
             
-        # Use mean of last hidden states as embeddings
-        embeddings = outputs.last_hidden_state.mean(dim=1).cpu().numpy()
+        Returns:
+            Array of embeddings with shape (batch size, embedding size)
+        """
+        import torch
         
-        # Convert to list of lists
-        return [embedding.tolist() for embedding in embeddings]
+        # Tokenize texts (the encoder pads the batch itself)
+        inputs = self.tokenizer(texts, truncation=True, max_length=512)
+        
+        output = self.encoder.forward_batch(
+            inputs["input_ids"],
+            token_type_ids=inputs.get("token_type_ids")
+        )
+        
+        # Mean of last hidden states over each text's own tokens
+        hidden = torch.as_tensor(output.last_hidden_state, device=self.device).float()
+        lengths = torch.tensor([len(ids) for ids in inputs["input_ids"]], device=self.device)
+        mask = torch.arange(hidden.shape[1], device=self.device)[None, :] < lengths[:, None]
+        return ((hidden * mask[..., None]).sum(dim=1) / lengths[:, None]).cpu().numpy()
     
-    def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
+    def calculate_similarity(
+        self,
+        embedding1: Union[List[float], np.ndarray],
+        embedding2: Union[List[float], np.ndarray]
+    ) -> float:
         """
         Calculate cosine similarity between two embeddings.
         
@@ -133,20 +314,18 @@ class IndoBERTClient:
         Returns:
             Cosine similarity score (0-1)
         """
-        # Convert to numpy arrays
-        vec1 = np.array(embedding1)
-        vec2 = np.array(embedding2)
+        # Convert to numpy arrays (no copy for contiguous float32 arrays)
+        vec1 = np.ascontiguousarray(embedding1, dtype=np.float32)
+        vec2 = np.ascontiguousarray(embedding2, dtype=np.float32)
         
-        # Calculate cosine similarity
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
+        # Calculate cosine similarity with a single square root
+        denominator = np.sqrt(np.vdot(vec1, vec1) * np.vdot(vec2, vec2))
         
         # Avoid division by zero
-        if norm1 == 0 or norm2 == 0:
-            return 0
+        if denominator == 0:
+            return 0.0
             
-        similarity = dot_product / (norm1 * norm2)
+        similarity = np.dot(vec1, vec2) / denominator
         
         # Ensure the result is between 0 and 1
         return float(max(0, min(1, similarity)))
@@ -171,30 +350,81 @@ class IndoBERTClient:
             return documents
         
         try:
-            # Generate query embedding
-            query_embedding = self.get_embeddings([query])[0]
-            
-            # Generate document embeddings and calculate similarity
-            for doc in documents:
-                content = doc.get("content", "")
-                # Use first 1000 chars for efficiency
-                doc_text = content[:1000] if content else ""
-                
-                if doc_text:
-                    doc_embedding = self.get_embeddings([doc_text])[0]
-                    similarity = self.calculate_similarity(query_embedding, doc_embedding)
-                    doc["relevance_score"] = similarity
-                else:
-                    doc["relevance_score"] = 0.0
-            
-            # Sort by relevance score
-            sorted_docs = sorted(
-                documents, 
-                key=lambda x: x.get("relevance_score", 0), 
-                reverse=True
-            )
+            scores = self._score_texts(query, [doc.get("content") for doc in documents])
+            
+            for doc, score in zip(documents, scores):
+                doc["relevance_score"] = float(score)
             
-            return sorted_docs
+            return [documents[i] for i in self._order_by_score(scores)]
         except Exception as e:
             logger.error(f"Error ranking documents: {str(e)}")
-            return documents
\ No newline at end of file
+            return documents
+    
+    def rank_indices(self, query: str, texts: List[Optional[str]]) -> List[int]:
+        """
+        Rank texts by relevance to a query without copying them.
+        
+        Args:
+            query: The query text
+            texts: Document contents
+            
+        Returns:
+            Indexes of the texts, most relevant first
+        """
+        if not self.is_available or not texts:
+            logger.warning("IndoBERT unavailable or no documents to rank")
+            return list(range(len(texts)))
+        
+        try:
+            return self._order_by_score(self._score_texts(query, texts))
+        except Exception as e:
+            logger.error(f"Error ranking documents: {str(e)}")
+            return list(range(len(texts)))
+    
+    def _score_texts(self, query: str, texts: List[Optional[str]]) -> np.ndarray:
+        """
+        Score texts by cosine similarity to a query.
+        
+        Args:
+            query: The query text
+            texts: Document contents (empty or None texts score 0)
+            
+        Returns:
+            Similarity scores (0-1), one per text
+        """
+        # Use first 1000 chars of each document for efficiency
+        doc_texts = [(text or "")[:1000] for text in texts]
+        non_empty = [i for i, text in enumerate(doc_texts) if text]
+        
+        # Documents without content keep a score of 0
+        scores = np.zeros(len(doc_texts))
+        
+        if non_empty:
+            # Embed the query and all documents in one batched call
+            embeddings = np.asarray(
+                self.get_embeddings([query] + [doc_texts[i] for i in non_empty]),
+                dtype=np.float32
+            )
+            
+            # L2-normalize rows (zero vectors stay zero, giving a similarity of 0)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            embeddings = embeddings / norms
+            
+            # Cosine similarity of every document to the query, clipped to 0-1
+            scores[non_empty] = np.clip(embeddings[1:] @ embeddings[0], 0.0, 1.0)
+        
+        return scores
+    
+    @staticmethod
+    def _order_by_score(scores: np.ndarray) -> List[int]:
+        """
+        Order indexes by descending score.
+        
+        Args:
+            scores: Relevance scores
+            
+        Returns:
+            Indexes sorted by score (stable, so ties keep their original order)
+        """
+        return np.argsort(-scores, kind="stable").tolist()
\ No newline at end of file
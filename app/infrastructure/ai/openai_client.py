@@ -1,11 +1,18 @@
+import asyncio
+import hashlib
 import os
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 import httpx
+from app.core.cache import TTLCache
 from app.core.logging import get_logger
 from app.core.exceptions import OpenAIError, DependencyNotFoundError
 
 logger = get_logger(__name__)
 
+# Keyword extraction cache limits (extraction is deterministic at temperature 0)
+KEYWORD_CACHE_SIZE = 1024
+KEYWORD_CACHE_TTL = 3600
+
 
 class OpenAIClient:
     """Client for interacting with OpenAI API."""
@@ -40,6 +47,10 @@ class OpenAIClient:
         self.max_tokens = max_tokens
         self.timeout = timeout
         self.client = None
+        self.aclient = None
+        
+        # Keywords of recently seen queries (search traffic repeats)
+        self._keyword_cache = TTLCache(ttl=KEYWORD_CACHE_TTL, maxsize=KEYWORD_CACHE_SIZE)
         
         if not self.api_key:
             logger.warning("OpenAI API key not provided")
@@ -58,7 +69,7 @@ class OpenAIClient:
         """Initialize the OpenAI client."""
         try:
             # Try to import OpenAI
-            from openai import OpenAI
+            from openai import AsyncOpenAI, OpenAI
         except ImportError:
             logger.error("Failed to import OpenAI. Make sure it's installed.")
             raise DependencyNotFoundError("openai")
@@ -73,6 +84,13 @@ class OpenAIClient:
                 base_url=self.base_url,
                 http_client=http_client
             )
+            
+            # Async client for fanning out concurrent requests
+            self.aclient = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=httpx.AsyncClient(timeout=httpx.Timeout(self.timeout))
+            )
         except Exception as e:
             logger.error(f"Error initializing OpenAI client: {str(e)}")
             
@@ -82,6 +100,10 @@ class OpenAIClient:
                     api_key=self.api_key,
                     base_url=self.base_url
                 )
+                self.aclient = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url
+                )
             except Exception as e2:
                 logger.error(f"Error in alternative initialization: {str(e2)}")
                 raise OpenAIError(f"Failed to initialize OpenAI client: {str(e)}, {str(e2)}")
@@ -101,11 +123,7 @@ class OpenAIClient:
             return "OpenAI processing unavailable"
         
         try:
-            # Convert string prompt to message format if needed
-            if isinstance(prompt, str):
-                messages = [{"role": "user", "content": prompt}]
-            else:
-                messages = prompt
+            messages = self._build_messages(prompt)
             
             logger.debug(f"Sending request to OpenAI with model {self.model}")
             
@@ -126,6 +144,69 @@ class OpenAIClient:
             logger.error(f"Error invoking OpenAI: {str(e)}")
             raise OpenAIError(f"Error invoking OpenAI: {str(e)}")
     
+    async def ainvoke(self, prompt: Union[str, List[Dict[str, Any]]]) -> str:
+        """
+        Invoke the OpenAI API with a prompt without blocking the event loop.
+        
+        Args:
+            prompt: The prompt text or a list of messages
+            
+        Returns:
+            The generated text response
+        """
+        if not self.is_available or not self.aclient:
+            logger.warning("OpenAI client not available, returning empty response")
+            return "OpenAI processing unavailable"
+        
+        try:
+            messages = self._build_messages(prompt)
+            
+            logger.debug(f"Sending async request to OpenAI with model {self.model}")
+            
+            # Call the OpenAI API
+            response = await self.aclient.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens
+            )
+            
+            # Extract and return the generated text
+            result = response.choices[0].message.content
+            logger.debug("Successfully received response from OpenAI")
+            
+            return result
+        except Exception as e:
+            logger.error(f"Error invoking OpenAI: {str(e)}")
+            raise OpenAIError(f"Error invoking OpenAI: {str(e)}")
+    
+    async def abatch_invoke(self, prompts: List[Union[str, List[Dict[str, Any]]]]) -> List[str]:
+        """
+        Invoke the OpenAI API with several prompts concurrently.
+        
+        Args:
+            prompts: Prompt texts or lists of messages
+            
+        Returns:
+            The generated text responses, in the order of the prompts
+        """
+        return await asyncio.gather(*(self.ainvoke(prompt) for prompt in prompts))
+    
+    @staticmethod
+    def _build_messages(prompt: Union[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Convert a prompt to the chat message format.
+        
+        Args:
+            prompt: The prompt text or a list of messages
+            
+        Returns:
+            List of chat messages
+        """
+        if isinstance(prompt, str):
+            return [{"role": "user", "content": prompt}]
+        return prompt
+    
     def extract_keywords(self, query: str, num_keywords: int = 5) -> List[str]:
         """
         Extract keywords from a query using OpenAI.
@@ -141,6 +222,11 @@ class OpenAIClient:
             # Return simple keyword extraction
             return [w for w in query.split() if len(w) > 3][:num_keywords]
         
+        cache_key = self._keyword_cache_key(query, num_keywords)
+        cached = self._keyword_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         try:
             prompt = f"""
             As a legal expert in Indonesian law, extract the most important keywords from this query 
@@ -162,14 +248,29 @@ class OpenAIClient:
             
             # If no keywords extracted, fall back to simple extraction
             if not keywords:
-                keywords = [w for w in query.split() if len(w) > 3][:num_keywords]
+                return [w for w in query.split() if len(w) > 3][:num_keywords]
             
+            self._keyword_cache.set(cache_key, tuple(keywords))
             return keywords
         except Exception as e:
             logger.error(f"Error extracting keywords: {str(e)}")
             # Fall back to simple keyword extraction
             return [w for w in query.split() if len(w) > 3][:num_keywords]
     
+    def _keyword_cache_key(self, query: str, num_keywords: int) -> Tuple[str, int, bytes]:
+        """
+        Get the keyword cache key for a query.
+        
+        Args:
+            query: The query text
+            num_keywords: Number of keywords to extract
+            
+        Returns:
+            Cache key derived from the model and a digest of the normalized query
+        """
+        digest = hashlib.blake2b(query.strip().lower().encode("utf-8"), digest_size=16).digest()
+        return (self.model, num_keywords, digest)
+    
     def generate_legal_response(
         self,
         query: str,
@@ -1,20 +1,124 @@
+import asyncio
+import re
+import threading
+from functools import lru_cache
+import httpx
 import requests
+import soupsieve
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, Mapping, Optional, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
+from urllib.parse import urljoin, urlsplit
 from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 from app.core.logging import get_logger
 from app.domain.models import Document
-from app.core.exceptions import ScraperError
+from app.core.exceptions import DependencyNotFoundError, ScraperError
 
 logger = get_logger(__name__)
 
+# Prefer the C-based lxml parser when it is installed
+try:
+    from lxml import etree
+    HTML_PARSER = "lxml"
+except ImportError:
+    etree = None
+    HTML_PARSER = "html.parser"
+
+# Prefer selectolax's C selector engine for link extraction when it is installed
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Only anchors with an href are needed when looking for PDF links
+_ANCHOR_STRAINER = SoupStrainer('a', href=True)
+
+# Links to PDF files, optionally followed by a query string or fragment
+_PDF_HREF_RE = re.compile(r'\.pdf(?:$|[?#])', re.IGNORECASE)
+
+# Chunk size used when streaming pages into the parser
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Largest page body read before parsing (the rest is discarded)
+MAX_PAGE_BYTES = 2_000_000
+
+# Connections kept per host, sized for concurrent detail-page fetches
+POOL_MAXSIZE = 30
+
+
+def _is_html_content_type(content_type: Optional[str]) -> bool:
+    """
+    Check whether a response content type can hold an HTML page.
+    
+    Args:
+        content_type: Value of the Content-Type header (None if missing)
+        
+    Returns:
+        True for HTML, XML and text responses, or when the type is unknown
+    """
+    if not content_type:
+        return True
+    
+    mime = content_type.split(';', 1)[0].strip().lower()
+    return mime.startswith('text/') or mime.endswith(('/xml', '+xml'))
+
+
+@lru_cache(maxsize=512)
+def _compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """
+    Compile a CSS selector once and reuse it across pages.
+    
+    Args:
+        selector: CSS selector
+        
+    Returns:
+        Compiled selector
+    """
+    return soupsieve.compile(selector)
+
+
+class _PdfAnchorCollector:
+    """lxml parser target that collects PDF anchors without building a tree."""
+    
+    def __init__(self):
+        self.anchors: List[Tuple[str, str]] = []
+        self._href: Optional[str] = None
+        self._text: List[str] = []
+    
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        href = attrib.get('href') if tag == 'a' else None
+        if href is not None and _PDF_HREF_RE.search(href):
+            self._href = href
+            self._text = []
+    
+    def data(self, data: str) -> None:
+        if self._href is not None:
+            self._text.append(data)
+    
+    def end(self, tag: str) -> None:
+        if tag == 'a' and self._href is not None:
+            self.anchors.append((self._href, ''.join(self._text)))
+            self._href = None
+    
+    def close(self) -> List[Tuple[str, str]]:
+        return self.anchors
+
 
 class BaseScraper(ABC):
     """Base class for legal document scrapers."""
     
+    # Default request headers, shared by all scrapers and mounted on the session once
+    HEADERS: Mapping[str, str] = MappingProxyType({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                     'Chrome/91.0.4472.124 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+    })
+    
     def __init__(self, request_timeout: int = 30):
         """
         Initialize the base scraper.
@@ -23,14 +127,14 @@ class BaseScraper(ABC):
             request_timeout: Request timeout in seconds
         """
         self.request_timeout = request_timeout
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
-                         'Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
+        self.headers = self.HEADERS
+        
+        # Shared session (created on first use) so connections are kept alive between pages
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        
+        # Async client for concurrent fetches (created on first use)
+        self._aclient: Optional[httpx.AsyncClient] = None
     
     @abstractmethod
     def search(self, query: str, max_pages: int = 5, max_results: int = 10) -> List[Document]:
@@ -59,6 +163,7 @@ class BaseScraper(ABC):
             Configured requests session
         """
         session = requests.Session()
+        session.headers.update(self.HEADERS)
         
         # Configure retry strategy
         retry_strategy = Retry(
@@ -68,47 +173,292 @@ class BaseScraper(ABC):
             allowed_methods=["GET", "POST"]
         )
         
-        # Apply retry strategy to session
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Apply retry strategy to session, pooling enough connections for concurrent fetches
+        adapter = HTTPAdapter(
+            pool_connections=POOL_MAXSIZE,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=retry_strategy
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
         return session
     
-    def get_page_content(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[BeautifulSoup]:
+    @property
+    def session(self) -> requests.Session:
+        """Get the shared requests session, creating it on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self.create_session()
+        return self._session
+    
+    def close(self) -> None:
+        """Close the shared session and its pooled connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+    
+    def _get_aclient(self) -> httpx.AsyncClient:
+        """Get the async client, creating it on first use."""
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                headers=self.HEADERS,
+                timeout=self.request_timeout,
+                follow_redirects=True,
+                transport=httpx.AsyncHTTPTransport(retries=3)
+            )
+        return self._aclient
+    
+    async def aclose(self) -> None:
+        """Close the async client and its pooled connections."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+    
+    def __enter__(self) -> "BaseScraper":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def get_page_content(
+        self, 
+        url: str, 
+        params: Optional[Dict[str, Any]] = None,
+        parse_only: Optional[SoupStrainer] = None,
+        max_bytes: int = MAX_PAGE_BYTES
+    ) -> Optional[BeautifulSoup]:
         """
         Get the content of a page as BeautifulSoup object.
         
         Args:
             url: The URL to fetch
             params: Optional query parameters
+            parse_only: Optional strainer limiting which elements are parsed
+            max_bytes: Maximum number of bytes of the page to parse
             
         Returns:
             BeautifulSoup object or None if failed
         """
+        html = self._fetch_html(url, params, max_bytes)
+        if html is None:
+            return None
+        
         try:
-            # Use session with retries
-            session = self.create_session()
+            # Parse HTML
+            return self._parse_html(html, parse_only)
+        except Exception as e:
+            logger.error(f"Error parsing content from {url}: {str(e)}")
+            return None
+    
+    def get_page_tree(
+        self, 
+        url: str, 
+        params: Optional[Dict[str, Any]] = None,
+        max_bytes: int = MAX_PAGE_BYTES
+    ) -> Optional["LexborHTMLParser"]:
+        """
+        Get the content of a page as a selectolax tree for fast CSS-selector scraping.
+        
+        Args:
+            url: The URL to fetch
+            params: Optional query parameters
+            max_bytes: Maximum number of bytes of the page to parse
             
-            # Make the request
-            response = session.get(
-                url, 
-                params=params, 
-                headers=self.headers, 
-                timeout=self.request_timeout
-            )
-            response.raise_for_status()
+        Returns:
+            selectolax tree or None if failed
+            
+        Raises:
+            DependencyNotFoundError: If selectolax is not installed
+        """
+        if LexborHTMLParser is None:
+            raise DependencyNotFoundError("selectolax")
+        
+        html = self._fetch_html(url, params, max_bytes)
+        if html is None:
+            return None
+        
+        return self._parse_tree(html, url)
+    
+    async def aget_page_tree(
+        self, 
+        url: str, 
+        params: Optional[Dict[str, Any]] = None,
+        max_bytes: int = MAX_PAGE_BYTES
+    ) -> Optional["LexborHTMLParser"]:
+        """
+        Get the content of a page as a selectolax tree without blocking the event loop.
+        
+        Args:
+            url: The URL to fetch
+            params: Optional query parameters
+            max_bytes: Maximum number of bytes of the page to parse
+            
+        Returns:
+            selectolax tree or None if failed
+            
+        Raises:
+            DependencyNotFoundError: If selectolax is not installed
+        """
+        if LexborHTMLParser is None:
+            raise DependencyNotFoundError("selectolax")
+        
+        html = await self._afetch_html(url, params, max_bytes)
+        if html is None:
+            return None
+        
+        return self._parse_tree(html, url)
+    
+    @staticmethod
+    def _parse_tree(html: bytes, url: str) -> Optional["LexborHTMLParser"]:
+        """
+        Parse HTML into a selectolax tree.
+        
+        Args:
+            html: Raw HTML content
+            url: URL of the page (used for logging)
             
+        Returns:
+            selectolax tree or None if parsing failed
+        """
+        try:
+            return LexborHTMLParser(html)
+        except Exception as e:
+            logger.error(f"Error parsing content from {url}: {str(e)}")
+            return None
+    
+    async def aget_page_content(
+        self, 
+        url: str, 
+        params: Optional[Dict[str, Any]] = None,
+        parse_only: Optional[SoupStrainer] = None,
+        max_bytes: int = MAX_PAGE_BYTES
+    ) -> Optional[BeautifulSoup]:
+        """
+        Get the content of a page as BeautifulSoup object without blocking the event loop.
+        
+        Args:
+            url: The URL to fetch
+            params: Optional query parameters
+            parse_only: Optional strainer limiting which elements are parsed
+            max_bytes: Maximum number of bytes of the page to parse
+            
+        Returns:
+            BeautifulSoup object or None if failed
+        """
+        html = await self._afetch_html(url, params, max_bytes)
+        if html is None:
+            return None
+        
+        try:
             # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            return soup
+            return self._parse_html(html, parse_only)
+        except Exception as e:
+            logger.error(f"Error parsing content from {url}: {str(e)}")
+            return None
+    
+    def _fetch_html(
+        self, 
+        url: str, 
+        params: Optional[Dict[str, Any]] = None,
+        max_bytes: int = MAX_PAGE_BYTES
+    ) -> Optional[bytes]:
+        """
+        Fetch the raw HTML of a page, streaming at most max_bytes of the body.
+        
+        Args:
+            url: The URL to fetch
+            params: Optional query parameters
+            max_bytes: Maximum number of bytes to read
+            
+        Returns:
+            Response body or None if failed or not HTML
+        """
+        try:
+            # Make the request with the shared session (retries and keep-alive)
+            with self.session.get(
+                url, 
+                params=params, 
+                timeout=self.request_timeout, 
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                
+                if not _is_html_content_type(response.headers.get('Content-Type')):
+                    logger.warning(f"Skipping non-HTML content from {url}")
+                    return None
+                
+                return self._read_capped(response.iter_content(STREAM_CHUNK_SIZE), max_bytes, url)
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching {url}: {str(e)}")
             return None
-        except Exception as e:
-            logger.error(f"Error parsing content from {url}: {str(e)}")
+    
+    async def _afetch_html(
+        self, 
+        url: str, 
+        params: Optional[Dict[str, Any]] = None,
+        max_bytes: int = MAX_PAGE_BYTES
+    ) -> Optional[bytes]:
+        """
+        Fetch the raw HTML of a page without blocking the event loop.
+        
+        Args:
+            url: The URL to fetch
+            params: Optional query parameters
+            max_bytes: Maximum number of bytes to read
+            
+        Returns:
+            Response body or None if failed or not HTML
+        """
+        try:
+            # Make the request
+            async with self._get_aclient().stream("GET", url, params=params) as response:
+                response.raise_for_status()
+                
+                if not _is_html_content_type(response.headers.get('Content-Type')):
+                    logger.warning(f"Skipping non-HTML content from {url}")
+                    return None
+                
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= max_bytes:
+                        logger.warning(f"Truncated {url} at {max_bytes} bytes")
+                        break
+                
+                return b"".join(chunks)[:max_bytes]
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching {url}: {str(e)}")
             return None
     
+    @staticmethod
+    def _read_capped(chunks: Iterable[bytes], max_bytes: int, url: str) -> bytes:
+        """
+        Read a streamed body, stopping once max_bytes have been read.
+        
+        Args:
+            chunks: Body chunks
+            max_bytes: Maximum number of bytes to read
+            url: URL of the page (used for logging)
+            
+        Returns:
+            At most max_bytes of the body
+        """
+        body = []
+        size = 0
+        for chunk in chunks:
+            body.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                logger.warning(f"Truncated {url} at {max_bytes} bytes")
+                break
+        
+        return b"".join(body)[:max_bytes]
+    
     def find_pdf_links(self, url: str) -> List[Dict[str, str]]:
         """
         Find PDF links on a given website page.
@@ -119,39 +469,224 @@ class BaseScraper(ABC):
         Returns:
             List of PDF URLs found on the page
         """
-        pdf_links = []
-        
         try:
             logger.info(f"Searching for PDF links on {url}")
             
-            # Get the page content
-            soup = self.get_page_content(url)
-            if not soup:
+            # Get the PDF anchors on the page
+            anchors = self._fetch_pdf_anchors(url)
+            if anchors is None:
                 return []
             
-            # Find all links on the page
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                
-                # Check if the link is a PDF
-                if href.lower().endswith('.pdf'):
-                    # Make sure the URL is absolute
-                    if not href.startswith('http'):
-                        href = urljoin(url, href)
-                    
-                    pdf_links.append({
-                        'url': href,
-                        'text': link.get_text().strip() or os.path.basename(href),
-                        'source_page': url
-                    })
-            
-            logger.info(f"Found {len(pdf_links)} PDF links on {url}")
-            return pdf_links
-            
+            return self._build_pdf_links(anchors, url)
         except Exception as e:
             logger.error(f"Error finding PDF links: {str(e)}")
             return []
     
+    async def afind_pdf_links_batch(
+        self, 
+        urls: List[str], 
+        concurrency: int = 16
+    ) -> List[List[Dict[str, str]]]:
+        """
+        Find PDF links on several pages, fetching them concurrently.
+        
+        Args:
+            urls: URLs of the pages to search for PDF links
+            concurrency: Maximum number of pages fetched at the same time
+            
+        Returns:
+            List of PDF links for each page, in the order of the URLs
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def find_links(url: str) -> List[Dict[str, str]]:
+            try:
+                async with semaphore:
+                    logger.info(f"Searching for PDF links on {url}")
+                    anchors = await self._afetch_pdf_anchors(url)
+                
+                if anchors is None:
+                    return []
+                
+                return self._build_pdf_links(anchors, url)
+            except Exception as e:
+                logger.error(f"Error finding PDF links: {str(e)}")
+                return []
+        
+        return await asyncio.gather(*(find_links(url) for url in urls))
+    
+    @staticmethod
+    def _parse_html(html: bytes, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        """
+        Parse HTML with the fastest available parser.
+        
+        Args:
+            html: Raw HTML content
+            parse_only: Optional strainer limiting which elements are parsed
+            
+        Returns:
+            BeautifulSoup object
+        """
+        return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+    
+    def _fetch_pdf_anchors(
+        self, 
+        url: str, 
+        max_bytes: int = MAX_PAGE_BYTES
+    ) -> Optional[List[Tuple[str, str]]]:
+        """
+        Fetch a page and collect its PDF anchors.
+        
+        With lxml the body is parsed while it streams in, without building a tree.
+        
+        Args:
+            url: The URL to fetch
+            max_bytes: Maximum number of bytes of the page to parse
+            
+        Returns:
+            List of (href, text) pairs or None if the fetch failed or is not HTML
+        """
+        if etree is None:
+            html = self._fetch_html(url, max_bytes=max_bytes)
+            return None if html is None else self._find_pdf_anchors(html)
+        
+        try:
+            with self.session.get(
+                url, 
+                timeout=self.request_timeout, 
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                
+                if not _is_html_content_type(response.headers.get('Content-Type')):
+                    logger.warning(f"Skipping non-HTML content from {url}")
+                    return None
+                
+                parser, collector = self._new_pdf_anchor_parser()
+                remaining = max_bytes
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    parser.feed(chunk[:remaining])
+                    remaining -= len(chunk)
+                    if remaining <= 0:
+                        logger.warning(f"Truncated {url} at {max_bytes} bytes")
+                        break
+                return self._close_pdf_anchor_parser(parser, collector)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching {url}: {str(e)}")
+            return None
+    
+    async def _afetch_pdf_anchors(
+        self, 
+        url: str, 
+        max_bytes: int = MAX_PAGE_BYTES
+    ) -> Optional[List[Tuple[str, str]]]:
+        """
+        Fetch a page and collect its PDF anchors without blocking the event loop.
+        
+        Args:
+            url: The URL to fetch
+            max_bytes: Maximum number of bytes of the page to parse
+            
+        Returns:
+            List of (href, text) pairs or None if the fetch failed or is not HTML
+        """
+        if etree is None:
+            html = await self._afetch_html(url, max_bytes=max_bytes)
+            return None if html is None else self._find_pdf_anchors(html)
+        
+        try:
+            async with self._get_aclient().stream("GET", url) as response:
+                response.raise_for_status()
+                
+                if not _is_html_content_type(response.headers.get('Content-Type')):
+                    logger.warning(f"Skipping non-HTML content from {url}")
+                    return None
+                
+                parser, collector = self._new_pdf_anchor_parser()
+                remaining = max_bytes
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    parser.feed(chunk[:remaining])
+                    remaining -= len(chunk)
+                    if remaining <= 0:
+                        logger.warning(f"Truncated {url} at {max_bytes} bytes")
+                        break
+                return self._close_pdf_anchor_parser(parser, collector)
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching {url}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _new_pdf_anchor_parser() -> Tuple[Any, _PdfAnchorCollector]:
+        """Create an incremental lxml HTML parser that collects PDF anchors."""
+        collector = _PdfAnchorCollector()
+        return etree.HTMLParser(target=collector), collector
+    
+    @staticmethod
+    def _close_pdf_anchor_parser(parser: Any, collector: _PdfAnchorCollector) -> List[Tuple[str, str]]:
+        """Finish parsing and return the collected PDF anchors."""
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            # Raised for empty documents; nothing was collected
+            pass
+        return collector.anchors
+    
+    def _find_pdf_anchors(self, html: bytes) -> List[Tuple[str, str]]:
+        """
+        Find PDF anchors in a fully downloaded page.
+        
+        Args:
+            html: Raw HTML content of the page
+            
+        Returns:
+            List of (href, text) pairs
+        """
+        if LexborHTMLParser is not None:
+            # Narrow candidates in the C selector engine before the exact match
+            anchors = (
+                (node.attributes.get('href') or '', node)
+                for node in LexborHTMLParser(html).css('a[href*=".pdf" i]')
+            )
+            return [
+                (href, node.text(strip=False))
+                for href, node in anchors
+                if _PDF_HREF_RE.search(href)
+            ]
+        
+        # Parse anchors only and filter PDF links in Python
+        soup = self._parse_html(html, _ANCHOR_STRAINER)
+        return [
+            (link['href'], link.get_text())
+            for link in soup.find_all('a', href=True)
+            if _PDF_HREF_RE.search(link['href'])
+        ]
+    
+    def _build_pdf_links(self, anchors: List[Tuple[str, str]], url: str) -> List[Dict[str, str]]:
+        """
+        Build PDF link entries from anchors.
+        
+        Args:
+            anchors: List of (href, text) pairs
+            url: URL of the page (used to resolve relative links)
+            
+        Returns:
+            List of PDF URLs found on the page
+        """
+        pdf_links = []
+        for href, text in anchors:
+            # Make sure the URL is absolute
+            if not href.startswith('http'):
+                href = urljoin(url, href)
+            
+            pdf_links.append({
+                'url': href,
+                'text': text.strip() or urlsplit(href).path.rsplit('/', 1)[-1],
+                'source_page': url
+            })
+        
+        logger.info(f"Found {len(pdf_links)} PDF links on {url}")
+        return pdf_links
+    
     def extract_elements(
         self, 
         soup: BeautifulSoup, 
@@ -172,7 +707,7 @@ class BaseScraper(ABC):
             The extracted element, text, or None if not found
         """
         for selector in selectors:
-            element = soup.select_one(selector)
+            element = _compile_selector(selector).select_one(soup)
             if element:
                 if get_text:
                     text = element.get_text()
@@ -200,7 +735,7 @@ class BaseScraper(ABC):
             List of extracted elements or texts
         """
         for selector in selectors:
-            elements = soup.select(selector)
+            elements = _compile_selector(selector).select(soup)
             if elements:
                 if get_text:
                     texts = [elem.get_text() for elem in elements]
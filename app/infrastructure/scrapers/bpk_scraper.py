@@ -1,19 +1,224 @@
+import asyncio
 import os
 import re
 import json
+import threading
 import time
-from typing import List, Dict, Any, Optional, Tuple
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from app.config import get_settings
+from app.core.cache import TTLCache
 from app.core.logging import get_logger
 from app.domain.models import Document
 from app.core.exceptions import ScraperError
-from app.infrastructure.scrapers.base import BaseScraper
+from app.infrastructure.scrapers.base import POOL_MAXSIZE, BaseScraper
 from app.utils.pdf import PDFExtractor
 from app.utils.text import IndonesianTextProcessor
 
 logger = get_logger(__name__)
 
+# Detail pages fetched at the same time by the sync scraper, across all searches
+# (one pooled connection per worker)
+DETAIL_FETCH_WORKERS = POOL_MAXSIZE
+
+# PDFs downloaded and extracted at the same time by the PDF search
+PDF_EXTRACT_WORKERS = 8
+
+# Search result pages are small, so stop reading them early
+SEARCH_PAGE_MAX_BYTES = 500_000
+
+# OpenAI-enhanced query cache limits
+ENHANCED_QUERY_CACHE_SIZE = 1024
+ENHANCED_QUERY_CACHE_TTL = 3600
+
+# Write buffer for saved reports, so small report pieces are coalesced into few writes
+REPORT_WRITE_BUFFER = 64 * 1024
+
+# Selectors for search result items, tried in order
+_RESULT_SELECTORS = (
+    '.card',
+    '.card-body',
+    '.search-result',
+    '.search-result-item',
+    '.row .col-md-12'
+)
+
+# Selectors for the title link of a search result, tried in order
+_TITLE_SELECTORS = (
+    'h3.fw-bold.text-gray-800.mb-5 a',
+    'h3 a',
+    '.fw-bold.text-gray-800 a',
+    'a[href*="/Home/Detail/"]',
+    'a'
+)
+
+# Each title selector restricted to links to a document detail page
+_TITLE_LINK_SELECTORS = tuple(
+    (selector, f'{selector}[href*="/Home/Detail/"], {selector}[href*="/Details/"]')
+    for selector in _TITLE_SELECTORS
+)
+
+# Candidate containers for the main content of a detail page, matched in one pass
+_CONTENT_SELECTOR = ', '.join((
+    '.card-body',
+    'main .container',
+    '.document-content',
+    '.content',
+    'article',
+    '#mainContent',
+    '.detail-content'
+))
+
+# Invisible characters removed from extracted content (non-breaking spaces become spaces)
+_INVISIBLE_CHARS = str.maketrans({'\u200b': None, '\ufeff': None, '\xa0': ' '})
+
+# Characters dropped from report filenames, and separators collapsed into underscores
+_QUERY_UNSAFE_RE = re.compile(r'[^\w\s-]')
+_QUERY_SEPARATOR_RE = re.compile(r'[\s-]+')
+
+# Static part of the HTML report head (stylesheet and banner)
+_REPORT_STATIC_HEAD = """
+            <style>
+                body {
+                    font-family: Arial, sans-serif;
+                    line-height: 1.6;
+                    margin: 0;
+                    padding: 20px;
+                    color: #333;
+                }
+                .container {
+                    max-width: 1200px;
+                    margin: 0 auto;
+                    background-color: #fff;
+                    padding: 20px;
+                    box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
+                }
+                header {
+                    background-color: #005A9C;
+                    color: white;
+                    padding: 20px;
+                    text-align: center;
+                    margin-bottom: 20px;
+                }
+                h1 {
+                    margin: 0;
+                    font-size: 24px;
+                }
+                h2 {
+                    color: #005A9C;
+                    border-bottom: 1px solid #ddd;
+                    padding-bottom: 10px;
+                    margin-top: 30px;
+                }
+                .query-info {
+                    background-color: #f5f5f5;
+                    padding: 15px;
+                    border-radius: 5px;
+                    margin-bottom: 20px;
+                }
+                .document {
+                    margin-bottom: 30px;
+                    padding: 15px;
+                    background-color: #f9f9f9;
+                    border-radius: 5px;
+                    border-left: 5px solid #005A9C;
+                }
+                .document-header {
+                    margin-bottom: 10px;
+                }
+                .document-title {
+                    font-weight: bold;
+                    font-size: 18px;
+                    color: #005A9C;
+                }
+                .document-meta {
+                    color: #666;
+                    font-size: 14px;
+                    margin: 5px 0;
+                }
+                .document-content {
+                    max-height: 300px;
+                    overflow-y: auto;
+                    padding: 10px;
+                    background-color: #fff;
+                    border: 1px solid #ddd;
+                    border-radius: 3px;
+                    margin-top: 10px;
+                }
+                .document-content pre {
+                    white-space: pre-wrap;
+                    font-family: monospace;
+                    margin: 0;
+                }
+                .response {
+                    background-color: #e6f7ff;
+                    padding: 20px;
+                    border-radius: 5px;
+                    margin-bottom: 30px;
+                    border-left: 5px solid #1890ff;
+                }
+                footer {
+                    text-align: center;
+                    margin-top: 30px;
+                    padding-top: 20px;
+                    border-top: 1px solid #ddd;
+                    color: #666;
+                    font-size: 14px;
+                }
+                .relevance-score {
+                    display: inline-block;
+                    padding: 3px 8px;
+                    background-color: #005A9C;
+                    color: white;
+                    border-radius: 12px;
+                    font-size: 12px;
+                    margin-left: 10px;
+                }
+                .pdf-badge {
+                    display: inline-block;
+                    padding: 3px 8px;
+                    background-color: #d9534f;
+                    color: white;
+                    border-radius: 12px;
+                    font-size: 12px;
+                    margin-left: 10px;
+                }
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <header>
+                    <h1>BPK Legal Document Report</h1>
+                </header>"""
+
+# Static end of the HTML report (footer and closing tags)
+_REPORT_STATIC_TAIL = """
+            </div>
+                
+            <footer>
+                <p>This report was generated using the BPK Legal Document API.</p>
+            </footer>
+        </body>
+        </html>
+        """
+
+
+def _normalize_link(link: str) -> str:
+    """
+    Normalize a document link for duplicate detection.
+    
+    Args:
+        link: Absolute document URL
+        
+    Returns:
+        URL with a lowercase scheme and host and no trailing slash
+    """
+    parts = urlsplit(link)
+    normalized = f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+    return f"{normalized}?{parts.query}" if parts.query else normalized
+
 
 class BPKScraper(BaseScraper):
     """Scraper for peraturan.bpk.go.id website."""
@@ -22,7 +227,8 @@ class BPKScraper(BaseScraper):
         self,
         openai_client=None,
         indobert_client=None,
-        request_timeout: int = 30
+        request_timeout: int = 30,
+        query_enhance_min_words: Optional[int] = None
     ):
         """
         Initialize the BPK legal document scraper.
@@ -31,19 +237,74 @@ class BPKScraper(BaseScraper):
             openai_client: OpenAI client for language processing
             indobert_client: IndoBERT client for embeddings
             request_timeout: Request timeout in seconds
+            query_enhance_min_words: Fewest words a query needs to be enhanced with OpenAI
+                (defaults to the QUERY_ENHANCE_MIN_WORDS setting)
         """
         super().__init__(request_timeout=request_timeout)
         
         self.openai_client = openai_client
         self.indobert_client = indobert_client
-        self.pdf_extractor = PDFExtractor()
-        self.text_processor = IndonesianTextProcessor()
+        self.query_enhance_min_words = (
+            get_settings().QUERY_ENHANCE_MIN_WORDS
+            if query_enhance_min_words is None
+            else query_enhance_min_words
+        )
+        
+        # OpenAI-enhanced queries keyed by normalized query text
+        self._enhanced_query_cache = TTLCache(ttl=ENHANCED_QUERY_CACHE_TTL, maxsize=ENHANCED_QUERY_CACHE_SIZE)
+        
+        # Helpers are created on first use (the stemmer is slow to build)
+        self._pdf_extractor: Optional[PDFExtractor] = None
+        self._text_processor: Optional[IndonesianTextProcessor] = None
+        self._helpers_lock = threading.Lock()
+        
+        # Detail page fetches of every search share one executor (created on first use)
+        self._detail_executor: Optional[ThreadPoolExecutor] = None
         
         # Set base URL
         self.base_url = "https://peraturan.bpk.go.id"
+        self._base_url_no_slash = self.base_url.rstrip('/')
         
         logger.info("BPK Scraper initialized successfully")
     
+    @property
+    def detail_executor(self) -> ThreadPoolExecutor:
+        """Get the executor for detail page fetches, creating it on first use."""
+        if self._detail_executor is None:
+            with self._helpers_lock:
+                if self._detail_executor is None:
+                    self._detail_executor = ThreadPoolExecutor(
+                        max_workers=DETAIL_FETCH_WORKERS,
+                        thread_name_prefix="bpk-detail"
+                    )
+        return self._detail_executor
+    
+    def close(self) -> None:
+        """Shut down the detail page executor and close the shared session."""
+        with self._helpers_lock:
+            if self._detail_executor is not None:
+                self._detail_executor.shutdown(wait=True)
+                self._detail_executor = None
+        super().close()
+    
+    @property
+    def pdf_extractor(self) -> PDFExtractor:
+        """Get the PDF extractor, creating it on first use."""
+        if self._pdf_extractor is None:
+            with self._helpers_lock:
+                if self._pdf_extractor is None:
+                    self._pdf_extractor = PDFExtractor()
+        return self._pdf_extractor
+    
+    @property
+    def text_processor(self) -> IndonesianTextProcessor:
+        """Get the Indonesian text processor, creating it on first use."""
+        if self._text_processor is None:
+            with self._helpers_lock:
+                if self._text_processor is None:
+                    self._text_processor = IndonesianTextProcessor()
+        return self._text_processor
+    
     def preprocess_query(self, query: str) -> str:
         """
         Preprocess and enhance the user query.
@@ -57,6 +318,13 @@ class BPKScraper(BaseScraper):
         try:
             logger.info(f"Preprocessing query: {query}")
             
+            # Reuse a previous OpenAI enhancement of the same query
+            cache_key = (query.strip().lower(),)
+            cached = self._enhanced_query_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached enhanced query: {cached}")
+                return cached
+            
             # Use stemming if available
             if self.text_processor.has_stemmer:
                 # Stem the query
@@ -76,8 +344,13 @@ class BPKScraper(BaseScraper):
             else:
                 enhanced_query = query
             
-            # Use OpenAI to enhance the query with legal terminology if available
-            if self.openai_client and self.openai_client.is_available:
+            # Use OpenAI to enhance the query with legal terminology if available (short queries only get noisy expansions)
+            use_openai = bool(self.openai_client and self.openai_client.is_available)
+            if use_openai and len(query.split()) < self.query_enhance_min_words:
+                logger.info("Query too short for OpenAI enhancement")
+                use_openai = False
+            
+            if use_openai:
                 try:
                     prompt = f"""
                     As a legal expert in Indonesian law, enhance this query to include proper legal terminology and relevant legal concepts:
@@ -91,13 +364,15 @@ class BPKScraper(BaseScraper):
                     
                     # Extract the enhanced query from the response
                     enhanced_query = response.strip()
+                    if enhanced_query:
+                        self._enhanced_query_cache.set(cache_key, enhanced_query)
                     
                     logger.info(f"Enhanced query with legal terminology: {enhanced_query}")
                 except Exception as e:
                     logger.warning(f"Error enhancing query with OpenAI: {str(e)}")
             
             # Enhance with legal terms using rule-based approach as fallback
-            if not self.openai_client or not self.openai_client.is_available:
+            if not use_openai:
                 enhanced_query = self.text_processor.enhance_query_with_legal_terms(query)
                 logger.info(f"Enhanced query with rule-based approach: {enhanced_query}")
             
@@ -107,13 +382,21 @@ class BPKScraper(BaseScraper):
             logger.error(f"Error preprocessing query: {str(e)}")
             return query
     
-    def scrape_peraturan_bpk(self, query: str, max_pages: int = 10) -> List[Document]:
+    def scrape_peraturan_bpk(
+        self, 
+        query: str, 
+        max_pages: int = 10, 
+        preprocessed: bool = False,
+        rank: bool = True
+    ) -> List[Document]:
         """
         Scrape peraturan.bpk.go.id for legal information based on a query.
         
         Args:
             query: The search query
             max_pages: Maximum number of search result pages to process
+            preprocessed: Whether the query has already been through preprocess_query
+            rank: Whether to rank the documents by relevance with IndoBERT
             
         Returns:
             List of document objects with content and metadata
@@ -122,9 +405,12 @@ class BPKScraper(BaseScraper):
         
         documents = []
         
+        # Document links already fetched (results repeat across pages)
+        seen_links: Set[str] = set()
+        
         try:
             # Process the query with legal language conversion if available
-            processed_query = self.preprocess_query(query)
+            processed_query = query if preprocessed else self.preprocess_query(query)
             
             # If the query was enhanced, log it
             if processed_query != query:
@@ -133,279 +419,532 @@ class BPKScraper(BaseScraper):
             # Prepare the search URL
             search_url = f"{self.base_url}/Search"
             
-            # Process search result pages
+            # Process search result pages, fetching each page's detail pages concurrently
+            executor = self.detail_executor
             for page in range(1, max_pages + 1):
                 try:
                     logger.info(f"Searching page {page}")
                     
-                    # Construct the page URL with parameters
-                    params = {
-                        'keywords': processed_query,
-                        'page': page if page > 1 else None
-                    }
-                    
-                    # Remove None values
-                    params = {k: v for k, v in params.items() if v is not None}
-                    
                     # Get the page content
-                    soup = self.get_page_content(search_url, params)
-                    if not soup:
+                    tree = self.get_page_tree(
+                        search_url,
+                        self._search_params(processed_query, page),
+                        max_bytes=SEARCH_PAGE_MAX_BYTES
+                    )
+                    if not tree:
                         logger.warning(f"Failed to get page {page}")
                         continue
                     
-                    # Find all search result items - try multiple selectors
-                    result_items = []
+                    results = self._parse_search_results(tree, page)
+                    if not results:
+                        logger.warning(f"No results found on page {page}")
+                        break
                     
-                    # Try different selectors for result items
-                    selectors = [
-                        '.card', 
-                        '.card-body', 
-                        '.search-result', 
-                        '.search-result-item', 
-                        '.row .col-md-12'
-                    ]
+                    results = self._unseen_results(results, seen_links)
                     
-                    for selector in selectors:
-                        items = soup.select(selector)
-                        if items:
-                            logger.info(f"Found {len(items)} results using selector: {selector}")
-                            result_items = items
-                            break
+                    # Retrieve the full content of all results (map keeps result order)
+                    for document in executor.map(self._scrape_result_document, results):
+                        if document is not None:
+                            documents.append(document)
                     
-                    if not result_items:
-                        # Last resort: look for any links that might be results
-                        links = soup.select('a[href*="/Home/Detail/"]')
-                        if links:
-                            logger.info(f"Found {len(links)} results by searching for detail links")
-                            
-                            # Create simple result items from links
-                            result_items = []
-                            for link in links:
-                                # Create a simple wrapper div for each link
-                                div = soup.new_tag('div')
-                                div.append(link)
-                                result_items.append(div)
+                    if not self._has_next_page(tree):
+                        logger.info("No more pages available")
+                        break
+                
+                except Exception as page_error:
+                    logger.error(f"Error scraping page {page}: {str(page_error)}")
+            
+            logger.info(f"Scraped {len(documents)} documents from peraturan.bpk.go.id")
+            
+            if rank:
+                documents = self._rank_scraped_documents(query, documents)
+        
+        except Exception as e:
+            logger.error(f"Error scraping peraturan.bpk.go.id: {str(e)}")
+            raise ScraperError(f"Error scraping peraturan.bpk.go.id: {str(e)}")
+        
+        return documents
+    
+    def _scrape_result_document(self, result: Dict[str, Any]) -> Optional[Document]:
+        """
+        Fetch the detail page of a search result and build its document.
+        
+        Args:
+            result: Search result
+            
+        Returns:
+            Document object, or None if no content could be retrieved
+        """
+        try:
+            logger.info(f"Retrieving document content from: {result['link']}")
+            
+            # Get the document page content
+            doc_tree = self.get_page_tree(result['link'])
+            if not doc_tree:
+                logger.warning(f"Failed to get document page content for {result['link']}")
+                return None
+            
+            document = self._build_result_document(result, doc_tree)
+            if document is None:
+                # Try to find PDF links
+                document = self._build_pdf_result_document(result, self.find_pdf_links(result['link']))
+            
+            return document
+        except Exception as doc_error:
+            logger.warning(f"Error retrieving document content: {str(doc_error)}")
+            return None
+    
+    async def ascrape_peraturan_bpk(
+        self, 
+        query: str, 
+        max_pages: int = 10, 
+        preprocessed: bool = False,
+        rank: bool = True
+    ) -> List[Document]:
+        """
+        Scrape peraturan.bpk.go.id without blocking the event loop.
+        
+        Search pages are fetched in order; the detail pages of each search page
+        are fetched concurrently over the shared async client.
+        
+        Args:
+            query: The search query
+            max_pages: Maximum number of search result pages to process
+            preprocessed: Whether the query has already been through preprocess_query
+            rank: Whether to rank the documents by relevance with IndoBERT
+            
+        Returns:
+            List of document objects with content and metadata
+        """
+        logger.info(f"Searching for legal information related to: {query}")
+        
+        documents = []
+        
+        # Document links already fetched (results repeat across pages)
+        seen_links: Set[str] = set()
+        
+        try:
+            # Query preprocessing may call OpenAI, so keep it off the event loop
+            processed_query = query if preprocessed else await asyncio.to_thread(self.preprocess_query, query)
+            
+            # If the query was enhanced, log it
+            if processed_query != query:
+                logger.info(f"Enhanced query: {processed_query}")
+            
+            # Prepare the search URL
+            search_url = f"{self.base_url}/Search"
+            
+            # Process search result pages
+            for page in range(1, max_pages + 1):
+                try:
+                    logger.info(f"Searching page {page}")
                     
-                    if not result_items:
+                    # Get the page content
+                    tree = await self.aget_page_tree(
+                        search_url,
+                        self._search_params(processed_query, page),
+                        max_bytes=SEARCH_PAGE_MAX_BYTES
+                    )
+                    if not tree:
+                        logger.warning(f"Failed to get page {page}")
+                        continue
+                    
+                    results = self._parse_search_results(tree, page)
+                    if not results:
                         logger.warning(f"No results found on page {page}")
                         break
                     
-                    logger.info(f"Found {len(result_items)} results on page {page}")
+                    results = self._unseen_results(results, seen_links)
                     
-                    # Process each result item
-                    for i, item in enumerate(result_items):
+                    # Retrieve the full content of all results concurrently
+                    doc_trees = await asyncio.gather(
+                        *(self.aget_page_tree(result['link']) for result in results),
+                        return_exceptions=True
+                    )
+                    
+                    for result, doc_tree in zip(results, doc_trees):
                         try:
-                            logger.info(f"Processing result item {i+1}/{len(result_items)}")
-                            
-                            # Extract title and link - try multiple approaches
-                            title_element = None
-                            
-                            # Try different selectors to find the title and link
-                            title_selectors = [
-                                'h3.fw-bold.text-gray-800.mb-5 a', 
-                                'h3 a', 
-                                '.fw-bold.text-gray-800 a',
-                                'a[href*="/Home/Detail/"]',
-                                'a'
-                            ]
-                            
-                            for selector in title_selectors:
-                                candidates = item.select(selector)
-                                for candidate in candidates:
-                                    href = candidate.get('href', '')
-                                    if href and ('/Home/Detail/' in href or '/Details/' in href):
-                                        title_element = candidate
-                                        logger.info(f"Found title using selector: {selector}")
-                                        break
-                                if title_element:
-                                    break
+                            if isinstance(doc_tree, BaseException):
+                                raise doc_tree
                             
-                            if not title_element:
-                                logger.warning("Could not find title element, skipping item")
+                            if not doc_tree:
+                                logger.warning(f"Failed to get document page content for {result['link']}")
                                 continue
-                                
-                            title = title_element.text.strip()
-                            link = title_element.get('href')
-                            if not link:
-                                logger.warning("No link found, skipping item")
-                                continue
-                                
-                            # Make the link absolute
-                            link = urljoin(self.base_url, link)
-                            
-                            logger.info(f"Found document: {title}")
-                            logger.info(f"Link: {link}")
-                            
-                            # Extract metadata where available
-                            doc_type = "Unknown Type"
-                            date = "Unknown Date"
-                            preview = ""
                             
-                            # Try to extract metadata - updated selectors for current website structure
-                            try:
-                                # Try different selectors for metadata
-                                meta_elements = item.select('.text-gray-600 span, .text-muted span, small, .card-text small') or item.select('.search-result-item-meta span')
-                                if meta_elements and len(meta_elements) > 0:
-                                    doc_type = meta_elements[0].text.strip()
-                                if meta_elements and len(meta_elements) > 1:
-                                    date = meta_elements[1].text.strip()
-                                    
-                                # Try different selectors for preview
-                                preview_element = item.select_one('.card-text:not(:has(small))') or item.select_one('.search-result-item-preview')
-                                if preview_element:
-                                    preview = preview_element.text.strip()
-                            except Exception as meta_error:
-                                logger.warning(f"Error extracting metadata: {str(meta_error)}")
+                            document = self._build_result_document(result, doc_tree)
+                            if document is None:
+                                # Try to find PDF links (PDF extraction is CPU-bound, so run it in a thread)
+                                pdf_links = (await self.afind_pdf_links_batch([result['link']]))[0]
+                                document = await asyncio.to_thread(self._build_pdf_result_document, result, pdf_links)
                             
-                            # Retrieve the full document content
-                            try:
-                                logger.info(f"Retrieving document content from: {link}")
-                                
-                                # Get the document page content
-                                doc_soup = self.get_page_content(link)
-                                if not doc_soup:
-                                    logger.warning(f"Failed to get document page content for {link}")
-                                    continue
-                                
-                                # Extract the main content - try multiple approaches
-                                content = ""
-                                
-                                # Approach 1: Try specific selectors
-                                content_selectors = [
-                                    '.card-body', 
-                                    'main .container', 
-                                    '.document-content', 
-                                    '.content', 
-                                    'article', 
-                                    '#mainContent', 
-                                    '.detail-content'
-                                ]
-                                
-                                for selector in content_selectors:
-                                    content_element = doc_soup.select_one(selector)
-                                    if content_element and len(content_element.get_text(strip=True)) > 100:
-                                        content = content_element.get_text(separator='\n', strip=True)
-                                        logger.info(f"Found content using selector: {selector} ({len(content)} chars)")
-                                        break
-                                
-                                # Approach 2: If no content yet, try to extract from paragraphs
-                                if not content or len(content) < 200:
-                                    paragraphs = doc_soup.select('p') or doc_soup.select('.card-text') or doc_soup.select('div > div')
-                                    if paragraphs:
-                                        content = "\n\n".join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 20])
-                                
-                                # Approach 3: If still no content, try to get any text from the page
-                                if not content or len(content) < 200:
-                                    # Get all text from the body, excluding scripts and styles
-                                    for script in doc_soup(["script", "style"]):
-                                        script.extract()
-                                    content = doc_soup.body.get_text(separator='\n', strip=True)
-                                
-                                if content and len(content) > 200:
-                                    # Create a Document object
-                                    document = Document(
-                                        content=content,
-                                        metadata={
-                                            'title': title,
-                                            'source': link,
-                                            'type': doc_type,
-                                            'date': date,
-                                            'preview': preview,
-                                            'page': page
-                                        }
-                                    )
-                                    
-                                    documents.append(document)
-                                    logger.info(f"Added document: {title} ({len(content)} chars)")
-                                else:
-                                    logger.warning(f"Could not extract sufficient content for: {title}")
-                                    
-                                    # Try to find PDF links
-                                    pdf_links = self.find_pdf_links(link)
-                                    
-                                    if pdf_links:
-                                        logger.info(f"Found {len(pdf_links)} PDF links for: {title}")
-                                        
-                                        # Extract content from the first PDF
-                                        try:
-                                            pdf_content, pdf_metadata = self.pdf_extractor.download_and_extract(
-                                                pdf_links[0]['url'],
-                                                self.headers,
-                                                title
-                                            )
-                                            
-                                            if pdf_content:
-                                                # Create a Document object for the PDF
-                                                pdf_document = Document(
-                                                    content=pdf_content,
-                                                    metadata={
-                                                        'title': title,
-                                                        'source': pdf_links[0]['url'],
-                                                        'type': f"{doc_type} (PDF)",
-                                                        'date': date,
-                                                        'preview': preview,
-                                                        'pdf_metadata': pdf_metadata,
-                                                        'page': page
-                                                    }
-                                                )
-                                                
-                                                documents.append(pdf_document)
-                                                logger.info(f"Added PDF document: {title} ({len(pdf_content)} chars)")
-                                        except Exception as pdf_error:
-                                            logger.warning(f"Error extracting PDF content: {str(pdf_error)}")
-                            except Exception as doc_error:
-                                logger.warning(f"Error retrieving document content: {str(doc_error)}")
-                        except Exception as item_error:
-                            logger.warning(f"Error processing result item: {str(item_error)}")
+                            if document is not None:
+                                documents.append(document)
+                        except Exception as doc_error:
+                            logger.warning(f"Error retrieving document content: {str(doc_error)}")
                     
-                    # Check if there are more pages - updated selectors for pagination
-                    next_page = soup.select_one('.pagination .next:not(.disabled)') or soup.select_one('.pagination .page-item:not(.active):not(.disabled) .page-link')
-                    if not next_page:
+                    if not self._has_next_page(tree):
                         logger.info("No more pages available")
                         break
-                        
+                
                 except Exception as page_error:
                     logger.error(f"Error scraping page {page}: {str(page_error)}")
             
             logger.info(f"Scraped {len(documents)} documents from peraturan.bpk.go.id")
             
-            # Rank documents by relevance if IndoBERT is available
-            if self.indobert_client and self.indobert_client.is_available and documents:
-                logger.info("Ranking documents by relevance using IndoBERT")
+            if rank:
+                documents = await asyncio.to_thread(self._rank_scraped_documents, query, documents)
+        
+        except Exception as e:
+            logger.error(f"Error scraping peraturan.bpk.go.id: {str(e)}")
+            raise ScraperError(f"Error scraping peraturan.bpk.go.id: {str(e)}")
+        
+        return documents
+    
+    @staticmethod
+    def _search_params(query: str, page: int) -> Dict[str, Any]:
+        """
+        Build the query parameters of a search page.
+        
+        Args:
+            query: The processed search query
+            page: Search result page number
+            
+        Returns:
+            Query parameters (the first page has no page parameter)
+        """
+        params: Dict[str, Any] = {'keywords': query}
+        if page > 1:
+            params['page'] = page
+        return params
+    
+    def _parse_search_results(self, tree: Any, page: int) -> List[Dict[str, Any]]:
+        """
+        Extract the title, link and metadata of each result on a search page.
+        
+        Args:
+            tree: selectolax tree of the search page
+            page: Search result page number
+            
+        Returns:
+            List of search results
+        """
+        # Find all search result items - try multiple selectors
+        result_items = []
+        
+        # Try different selectors for result items
+        for selector in _RESULT_SELECTORS:
+            items = tree.css(selector)
+            if items:
+                logger.info(f"Found {len(items)} results using selector: {selector}")
+                result_items = items
+                break
+        
+        if not result_items:
+            # Last resort: look for any links that might be results
+            links = tree.css('a[href*="/Home/Detail/"]')
+            if links:
+                logger.info(f"Found {len(links)} results by searching for detail links")
                 
-                # Extract content and metadata for IndoBERT ranking
-                doc_dicts = [
-                    {"content": doc.content, "metadata": doc.metadata}
-                    for doc in documents
-                ]
+                # Use the links themselves as result items
+                result_items = links
+        
+        if not result_items:
+            return []
+        
+        logger.info(f"Found {len(result_items)} results on page {page}")
+        
+        results = []
+        
+        # Process each result item
+        for i, item in enumerate(result_items):
+            try:
+                logger.info(f"Processing result item {i+1}/{len(result_items)}")
                 
-                # Rank the documents
-                ranked_docs = self.indobert_client.rank_documents(query, doc_dicts)
+                # Extract title and link - try multiple approaches
+                title_element = None
                 
-                # Convert back to Document objects
-                documents = [
-                    Document(
-                        content=doc["content"],
-                        metadata=doc["metadata"]
-                    )
-                    for doc in ranked_docs
-                ]
+                # Try different selectors to find the title and link
+                if item.tag == 'a':
+                    # Link-only result items are their own title element
+                    href = item.attributes.get('href') or ''
+                    if '/Home/Detail/' in href or '/Details/' in href:
+                        title_element = item
+                else:
+                    # First detail link for each selector, without collecting every match
+                    for selector, link_selector in _TITLE_LINK_SELECTORS:
+                        title_element = item.css_first(link_selector)
+                        if title_element is not None:
+                            logger.info(f"Found title using selector: {selector}")
+                            break
                 
-                logger.info("Documents ranked by relevance using IndoBERT")
+                if not title_element:
+                    logger.warning("Could not find title element, skipping item")
+                    continue
+                
+                title = title_element.text().strip()
+                link = title_element.attributes.get('href')
+                if not link:
+                    logger.warning("No link found, skipping item")
+                    continue
+                
+                # Make the link absolute
+                link = self._absolute_link(link)
+                
+                logger.info(f"Found document: {title}")
+                logger.info(f"Link: {link}")
+                
+                # Extract metadata where available
+                doc_type = "Unknown Type"
+                date = "Unknown Date"
+                preview = ""
+                
+                # Try to extract metadata - updated selectors for current website structure
+                try:
+                    # Try different selectors for metadata
+                    meta_elements = item.css('.text-gray-600 span, .text-muted span, small, .card-text small') or item.css('.search-result-item-meta span')
+                    if meta_elements and len(meta_elements) > 0:
+                        doc_type = meta_elements[0].text().strip()
+                    if meta_elements and len(meta_elements) > 1:
+                        date = meta_elements[1].text().strip()
+                    
+                    # Try different selectors for preview
+                    preview_element = item.css_first('.card-text:not(:has(small))') or item.css_first('.search-result-item-preview')
+                    if preview_element:
+                        preview = preview_element.text().strip()
+                except Exception as meta_error:
+                    logger.warning(f"Error extracting metadata: {str(meta_error)}")
+                
+                results.append({
+                    'title': title,
+                    'link': link,
+                    'type': doc_type,
+                    'date': date,
+                    'preview': preview,
+                    'page': page
+                })
+            except Exception as item_error:
+                logger.warning(f"Error processing result item: {str(item_error)}")
+        
+        return results
+    
+    def _absolute_link(self, link: str) -> str:
+        """
+        Make a search result link absolute without re-parsing the base URL.
+        
+        Args:
+            link: Absolute, protocol-relative or site-relative link
             
-        except Exception as e:
-            logger.error(f"Error scraping peraturan.bpk.go.id: {str(e)}")
-            raise ScraperError(f"Error scraping peraturan.bpk.go.id: {str(e)}")
+        Returns:
+            Absolute URL on the BPK site
+        """
+        if link.startswith(('http://', 'https://')):
+            return link
+        if link.startswith('//'):
+            return f"https:{link}"
+        if link.startswith('/'):
+            return self._base_url_no_slash + link
+        return f"{self._base_url_no_slash}/{link}"
+    
+    @staticmethod
+    def _unseen_results(results: List[Dict[str, Any]], seen_links: Set[str]) -> List[Dict[str, Any]]:
+        """
+        Drop search results whose document link has already been seen.
+        
+        Args:
+            results: Search results
+            seen_links: Normalized links seen so far (updated in place)
+            
+        Returns:
+            Results with links not seen before
+        """
+        unseen = []
+        for result in results:
+            link = _normalize_link(result['link'])
+            if link in seen_links:
+                logger.info(f"Skipping duplicate result: {result['link']}")
+                continue
+            
+            seen_links.add(link)
+            unseen.append(result)
+        
+        return unseen
+    
+    def _build_result_document(self, result: Dict[str, Any], doc_tree: Any) -> Optional[Document]:
+        """
+        Build a document from the detail page of a search result.
+        
+        Args:
+            result: Search result
+            doc_tree: selectolax tree of the detail page
+            
+        Returns:
+            Document object, or None if the page has too little content
+        """
+        # Extract the main content, dropping invisible characters once at the end
+        content = self._extract_content(doc_tree).translate(_INVISIBLE_CHARS).strip()
+        
+        if not content or len(content) <= 200:
+            logger.warning(f"Could not extract sufficient content for: {result['title']}")
+            return None
+        
+        logger.info(f"Added document: {result['title']} ({len(content)} chars)")
+        
+        # Create a Document object
+        return Document(
+            content=content,
+            metadata={
+                'title': result['title'],
+                'source': result['link'],
+                'type': result['type'],
+                'date': result['date'],
+                'preview': result['preview'],
+                'page': result['page']
+            }
+        )
+    
+    @staticmethod
+    def _extract_content(doc_tree: Any) -> str:
+        """
+        Extract the main text of a detail page, stopping at the first approach with enough text.
+        
+        Args:
+            doc_tree: selectolax tree of the detail page
+            
+        Returns:
+            The extracted text (may be short or empty)
+        """
+        content = ""
+        
+        # Approach 1: First candidate container (in document order) with enough text
+        for content_element in doc_tree.css(_CONTENT_SELECTOR):
+            if len(text := content_element.text(separator='\n', strip=True)) > 100:
+                logger.info(f"Found content in <{content_element.tag}> ({len(text)} chars)")
+                content = text
+                break
+        
+        if len(content) >= 200:
+            return content
+        
+        # Approach 2: Extract from paragraphs
+        if paragraphs := doc_tree.css('p') or doc_tree.css('.card-text') or doc_tree.css('div > div'):
+            content = "\n\n".join(
+                text for text in (p.text(strip=True) for p in paragraphs) if len(text) > 20
+            )
+            if len(content) >= 200:
+                return content
+        
+        # Approach 3: Get all text from the body, excluding scripts and styles
+        body = doc_tree.body
+        if body is None:
+            return ""
+        body.strip_tags(["script", "style"])
+        return body.text(separator='\n', strip=True)
+    
+    def _build_pdf_result_document(
+        self,
+        result: Dict[str, Any],
+        pdf_links: List[Dict[str, str]]
+    ) -> Optional[Document]:
+        """
+        Build a document from the first PDF linked from a search result.
+        
+        Args:
+            result: Search result
+            pdf_links: PDF links found on the detail page
+            
+        Returns:
+            Document object, or None if no PDF content could be extracted
+        """
+        if not pdf_links:
+            return None
+        
+        title = result['title']
+        logger.info(f"Found {len(pdf_links)} PDF links for: {title}")
+        
+        # Extract content from the first PDF
+        try:
+            pdf_content, pdf_metadata = self.pdf_extractor.download_and_extract(
+                pdf_links[0]['url'],
+                self.headers,
+                title
+            )
+            
+            if not pdf_content:
+                return None
+            
+            logger.info(f"Added PDF document: {title} ({len(pdf_content)} chars)")
+            
+            # Create a Document object for the PDF
+            return Document(
+                content=pdf_content,
+                metadata={
+                    'title': title,
+                    'source': pdf_links[0]['url'],
+                    'type': f"{result['type']} (PDF)",
+                    'date': result['date'],
+                    'preview': result['preview'],
+                    'pdf_metadata': pdf_metadata,
+                    'page': result['page']
+                }
+            )
+        except Exception as pdf_error:
+            logger.warning(f"Error extracting PDF content: {str(pdf_error)}")
+            return None
+    
+    @staticmethod
+    def _has_next_page(tree: Any) -> bool:
+        """
+        Check whether a search page links to a next page.
+        
+        Args:
+            tree: selectolax tree of the search page
+            
+        Returns:
+            True if there are more pages
+        """
+        # Updated selectors for pagination
+        next_page = tree.css_first('.pagination .next:not(.disabled)') or tree.css_first('.pagination .page-item:not(.active):not(.disabled) .page-link')
+        return next_page is not None
+    
+    def _rank_scraped_documents(self, query: str, documents: List[Document]) -> List[Document]:
+        """
+        Rank scraped documents by relevance if IndoBERT is available.
+        
+        Args:
+            query: The search query
+            documents: Scraped documents
+            
+        Returns:
+            Documents sorted by relevance
+        """
+        if not (self.indobert_client and self.indobert_client.is_available and documents):
+            return documents
+        
+        logger.info("Ranking documents by relevance using IndoBERT")
+        
+        # Rank the contents and reorder the existing Document objects
+        order = self.indobert_client.rank_indices(query, [doc.content for doc in documents])
+        documents = [documents[i] for i in order]
+        
+        logger.info("Documents ranked by relevance using IndoBERT")
         
         return documents
     
-    def search_pdf_documents(self, query: str, max_pages: int = 5) -> List[Document]:
+    def search_pdf_documents(
+        self, 
+        query: str, 
+        max_pages: int = 5, 
+        preprocessed: bool = False,
+        rank: bool = True
+    ) -> List[Document]:
         """
         Search for PDF documents on peraturan.bpk.go.id based on a query.
         
         Args:
             query: The search query
             max_pages: Maximum number of search result pages to process
+            preprocessed: Whether the query has already been through preprocess_query
+            rank: Whether to rank the documents by relevance with IndoBERT
             
         Returns:
             List of document objects with PDF content and metadata
@@ -413,12 +952,12 @@ class BPKScraper(BaseScraper):
         logger.info(f"Searching for PDF documents related to: {query}")
         
         if not self.pdf_extractor.is_available:
-            logger.warning("PyPDF2 is not available. Cannot extract PDF content.")
+            logger.warning("No PDF library is available. Cannot extract PDF content.")
             return []
             
         try:
             # Process the query with legal language conversion if available
-            processed_query = self.preprocess_query(query)
+            processed_query = query if preprocessed else self.preprocess_query(query)
             
             # If the query was enhanced, log it
             if processed_query != query:
@@ -429,6 +968,7 @@ class BPKScraper(BaseScraper):
             
             documents = []
             pdf_urls_processed = set()  # Track processed PDFs to avoid duplicates
+            new_pdf_links = []
             
             # Process search result pages
             for page_num in range(1, max_pages + 1):
@@ -437,7 +977,7 @@ class BPKScraper(BaseScraper):
                 # Find PDF links on the search results page
                 pdf_links = self.find_pdf_links(page_url)
                 
-                # Process each PDF link
+                # Collect each PDF link
                 for pdf_link in pdf_links:
                     pdf_url = pdf_link['url']
                     
@@ -446,14 +986,23 @@ class BPKScraper(BaseScraper):
                         continue
                         
                     pdf_urls_processed.add(pdf_url)
-                    
-                    # Download and extract the PDF
-                    content, metadata = self.pdf_extractor.download_and_extract(
-                        pdf_url, 
+                    new_pdf_links.append(pdf_link)
+            
+            # Download and extract the PDFs concurrently
+            with ThreadPoolExecutor(max_workers=PDF_EXTRACT_WORKERS) as executor:
+                futures = [
+                    executor.submit(
+                        self.pdf_extractor.download_and_extract,
+                        pdf_link['url'], 
                         self.headers,
                         pdf_link['text']
                     )
-                    
+                    for pdf_link in new_pdf_links
+                ]
+                
+                # Collect results in link order
+                for pdf_link, future in zip(new_pdf_links, futures):
+                    content, metadata = future.result()
                     if content and metadata:
                         # Add additional metadata
                         metadata.update({
@@ -470,28 +1019,8 @@ class BPKScraper(BaseScraper):
                         logger.info(f"Added PDF document: {metadata.get('title', 'Untitled')}")
             
             # Sort documents by relevance if embeddings are available
-            if self.indobert_client and self.indobert_client.is_available and documents:
-                logger.info("Sorting PDF documents by relevance using IndoBERT")
-                
-                # Extract content and metadata for IndoBERT ranking
-                doc_dicts = [
-                    {"content": doc.content, "metadata": doc.metadata}
-                    for doc in documents
-                ]
-                
-                # Rank the documents
-                ranked_docs = self.indobert_client.rank_documents(query, doc_dicts)
-                
-                # Convert back to Document objects
-                documents = [
-                    Document(
-                        content=doc["content"],
-                        metadata=doc["metadata"]
-                    )
-                    for doc in ranked_docs
-                ]
-                
-                logger.info("PDF documents sorted by relevance using IndoBERT")
+            if rank:
+                documents = self._rank_scraped_documents(query, documents)
             
             return documents
             
@@ -521,41 +1050,30 @@ class BPKScraper(BaseScraper):
             if processed_query != query:
                 logger.info(f"Enhanced query: {processed_query}")
             
-            # Scrape documents from peraturan.bpk.go.id
-            documents = self.scrape_peraturan_bpk(processed_query, max_pages=max_pages)
+            # Scrape documents from peraturan.bpk.go.id (the query is already processed)
+            documents = self.scrape_peraturan_bpk(
+                processed_query, 
+                max_pages=max_pages, 
+                preprocessed=True, 
+                rank=False
+            )
             
-            # Search for PDF documents if PyPDF2 is available
+            # Search for PDF documents if a PDF library is available
             if self.pdf_extractor.is_available:
                 logger.info("Searching for PDF documents...")
-                pdf_documents = self.search_pdf_documents(processed_query, max_pages=max_pages)
+                pdf_documents = self.search_pdf_documents(
+                    processed_query, 
+                    max_pages=max_pages, 
+                    preprocessed=True, 
+                    rank=False
+                )
                 
                 if pdf_documents:
                     logger.info(f"Found {len(pdf_documents)} PDF documents")
                     documents.extend(pdf_documents)
             
-            # Sort all documents by relevance if embeddings are available
-            if self.indobert_client and self.indobert_client.is_available and documents:
-                logger.info("Sorting all documents by relevance using IndoBERT")
-                
-                # Extract content and metadata for IndoBERT ranking
-                doc_dicts = [
-                    {"content": doc.content, "metadata": doc.metadata}
-                    for doc in documents
-                ]
-                
-                # Rank the documents
-                ranked_docs = self.indobert_client.rank_documents(query, doc_dicts)
-                
-                # Convert back to Document objects
-                documents = [
-                    Document(
-                        content=doc["content"],
-                        metadata=doc["metadata"]
-                    )
-                    for doc in ranked_docs
-                ]
-                
-                logger.info("All documents sorted by relevance using IndoBERT")
+            # Rank the merged documents once (the scrapers above skip their own ranking)
+            documents = self._rank_scraped_documents(query, documents)
             
             # Limit results
             if max_results and len(documents) > max_results:
@@ -572,9 +1090,9 @@ class BPKScraper(BaseScraper):
             logger.error(f"Error searching for documents: {str(e)}")
             raise ScraperError(f"Error searching for documents: {str(e)}")
     
-    def generate_html_report(self, query: str, documents: List[Document], response: str) -> str:
+    def render_html_report(self, query: str, documents: List[Document], response: str) -> str:
         """
-        Generate an HTML report of the scraped documents.
+        Render an HTML report of the scraped documents in memory.
         
         Args:
             query: The original query
@@ -582,219 +1100,129 @@ class BPKScraper(BaseScraper):
             response: The response from the LLM
             
         Returns:
-            The path to the generated HTML file
+            The HTML report content
         """
-        try:
-            # Create timestamp for unique filename
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Generate a safe filename from the query
-            safe_query = re.sub(r'[^\w\s-]', '', query)
-            safe_query = re.sub(r'[\s-]+', '_', safe_query)
-            
-            # Create the filename
-            filename = f"bpk_report_{safe_query}_{timestamp}.html"
+        return "".join(self._html_report_parts(query, documents, response))
+    
+    def _html_report_parts(self, query: str, documents: List[Document], response: str) -> Iterator[str]:
+        """
+        Generate the HTML report in pieces, one document at a time.
+        
+        Args:
+            query: The original query
+            documents: List of Document objects
+            response: The response from the LLM
             
-            # Create HTML content
-            html_content = f"""
-            <!DOCTYPE html>
-            <html lang="en">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>BPK Legal Document Report: {query}</title>
-                <style>
-                    body {{
-                        font-family: Arial, sans-serif;
-                        line-height: 1.6;
-                        margin: 0;
-                        padding: 20px;
-                        color: #333;
-                    }}
-                    .container {{
-                        max-width: 1200px;
-                        margin: 0 auto;
-                        background-color: #fff;
-                        padding: 20px;
-                        box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
-                    }}
-                    header {{
-                        background-color: #005A9C;
-                        color: white;
-                        padding: 20px;
-                        text-align: center;
-                        margin-bottom: 20px;
-                    }}
-                    h1 {{
-                        margin: 0;
-                        font-size: 24px;
-                    }}
-                    h2 {{
-                        color: #005A9C;
-                        border-bottom: 1px solid #ddd;
-                        padding-bottom: 10px;
-                        margin-top: 30px;
-                    }}
-                    .query-info {{
-                        background-color: #f5f5f5;
-                        padding: 15px;
-                        border-radius: 5px;
-                        margin-bottom: 20px;
-                    }}
-                    .document {{
-                        margin-bottom: 30px;
-                        padding: 15px;
-                        background-color: #f9f9f9;
-                        border-radius: 5px;
-                        border-left: 5px solid #005A9C;
-                    }}
-                    .document-header {{
-                        margin-bottom: 10px;
-                    }}
-                    .document-title {{
-                        font-weight: bold;
-                        font-size: 18px;
-                        color: #005A9C;
-                    }}
-                    .document-meta {{
-                        color: #666;
-                        font-size: 14px;
-                        margin: 5px 0;
-                    }}
-                    .document-content {{
-                        max-height: 300px;
-                        overflow-y: auto;
-                        padding: 10px;
-                        background-color: #fff;
-                        border: 1px solid #ddd;
-                        border-radius: 3px;
-                        margin-top: 10px;
-                    }}
-                    .document-content pre {{
-                        white-space: pre-wrap;
-                        font-family: monospace;
-                        margin: 0;
-                    }}
-                    .response {{
-                        background-color: #e6f7ff;
-                        padding: 20px;
-                        border-radius: 5px;
-                        margin-bottom: 30px;
-                        border-left: 5px solid #1890ff;
-                    }}
-                    footer {{
-                        text-align: center;
-                        margin-top: 30px;
-                        padding-top: 20px;
-                        border-top: 1px solid #ddd;
-                        color: #666;
-                        font-size: 14px;
-                    }}
-                    .relevance-score {{
-                        display: inline-block;
-                        padding: 3px 8px;
-                        background-color: #005A9C;
-                        color: white;
-                        border-radius: 12px;
-                        font-size: 12px;
-                        margin-left: 10px;
-                    }}
-                    .pdf-badge {{
-                        display: inline-block;
-                        padding: 3px 8px;
-                        background-color: #d9534f;
-                        color: white;
-                        border-radius: 12px;
-                        font-size: 12px;
-                        margin-left: 10px;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <header>
-                        <h1>BPK Legal Document Report</h1>
-                    </header>
-                    
-                    <div class="query-info">
-                        <h2>Query Information</h2>
-                        <p><strong>Original Query:</strong> {query}</p>
-                        <p><strong>Search Date:</strong> {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-                        <p><strong>Documents Found:</strong> {len(documents)}</p>
-                    </div>
+        Yields:
+            Consecutive pieces of the HTML report
+        """
+        # Line breaks are converted outside the f-string (backslashes are not allowed there before 3.12)
+        response_html = escape(response).replace('\n', '<br>')
+        
+        # Create HTML content
+        yield f"""
+        <!DOCTYPE html>
+        <html lang="en">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>BPK Legal Document Report: {escape(query)}</title>"""
+        yield _REPORT_STATIC_HEAD
+        
+        # Query information and response
+        yield f"""
+                <div class="query-info">
+                    <h2>Query Information</h2>
+                    <p><strong>Original Query:</strong> {escape(query)}</p>
+                    <p><strong>Search Date:</strong> {time.strftime("%Y-%m-%d %H:%M:%S")}</p>
+                    <p><strong>Documents Found:</strong> {len(documents)}</p>
+                </div>
                     
-                    <div class="response">
-                        <h2>Response</h2>
-                        <p>{response.replace('\n', '<br>')}</p>
-                    </div>
+                <div class="response">
+                    <h2>Response</h2>
+                    <p>{response_html}</p>
+                </div>
                     
-                    <h2>Retrieved Documents</h2>
-            """
+                <h2>Retrieved Documents</h2>
+        """
             
-            # Add each document to the HTML
-            for i, doc in enumerate(documents):
-                title = doc.metadata.get('title', 'Untitled Document')
-                source = doc.metadata.get('source', 'Unknown Source')
-                doc_type = doc.metadata.get('type', 'html')
+        # Add each document to the HTML
+        for i, doc in enumerate(documents):
+            title = escape(str(doc.metadata.get('title', 'Untitled Document')))
+            source = escape(str(doc.metadata.get('source', 'Unknown Source')))
+            doc_type = doc.metadata.get('type', 'html')
                 
-                # Get document type indicator
-                doc_type_badge = ""
-                if "PDF" in doc_type:
-                    doc_type_badge = '<span class="pdf-badge">PDF</span>'
+            # Get document type indicator
+            doc_type_badge = ""
+            if "PDF" in doc_type:
+                doc_type_badge = '<span class="pdf-badge">PDF</span>'
                 
-                # Get relevance score if available
-                relevance_badge = ""
-                if 'relevance_score' in doc.metadata:
-                    score = doc.metadata['relevance_score']
-                    relevance_badge = f'<span class="relevance-score">Relevance: {score:.2f}</span>'
+            # Get relevance score if available
+            relevance_badge = ""
+            if 'relevance_score' in doc.metadata:
+                score = doc.metadata['relevance_score']
+                relevance_badge = f'<span class="relevance-score">Relevance: {score:.2f}</span>'
                 
-                # Format content based on type
-                if "PDF" in doc_type:
-                    # For PDF content, preserve formatting
-                    content_html = f"<pre>{doc.content}</pre>"
-                else:
-                    # For HTML content, preserve HTML formatting
-                    content_html = doc.content.replace('\n', '<br>')
+            # Format content based on type
+            if "PDF" in doc_type:
+                # For PDF content, preserve formatting
+                content_html = f"<pre>{escape(doc.content)}</pre>"
+            else:
+                # For HTML content, preserve HTML formatting
+                content_html = escape(doc.content).replace('\n', '<br>')
+            
+            # Add document to HTML
+            yield f"""
+                <div class="document">
+                    <div class="document-header">
+                        <div class="document-title">{i+1}. {title} {doc_type_badge} {relevance_badge}</div>
+                        <div class="document-meta"><strong>Source:</strong> <a href="{source}" target="_blank">{source}</a></div>
+                        <div class="document-meta"><strong>Type:</strong> {escape(doc_type)}</div>
+            """
                 
-                # Add document to HTML
-                html_content += f"""
-                    <div class="document">
-                        <div class="document-header">
-                            <div class="document-title">{i+1}. {title} {doc_type_badge} {relevance_badge}</div>
-                            <div class="document-meta"><strong>Source:</strong> <a href="{source}" target="_blank">{source}</a></div>
-                            <div class="document-meta"><strong>Type:</strong> {doc_type}</div>
+            # Add date if available
+            if 'date' in doc.metadata:
+                yield f"""
+                        <div class="document-meta"><strong>Date:</strong> {escape(str(doc.metadata['date']))}</div>
                 """
                 
-                # Add date if available
-                if 'date' in doc.metadata:
-                    html_content += f"""
-                            <div class="document-meta"><strong>Date:</strong> {doc.metadata['date']}</div>
-                    """
-                
-                # Add content preview
-                html_content += f"""
-                        </div>
-                        <div class="document-content">
-                            {content_html}
-                        </div>
+            # Add content preview
+            yield f"""
+                    </div>
+                    <div class="document-content">
+                        {content_html}
                     </div>
-                """
-            
-            # Close HTML tags
-            html_content += """
                 </div>
-                
-                <footer>
-                    <p>This report was generated using the BPK Legal Document API.</p>
-                </footer>
-            </body>
-            </html>
             """
             
-            # Write HTML to file
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+        # Close HTML tags
+        yield _REPORT_STATIC_TAIL
+    
+    def generate_html_report(self, query: str, documents: List[Document], response: str) -> str:
+        """
+        Generate an HTML report of the scraped documents and save it to disk.
+        
+        Args:
+            query: The original query
+            documents: List of Document objects
+            response: The response from the LLM
+            
+        Returns:
+            The path to the generated HTML file
+        """
+        try:
+            # Create timestamp for unique filename
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            
+            # Generate a safe filename from the query
+            safe_query = _QUERY_SEPARATOR_RE.sub('_', _QUERY_UNSAFE_RE.sub('', query))
+            
+            # Create the filename
+            filename = f"bpk_report_{safe_query}_{timestamp}.html"
+            
+            # Write HTML to file piece by piece
+            with open(filename, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER) as f:
+                f.writelines(self._html_report_parts(query, documents, response))
             
             logger.info(f"Report saved to {filename}")
             return filename
@@ -1,28 +1,27 @@
-from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 import uvicorn
+import anyio
+import asyncio
 import time
+import orjson
 
 from app.config import get_settings
 from app.core.logging import setup_logging, get_logger
-from app.core.exceptions import (
-    BaseAPIException, 
-    DocumentNotFoundError, 
-    InvalidQueryError, 
-    ScraperError, 
-    OpenAIError
-)
+from app.core.exceptions import BaseAPIException
 from app.api.errors import (
     validation_exception_handler,
     api_exception_handler,
-    document_not_found_handler,
-    invalid_query_handler,
-    scraper_error_handler,
-    openai_error_handler,
     general_exception_handler
 )
+from app.api.responses import ORJSONResponse
+from app.api.dependencies import (
+    get_openai_client,
+    get_indobert_client,
+    get_query_service
+)
 from app.api.routes import search, documents
 
 # Get settings
@@ -31,6 +30,34 @@ settings = get_settings()
 # Setup logging
 logger = setup_logging(name="bpk_api", level="INFO", json_format=True)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the dependency graph before the server accepts requests.
+    
+    Model loading is blocking, so it runs in a worker thread to keep the
+    event loop responsive during startup.
+    
+    Args:
+        app: FastAPI application
+    """
+    # Size the threadpool used for blocking scraper/AI calls
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    
+    logger.info("Warming up application dependencies")
+    
+    # IndoBERT is the slowest dependency to load
+    await asyncio.to_thread(get_indobert_client)
+    await asyncio.to_thread(get_openai_client)
+    
+    # Builds the scraper and document service transitively
+    await asyncio.to_thread(get_query_service)
+    
+    logger.info("Application dependencies ready")
+    yield
+
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -38,7 +65,9 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -52,56 +81,37 @@ app.add_middleware(
 
 # Add exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
+# BaseAPIException subclasses resolve to this handler through the MRO
 app.add_exception_handler(BaseAPIException, api_exception_handler)
-app.add_exception_handler(DocumentNotFoundError, document_not_found_handler)
-app.add_exception_handler(InvalidQueryError, invalid_query_handler)
-app.add_exception_handler(ScraperError, scraper_error_handler)
-app.add_exception_handler(OpenAIError, openai_error_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
-# Add request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add X-Process-Time header to responses."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
-# Add logging middleware
+# Add logging and request timing middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log request information."""
-    start_time = time.time()
-    
-    # Get request details
-    method = request.method
-    url = request.url.path
-    query_params = str(request.query_params)
-    client_host = request.client.host if request.client else "unknown"
-    
-    # Log the request
-    logger.info(
-        f"Request: {method} {url}",
-        extra={
-            "method": method,
-            "url": url,
-            "query_params": query_params,
-            "client_host": client_host
-        }
-    )
+    """Log request information and add the X-Process-Time header to responses."""
+    start_ns = time.perf_counter_ns()
     
     # Process the request
     response = await call_next(request)
     
     # Calculate processing time
-    process_time = time.time() - start_time
+    process_time = (time.perf_counter_ns() - start_ns) / 1e9
+    response.headers["X-Process-Time"] = f"{process_time:.6f}"
     
-    # Log the response
+    # Log the request once it has completed
+    method = request.method
+    url = request.url.path
     logger.info(
-        f"Response: {response.status_code} in {process_time:.4f}s",
+        "%s %s -> %s in %.4fs",
+        method,
+        url,
+        response.status_code,
+        process_time,
         extra={
+            "method": method,
+            "url": url,
+            "query_params": str(request.query_params),
+            "client_host": request.client.host if request.client else "unknown",
             "status_code": response.status_code,
             "process_time": process_time
         }
@@ -113,18 +123,21 @@ async def log_requests(request: Request, call_next):
 app.include_router(search.router, prefix=settings.API_V1_STR)
 app.include_router(documents.router, prefix=settings.API_V1_STR)
 
+# Root endpoint body never changes, so serialize it once
+_ROOT_BODY = orjson.dumps({
+    "name": settings.PROJECT_NAME,
+    "version": "1.0.0",
+    "description": "API for searching and retrieving legal documents from peraturan.bpk.go.id",
+    "docs_url": "/docs",
+    "redoc_url": "/redoc",
+    "api_prefix": settings.API_V1_STR
+})
+
 # Add root endpoint
 @app.get("/", tags=["root"])
-async def root():
+async def root() -> Response:
     """Root endpoint."""
-    return {
-        "name": settings.PROJECT_NAME,
-        "version": "1.0.0",
-        "description": "API for searching and retrieving legal documents from peraturan.bpk.go.id",
-        "docs_url": "/docs",
-        "redoc_url": "/redoc",
-        "api_prefix": settings.API_V1_STR
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 # Add health check endpoint
 @app.get("/health", tags=["health"])
@@ -1,4 +1,6 @@
+from hashlib import blake2b
 from typing import List, Dict, Any, Optional
+from app.core.cache import TTLCache
 from app.core.logging import get_logger
 from app.domain.models import Document
 from app.core.exceptions import DocumentNotFoundError, ScraperError
@@ -10,6 +12,21 @@ from app.utils.pdf import PDFExtractor
 logger = get_logger(__name__)
 
 
+def _document_id(prefix: str, content: str) -> str:
+    """
+    Build a stable document ID from the document content.
+    
+    Args:
+        prefix: ID prefix for the document source
+        content: Document content
+        
+    Returns:
+        Prefixed 64-bit BLAKE2b digest of the content
+    """
+    digest = blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+    return f"{prefix}_{digest}"
+
+
 class DocumentService:
     """Service for document operations."""
     
@@ -17,7 +34,8 @@ class DocumentService:
         self,
         bpk_scraper: BPKScraper,
         openai_client: Optional[OpenAIClient] = None,
-        indobert_client: Optional[IndoBERTClient] = None
+        indobert_client: Optional[IndoBERTClient] = None,
+        search_cache: Optional[TTLCache] = None
     ):
         """
         Initialize the document service.
@@ -26,10 +44,12 @@ class DocumentService:
             bpk_scraper: BPK scraper instance
             openai_client: OpenAI client instance
             indobert_client: IndoBERT client instance
+            search_cache: Cache for scraped search results (None disables caching)
         """
         self.bpk_scraper = bpk_scraper
         self.openai_client = openai_client
         self.indobert_client = indobert_client
+        self.search_cache = search_cache
         self.pdf_extractor = PDFExtractor()
         
         # In-memory document storage (could be replaced with a database)
@@ -55,17 +75,28 @@ class DocumentService:
         try:
             logger.info(f"Searching for documents with query: {query}")
             
-            # Use the BPK scraper to search for documents
-            documents = self.bpk_scraper.search(
-                query=query,
-                max_pages=max_pages,
-                max_results=max_results
-            )
+            # Reuse recently scraped results for the same search
+            cache_key = (query, max_pages, max_results)
+            cached = self.search_cache.get(cache_key) if self.search_cache is not None else None
+            if cached is not None:
+                logger.info(f"Returning cached documents for query: {query}")
+                documents = list(cached)
+            else:
+                # Use the BPK scraper to search for documents
+                documents = self.bpk_scraper.search(
+                    query=query,
+                    max_pages=max_pages,
+                    max_results=max_results
+                )
+                
+                # An empty result may be a swallowed scrape failure, so it is not cached
+                if self.search_cache is not None and documents:
+                    self.search_cache.set(cache_key, tuple(documents))
             
             # Store documents for future reference
-            for i, doc in enumerate(documents):
-                # Generate a document ID
-                doc_id = f"doc_{hash(doc.content)}"
+            for doc in documents:
+                # Generate a document ID (cached documents already have one)
+                doc_id = doc.metadata.get('id') or _document_id("doc", doc.content)
                 doc.metadata['id'] = doc_id
                 
                 # Store the document
@@ -76,6 +107,23 @@ class DocumentService:
             logger.error(f"Error searching for documents: {str(e)}")
             raise ScraperError(f"Error searching for documents: {str(e)}")
     
+    def invalidate_cache(self, query: Optional[str] = None) -> int:
+        """
+        Invalidate cached search results.
+        
+        Args:
+            query: Query whose results to drop (None drops all results)
+            
+        Returns:
+            Number of cached searches removed
+        """
+        if self.search_cache is None:
+            return 0
+        
+        if query is None:
+            return self.search_cache.invalidate()
+        return self.search_cache.invalidate(query)
+    
     def get_document_by_id(self, document_id: str) -> Document:
         """
         Get a document by its ID.
@@ -127,7 +175,7 @@ class DocumentService:
             document = Document(content=content, metadata=metadata)
             
             # Generate a document ID
-            doc_id = f"pdf_{hash(content)}"
+            doc_id = _document_id("pdf", content)
             document.metadata['id'] = doc_id
             
             # Store the document
@@ -170,6 +218,31 @@ class DocumentService:
             logger.error(f"Error generating report: {str(e)}")
             return f"Error generating report: {str(e)}"
     
+    def render_report(
+        self, 
+        query: str, 
+        documents: List[Document], 
+        response: str
+    ) -> str:
+        """
+        Render an HTML report of the documents in memory.
+        
+        Args:
+            query: The original query
+            documents: List of documents
+            response: Generated response
+            
+        Returns:
+            HTML report content
+        """
+        logger.info(f"Rendering report for query: {query}")
+        
+        return self.bpk_scraper.render_html_report(
+            query=query,
+            documents=documents,
+            response=response
+        )
+    
     def rank_documents(
         self, 
         query: str, 
@@ -192,25 +265,10 @@ class DocumentService:
         try:
             logger.info("Ranking documents by relevance using IndoBERT")
             
-            # Extract content and metadata for IndoBERT ranking
-            doc_dicts = [
-                {"content": doc.content, "metadata": doc.metadata}
-                for doc in documents
-            ]
-            
-            # Rank the documents
-            ranked_docs = self.indobert_client.rank_documents(query, doc_dicts)
-            
-            # Convert back to Document objects
-            ranked_documents = [
-                Document(
-                    content=doc["content"],
-                    metadata=doc["metadata"]
-                )
-                for doc in ranked_docs
-            ]
+            # Rank the contents and reorder the existing Document objects
+            order = self.indobert_client.rank_indices(query, [doc.content for doc in documents])
             
-            return ranked_documents
+            return [documents[i] for i in order]
         except Exception as e:
             logger.error(f"Error ranking documents: {str(e)}")
             return documents
\ No newline at end of file
@@ -1,4 +1,6 @@
+import re
 from typing import List, Dict, Any, Optional
+from app.core.cache import TTLCache
 from app.core.logging import get_logger
 from app.domain.models import Document, SearchResult, UserPreferences
 from app.core.exceptions import InvalidQueryError, ScraperError
@@ -7,6 +9,9 @@ from app.infrastructure.ai.openai_client import OpenAIClient
 
 logger = get_logger(__name__)
 
+# Words longer than 3 characters, used as fallback keywords
+_KEYWORD_RE = re.compile(r"\w{4,}")
+
 
 class QueryService:
     """Service for processing legal queries."""
@@ -14,7 +19,8 @@ class QueryService:
     def __init__(
         self,
         document_service: DocumentService,
-        openai_client: Optional[OpenAIClient] = None
+        openai_client: Optional[OpenAIClient] = None,
+        result_cache: Optional[TTLCache] = None
     ):
         """
         Initialize the query service.
@@ -22,9 +28,11 @@ class QueryService:
         Args:
             document_service: Document service instance
             openai_client: OpenAI client instance
+            result_cache: Cache for search results (None disables caching)
         """
         self.document_service = document_service
         self.openai_client = openai_client
+        self.result_cache = result_cache
     
     def process_query(
         self,
@@ -45,6 +53,18 @@ class QueryService:
             logger.warning("Empty query received")
             raise InvalidQueryError("Query cannot be empty")
         
+        # Set default preferences if not provided
+        if not user_preferences:
+            user_preferences = UserPreferences()
+        
+        # Return the cached result for identical queries and preferences
+        cache_key = (query, user_preferences.model_dump_json())
+        if self.result_cache is not None:
+            cached_result = self.result_cache.get(cache_key)
+            if cached_result is not None:
+                logger.info(f"Returning cached result for query: {query}")
+                return cached_result
+        
         try:
             logger.info(f"Processing query: {query}")
             
@@ -62,10 +82,6 @@ class QueryService:
                 # Fall back to simple extraction
                 keywords = self._simple_keyword_extraction(query)
             
-            # Set default preferences if not provided
-            if not user_preferences:
-                user_preferences = UserPreferences()
-            
             # Search for documents
             documents = self.document_service.search_documents(
                 query=query,
@@ -73,22 +89,46 @@ class QueryService:
                 max_results=user_preferences.max_results
             )
             
+            # Convert documents once for both the response and the result
+            document_dicts = [self._convert_document_to_dict(doc) for doc in documents]
+            
             # Generate response
-            response = self._generate_response(query, documents, user_preferences.dict())
+            response = self._generate_response(query, documents, document_dicts, user_preferences)
             
-            # Create search result
-            search_result = SearchResult(
+            # Create search result (fields are built here, so skip re-validating and copying them)
+            search_result = SearchResult.model_construct(
                 original_query=query,
                 keywords=keywords,
-                documents=[self._convert_document_to_dict(doc) for doc in documents],
+                documents=document_dicts,
                 response=response
             )
             
+            # Don't cache empty results: a failed scrape also returns no documents
+            if self.result_cache is not None and document_dicts:
+                self.result_cache.set(cache_key, search_result)
+            
             return search_result
         except Exception as e:
             logger.error(f"Error processing query: {str(e)}")
             raise ScraperError(f"Error processing query: {str(e)}")
     
+    def invalidate_cache(self, query: Optional[str] = None) -> int:
+        """
+        Invalidate cached search results.
+        
+        Args:
+            query: Query whose results to drop (None drops all results)
+            
+        Returns:
+            Number of cached results removed
+        """
+        if self.result_cache is None:
+            return 0
+        
+        if query is None:
+            return self.result_cache.invalidate()
+        return self.result_cache.invalidate(query)
+    
     def _simple_keyword_extraction(self, query: str, max_keywords: int = 5) -> List[str]:
         """
         Extract keywords from a query without using external services.
@@ -100,22 +140,27 @@ class QueryService:
         Returns:
             List of extracted keywords
         """
-        # Split query into words
-        words = query.lower().split()
+        keywords: List[str] = []
+        seen = set()
         
-        # Keep only words longer than 3 characters
-        keywords = [word for word in words if len(word) > 3]
-        
-        # Deduplicate and limit to max_keywords
-        unique_keywords = list(dict.fromkeys(keywords))[:max_keywords]
+        # Take distinct words longer than 3 characters, stopping once max_keywords are found
+        for match in _KEYWORD_RE.finditer(query.casefold()):
+            if len(keywords) >= max_keywords:
+                break
+            
+            word = match.group()
+            if word not in seen:
+                seen.add(word)
+                keywords.append(word)
         
-        return unique_keywords
+        return keywords
     
     def _generate_response(
         self,
         query: str,
         documents: List[Document],
-        user_preferences: Dict[str, Any]
+        document_dicts: List[Dict[str, Any]],
+        user_preferences: UserPreferences
     ) -> str:
         """
         Generate a response based on the query and retrieved documents.
@@ -123,6 +168,7 @@ class QueryService:
         Args:
             query: The user's query
             documents: Retrieved documents
+            document_dicts: The retrieved documents converted to dictionaries
             user_preferences: User preferences for response formatting
             
         Returns:
@@ -136,8 +182,8 @@ class QueryService:
             try:
                 response = self.openai_client.generate_legal_response(
                     query=query,
-                    documents=[self._convert_document_to_dict(doc) for doc in documents],
-                    user_preferences=user_preferences
+                    documents=document_dicts,
+                    user_preferences=user_preferences.model_dump()
                 )
                 return response
             except Exception as e:
@@ -159,7 +205,7 @@ class QueryService:
         Returns:
             Simple response based on documents
         """
-        response = f"Based on the retrieved documents, here is information related to your query about '{query}':\n\n"
+        parts = [f"Based on the retrieved documents, here is information related to your query about '{query}':\n\n"]
         
         # Add information from the top 3 documents
         for i, doc in enumerate(documents[:3]):
@@ -167,18 +213,18 @@ class QueryService:
             doc_type = doc.metadata.get('type', 'Unknown')
             source = doc.metadata.get('source', 'Unknown source')
             
-            # Add document summary
-            response += f"Document {i+1}: {title} ({doc_type})\n"
-            response += f"Source: {source}\n"
+            # Add content preview (first 200 characters, newlines flattened on the slice only)
+            preview = doc.content[:200].replace('\n', ' ')
+            if len(doc.content) > 200:
+                preview += "..."
             
-            # Add content preview (first 200 characters)
-            preview = doc.content[:200].replace('\n', ' ') + "..." if len(doc.content) > 200 else doc.content
-            response += f"Preview: {preview}\n\n"
+            # Add document summary
+            parts.append(f"Document {i+1}: {title} ({doc_type})\nSource: {source}\nPreview: {preview}\n\n")
         
         # Add concluding note
-        response += "For more detailed information, please review the full documents in the search results."
+        parts.append("For more detailed information, please review the full documents in the search results.")
         
-        return response
+        return "".join(parts)
     
     def _convert_document_to_dict(self, document: Document) -> Dict[str, Any]:
         """
@@ -216,4 +262,27 @@ class QueryService:
             query=query,
             documents=documents,
             response=response
+        )
+    
+    def render_report(
+        self,
+        query: str,
+        documents: List[Document],
+        response: str
+    ) -> str:
+        """
+        Render an HTML report of the search results in memory.
+        
+        Args:
+            query: The original query
+            documents: List of retrieved documents
+            response: Generated response
+            
+        Returns:
+            HTML report content
+        """
+        return self.document_service.render_report(
+            query=query,
+            documents=documents,
+            response=response
         )
\ No newline at end of file
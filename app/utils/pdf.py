@@ -1,12 +1,37 @@
+import contextlib
+import hashlib
+import importlib
+import io
 import os
+import mmap
 import tempfile
-from typing import Dict, Any, Optional, Tuple
+import threading
+from typing import BinaryIO, Dict, Any, Optional, Tuple, Union
 import requests
+from urllib3.util.retry import Retry
+from requests.adapters import HTTPAdapter
+from app.core.cache import TTLCache
 from app.core.logging import get_logger
 from app.core.exceptions import DependencyNotFoundError
 
 logger = get_logger(__name__)
 
+# PDF libraries in order of preference (PyMuPDF is much faster at text extraction)
+PDF_BACKENDS = ("pymupdf", "pypdf", "PyPDF2")
+
+# Pooled connections per host, enough for the scraper's concurrent PDF downloads
+PDF_POOL_MAXSIZE = 10
+
+# PDFs are streamed in chunks of this size
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Downloaded PDFs larger than this are spooled to a temporary file instead of memory
+PDF_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Number of parsed PDFs kept, and how long (in seconds) each is reused
+PDF_CACHE_SIZE = 128
+PDF_CACHE_TTL = 24 * 3600
+
 
 class PDFExtractor:
     """Utility class for extracting content from PDF files."""
@@ -15,13 +40,72 @@ class PDFExtractor:
         """Initialize the PDF extractor."""
         self.is_available = False
         
-        try:
-            # Try importing PyPDF2
-            import PyPDF2
+        # Shared session (created on first use) so TLS connections are reused between downloads
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        
+        # Parsed PDFs keyed by a digest of their bytes, so identical files are parsed once
+        self._extract_cache = TTLCache(ttl=PDF_CACHE_TTL, maxsize=PDF_CACHE_SIZE)
+        
+        # Use the fastest installed PDF library (pypdf and PyPDF2 share the same API)
+        self.backend: Optional[str] = None
+        self._pdf_module: Any = None
+        for backend in PDF_BACKENDS:
+            try:
+                self._pdf_module = importlib.import_module(backend)
+            except ImportError:
+                continue
+            self.backend = backend
             self.is_available = True
-            logger.info("PyPDF2 initialized successfully")
-        except ImportError:
-            logger.warning("PyPDF2 is not available. PDF extraction will be disabled.")
+            logger.info(f"{backend} initialized successfully")
+            break
+        else:
+            logger.warning("No PDF library is available. PDF extraction will be disabled.")
+    
+    def create_session(self, retries: int = 3, backoff_factor: float = 0.3) -> requests.Session:
+        """
+        Create a pooled requests session with retry capabilities.
+        
+        Args:
+            retries: Number of retries
+            backoff_factor: Backoff factor for retries
+            
+        Returns:
+            Configured requests session
+        """
+        session = requests.Session()
+        
+        retry_strategy = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"]
+        )
+        adapter = HTTPAdapter(
+            pool_connections=PDF_POOL_MAXSIZE,
+            pool_maxsize=PDF_POOL_MAXSIZE,
+            max_retries=retry_strategy
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        
+        return session
+    
+    @property
+    def session(self) -> requests.Session:
+        """Get the shared download session, creating it on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self.create_session()
+        return self._session
+    
+    def close(self) -> None:
+        """Close the shared session and its pooled connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
     
     def download_and_extract(
         self, 
@@ -41,7 +125,7 @@ class PDFExtractor:
             Tuple of (content, metadata) or (None, None) if extraction fails
         """
         if not self.is_available:
-            logger.warning("PyPDF2 is not available. Cannot extract PDF content.")
+            logger.warning("No PDF library is available. Cannot extract PDF content.")
             return None, None
             
         # Default headers
@@ -50,76 +134,64 @@ class PDFExtractor:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
                              'Chrome/91.0.4472.124 Safari/537.36'
             }
-            
-        try:
-            logger.info(f"Downloading PDF from {pdf_url}")
-            
-            # Download the PDF
-            response = requests.get(pdf_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_pdf:
-                temp_pdf.write(response.content)
-                temp_pdf_path = temp_pdf.name
-                
+        
+        # The download file is picked once the size is known, and closed on the way out
+        with contextlib.ExitStack() as stack:
             try:
-                # Import here to ensure available
-                import PyPDF2
+                logger.info(f"Downloading PDF from {pdf_url}")
                 
-                # Extract text from the PDF
+                # Stream the PDF body over the shared session, hashing it on the way
+                hasher = hashlib.blake2b(digest_size=16)
+                with self.session.get(pdf_url, headers=headers, timeout=30, stream=True) as response:
+                    response.raise_for_status()
+                    content_length = response.headers.get('Content-Length', '')
+                    pdf_stream = stack.enter_context(
+                        self._new_download_file(int(content_length) if content_length.isdigit() else None)
+                    )
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        hasher.update(chunk)
+                        pdf_stream.write(chunk)
+                pdf_stream.seek(0)
+            except Exception as e:
+                logger.error(f"Error downloading PDF: {str(e)}", exc_info=True)
+                return None, None
+            
+            try:
                 logger.info("Extracting text from PDF")
-                
-                try:
-                    pdf_reader = PyPDF2.PdfReader(temp_pdf_path)
-                    
-                    # Extract metadata
-                    metadata = {
-                        "source": pdf_url,
-                        "title": title or os.path.basename(pdf_url),
-                        "pages": len(pdf_reader.pages),
-                        "type": "pdf"
-                    }
-                    
-                    # Extract PDF info dictionary if available
-                    if hasattr(pdf_reader, 'metadata') and pdf_reader.metadata:
-                        for key, value in pdf_reader.metadata.items():
-                            if key.startswith('/'):
-                                clean_key = key[1:].lower()
-                                if isinstance(value, str):
-                                    metadata[clean_key] = value
-                    
-                    # Extract text content
-                    content = ""
-                    for i, page in enumerate(pdf_reader.pages):
-                        page_text = page.extract_text()
-                        if page_text:
-                            content += f"\n--- Page {i+1} ---\n"
-                            content += page_text
-                    
-                    logger.info(f"Successfully extracted {len(pdf_reader.pages)} pages from PDF")
-                    
-                    # Return the extracted content and metadata
-                    return content, metadata
-                    
-                except Exception as e:
-                    logger.error(f"Error extracting text from PDF: {str(e)}", exc_info=True)
-                    return None, None
-                    
-            finally:
-                # Clean up the temporary file
-                try:
-                    os.unlink(temp_pdf_path)
-                except Exception as e:
-                    logger.warning(f"Could not delete temporary PDF file: {str(e)}")
-                    
-        except Exception as e:
-            logger.error(f"Error downloading or processing PDF: {str(e)}", exc_info=True)
-            return None, None
+                return self._extract(
+                    pdf_stream,
+                    source=pdf_url,
+                    title=title or os.path.basename(pdf_url),
+                    digest=hasher.hexdigest()
+                )
+            except Exception as e:
+                logger.error(f"Error extracting text from PDF: {str(e)}", exc_info=True)
+                return None, None
+    
+    @staticmethod
+    def _new_download_file(size: Optional[int]) -> BinaryIO:
+        """
+        Create the file a downloaded PDF is streamed into.
+        
+        PDFs known to be small stay in memory, known large ones go to a named
+        temporary file that PyMuPDF can open by path, and PDFs of unknown size
+        are spooled to memory first and spill over to disk when they grow.
+        
+        Args:
+            size: Size of the PDF from the Content-Length header (None if unknown)
+            
+        Returns:
+            Writable, seekable binary file
+        """
+        if size is None:
+            return tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
+        if size <= PDF_SPOOL_MAX_SIZE:
+            return io.BytesIO()
+        return tempfile.NamedTemporaryFile(suffix=".pdf")
     
     def extract_from_binary(
         self, 
-        pdf_binary: bytes,
+        pdf_binary: Union[bytes, mmap.mmap],
         source: str = "uploaded_file",
         title: str = "Uploaded PDF Document"
     ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
@@ -127,7 +199,7 @@ class PDFExtractor:
         Extract text from a PDF binary content.
         
         Args:
-            pdf_binary: Binary content of the PDF
+            pdf_binary: Binary content of the PDF (bytes or a memory-mapped file)
             source: Source identifier
             title: Title of the document
             
@@ -135,65 +207,138 @@ class PDFExtractor:
             Tuple of (content, metadata) or (None, None) if extraction fails
         """
         if not self.is_available:
-            logger.warning("PyPDF2 is not available. Cannot extract PDF content.")
+            logger.warning("No PDF library is available. Cannot extract PDF content.")
             return None, None
-            
+        
+        # A memory-mapped file is already a seekable stream, bytes are wrapped without copying to disk
+        pdf_stream = pdf_binary if isinstance(pdf_binary, mmap.mmap) else io.BytesIO(pdf_binary)
+        
         try:
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_pdf:
-                temp_pdf.write(pdf_binary)
-                temp_pdf_path = temp_pdf.name
-                
-            try:
-                # Import here to ensure available
-                import PyPDF2
-                
-                # Extract text from the PDF
-                logger.info("Extracting text from PDF binary")
-                
-                try:
-                    pdf_reader = PyPDF2.PdfReader(temp_pdf_path)
-                    
-                    # Extract metadata
-                    metadata = {
-                        "source": source,
-                        "title": title,
-                        "pages": len(pdf_reader.pages),
-                        "type": "pdf"
-                    }
-                    
-                    # Extract PDF info dictionary if available
-                    if hasattr(pdf_reader, 'metadata') and pdf_reader.metadata:
-                        for key, value in pdf_reader.metadata.items():
-                            if key.startswith('/'):
-                                clean_key = key[1:].lower()
-                                if isinstance(value, str):
-                                    metadata[clean_key] = value
-                    
-                    # Extract text content
-                    content = ""
-                    for i, page in enumerate(pdf_reader.pages):
-                        page_text = page.extract_text()
-                        if page_text:
-                            content += f"\n--- Page {i+1} ---\n"
-                            content += page_text
-                    
-                    logger.info(f"Successfully extracted {len(pdf_reader.pages)} pages from PDF binary")
-                    
-                    # Return the extracted content and metadata
-                    return content, metadata
-                    
-                except Exception as e:
-                    logger.error(f"Error extracting text from PDF binary: {str(e)}", exc_info=True)
-                    return None, None
-                    
-            finally:
-                # Clean up the temporary file
-                try:
-                    os.unlink(temp_pdf_path)
-                except Exception as e:
-                    logger.warning(f"Could not delete temporary PDF file: {str(e)}")
-                    
+            logger.info("Extracting text from PDF binary")
+            digest = hashlib.blake2b(pdf_binary, digest_size=16).hexdigest()
+            return self._extract(pdf_stream, source=source, title=title, digest=digest)
         except Exception as e:
-            logger.error(f"Error processing PDF binary: {str(e)}", exc_info=True)
-            return None, None
\ No newline at end of file
+            logger.error(f"Error extracting text from PDF binary: {str(e)}", exc_info=True)
+            return None, None
+    
+    def _extract(
+        self,
+        pdf_stream: Union[BinaryIO, mmap.mmap],
+        source: str,
+        title: str,
+        digest: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extract text and metadata from a PDF, reusing earlier results for identical bytes.
+        
+        Args:
+            pdf_stream: Seekable binary stream of the PDF
+            source: Source identifier
+            title: Title of the document
+            digest: Content digest of the PDF bytes
+            
+        Returns:
+            Tuple of (content, metadata)
+        """
+        parsed = self._extract_cache.get((digest,))
+        if parsed is None:
+            parsed = self._parse(pdf_stream)
+            self._extract_cache.set((digest,), parsed)
+            logger.info(f"Successfully extracted {parsed[1]} pages from {source}")
+        else:
+            logger.info(f"Reusing extracted text for identical PDF from {source}")
+        
+        content, page_count, info = parsed
+        metadata = {
+            "source": source,
+            "title": title,
+            "pages": page_count,
+            "type": "pdf",
+            **info
+        }
+        return content, metadata
+    
+    def _parse(self, pdf_stream: Union[BinaryIO, mmap.mmap]) -> Tuple[str, int, Dict[str, str]]:
+        """
+        Parse a PDF into its text, page count and info dictionary.
+        
+        Args:
+            pdf_stream: Seekable binary stream of the PDF
+            
+        Returns:
+            Tuple of (content, page count, info fields)
+        """
+        if self.backend == "pymupdf":
+            return self._parse_pymupdf(pdf_stream)
+        
+        pdf_reader = self._pdf_module.PdfReader(pdf_stream, strict=False)
+        
+        # Extract PDF info dictionary if available
+        info = {}
+        if hasattr(pdf_reader, 'metadata') and pdf_reader.metadata:
+            for key, value in pdf_reader.metadata.items():
+                if key.startswith('/'):
+                    clean_key = key[1:].lower()
+                    if isinstance(value, str):
+                        info[clean_key] = value
+        
+        # Extract text content
+        parts = []
+        for i, page in enumerate(pdf_reader.pages):
+            page_text = page.extract_text()
+            if page_text:
+                parts.append(f"\n--- Page {i+1} ---\n{page_text}")
+        
+        return "".join(parts), len(pdf_reader.pages), info
+    
+    def _parse_pymupdf(self, pdf_stream: Union[BinaryIO, mmap.mmap]) -> Tuple[str, int, Dict[str, str]]:
+        """
+        Parse a PDF with PyMuPDF.
+        
+        Args:
+            pdf_stream: Seekable binary stream of the PDF
+            
+        Returns:
+            Tuple of (content, page count, info fields)
+        """
+        with self._pdf_module.open(filetype="pdf", **self._pymupdf_source(pdf_stream)) as doc:
+            # Info fields use the same lowercase names as the pypdf path
+            info = {
+                key.lower(): value
+                for key, value in (doc.metadata or {}).items()
+                if isinstance(value, str) and value
+            }
+            
+            # Extract text content
+            parts = []
+            for i, page in enumerate(doc):
+                page_text = page.get_text("text")
+                if page_text:
+                    parts.append(f"\n--- Page {i+1} ---\n{page_text}")
+            
+            return "".join(parts), doc.page_count, info
+    
+    @staticmethod
+    def _pymupdf_source(pdf_stream: Union[BinaryIO, mmap.mmap]) -> Dict[str, Any]:
+        """
+        Get the PyMuPDF open() arguments for a PDF stream, avoiding a copy where possible.
+        
+        PyMuPDF opens files by path and shares the buffer of a BytesIO, but needs
+        bytes for anything else (memory-mapped uploads and spooled files that
+        spilled over to an anonymous temporary file), so those are read once.
+        
+        Args:
+            pdf_stream: Seekable binary stream of the PDF
+            
+        Returns:
+            Keyword arguments for pymupdf.open()
+        """
+        name = getattr(pdf_stream, "name", None)
+        if isinstance(name, str) and os.path.isfile(name):
+            pdf_stream.flush()
+            return {"filename": name}
+        if type(pdf_stream) is io.BytesIO:
+            return {"stream": pdf_stream}
+        
+        pdf_stream.seek(0)
+        return {"stream": pdf_stream.read()}
\ No newline at end of file
@@ -1,9 +1,52 @@
 import re
-from typing import Dict, List, Any, Optional
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Any, Mapping, Optional
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Number of stemmed texts kept per processor (mostly single query words)
+STEM_CACHE_SIZE = 50_000
+
+# Patterns for stripping punctuation and HTML tags (with the whitespace around them)
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_TAG_OR_WHITESPACE_RE = re.compile(r'(?:<[^>]+>|\s)+')
+
+# ASCII characters matched by _NON_WORD_RE, mapped to spaces for str.translate
+_ASCII_NON_WORD_TABLE = {
+    code: ' ' for code in range(128)
+    if not (chr(code).isalnum() or chr(code).isspace() or chr(code) == '_')
+}
+
+# Related legal terms for each query word (can be expanded); frozensets so a match
+# is merged with a single set union
+LEGAL_TERMS: Mapping[str, FrozenSet[str]] = MappingProxyType({
+    term: frozenset(related) for term, related in {
+        "hak": ("hak", "hak asasi"),
+        "ulayat": ("ulayat", "hak ulayat", "tanah ulayat", "tanah adat"),
+        "tanah": ("tanah", "pertanahan", "agraria"),
+        "adat": ("adat", "hukum adat", "masyarakat adat"),
+        "hukum": ("hukum", "peraturan", "undang-undang"),
+        "undang": ("undang-undang", "peraturan"),
+        "peraturan": ("peraturan", "regulasi"),
+        "pemerintah": ("pemerintah", "pemerintahan"),
+        "keputusan": ("keputusan", "ketetapan"),
+        "menteri": ("menteri", "kementerian"),
+        "presiden": ("presiden", "kepresidenan"),
+        "agraria": ("agraria", "pertanahan"),
+        "pertanahan": ("pertanahan", "tanah"),
+        "masyarakat": ("masyarakat", "komunitas"),
+        "hutan": ("hutan", "kehutanan"),
+        "wilayah": ("wilayah", "area", "kawasan"),
+        "daerah": ("daerah", "area", "wilayah"),
+        "provinsi": ("provinsi", "daerah"),
+        "kabupaten": ("kabupaten", "daerah"),
+        "kota": ("kota", "perkotaan")
+    }.items()
+})
+
 
 class IndonesianTextProcessor:
     """Utility class for processing Indonesian text."""
@@ -13,6 +56,9 @@ class IndonesianTextProcessor:
         self.stemmer = None
         self.has_stemmer = False
         
+        # Stems of recently seen texts (query words repeat across searches)
+        self._stem_cached = lru_cache(maxsize=STEM_CACHE_SIZE)(self._stem)
+        
         # Initialize Sastrawi stemmer if available
         try:
             from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
@@ -25,29 +71,8 @@ class IndonesianTextProcessor:
         except Exception as e:
             logger.error(f"Error initializing Sastrawi stemmer: {str(e)}")
         
-        # Legal terms dictionary (can be expanded)
-        self.legal_terms = {
-            "hak": ["hak", "hak asasi"],
-            "ulayat": ["ulayat", "hak ulayat", "tanah ulayat", "tanah adat"],
-            "tanah": ["tanah", "pertanahan", "agraria"],
-            "adat": ["adat", "hukum adat", "masyarakat adat"],
-            "hukum": ["hukum", "peraturan", "undang-undang"],
-            "undang": ["undang-undang", "peraturan"],
-            "peraturan": ["peraturan", "regulasi"],
-            "pemerintah": ["pemerintah", "pemerintahan"],
-            "keputusan": ["keputusan", "ketetapan"],
-            "menteri": ["menteri", "kementerian"],
-            "presiden": ["presiden", "kepresidenan"],
-            "agraria": ["agraria", "pertanahan"],
-            "pertanahan": ["pertanahan", "tanah"],
-            "masyarakat": ["masyarakat", "komunitas"],
-            "hutan": ["hutan", "kehutanan"],
-            "wilayah": ["wilayah", "area", "kawasan"],
-            "daerah": ["daerah", "area", "wilayah"],
-            "provinsi": ["provinsi", "daerah"],
-            "kabupaten": ["kabupaten", "daerah"],
-            "kota": ["kota", "perkotaan"]
-        }
+        # Related legal terms for each query word (shared, read-only)
+        self.legal_terms = LEGAL_TERMS
     
     def stem_text(self, text: str) -> str:
         """
@@ -63,11 +88,23 @@ class IndonesianTextProcessor:
             return text
             
         try:
-            return self.stemmer.stem(text)
+            return self._stem_cached(text)
         except Exception as e:
             logger.error(f"Error stemming text: {str(e)}")
             return text
     
+    def _stem(self, text: str) -> str:
+        """
+        Stem text with the Sastrawi stemmer (uncached).
+        
+        Args:
+            text: The text to stem
+            
+        Returns:
+            Stemmed text
+        """
+        return self.stemmer.stem(text)
+    
     def enhance_query_with_legal_terms(self, query: str) -> str:
         """
         Enhance query with related legal terms.
@@ -79,24 +116,24 @@ class IndonesianTextProcessor:
             Enhanced query with additional legal terms
         """
         try:
+            # Nothing to enhance in a blank query (skip the stemmer entirely)
+            query_lower = query.lower()
+            if not query_lower.strip():
+                return query
+            
             # Process the query (stem if available)
-            processed_query = self.stem_text(query.lower()) if self.has_stemmer else query.lower()
+            processed_query = self.stem_text(query_lower) if self.has_stemmer else query_lower
             
             # Find matching legal terms
             additional_terms = set()
             for term in processed_query.split():
-                if term in self.legal_terms:
-                    # Add related terms
-                    for related_term in self.legal_terms[term]:
-                        additional_terms.add(related_term)
-            
-            # Add relevant legal terms to the query
-            enhanced_query = query
-            for term in additional_terms:
-                if term.lower() not in query.lower():
-                    enhanced_query += f" {term}"
+                related_terms = self.legal_terms.get(term)
+                if related_terms:
+                    additional_terms |= related_terms
             
-            return enhanced_query
+            # Add relevant legal terms that the query does not already contain
+            extras = [term for term in additional_terms if term.lower() not in query_lower]
+            return f"{query} {' '.join(extras)}" if extras else query
         except Exception as e:
             logger.error(f"Error enhancing query: {str(e)}")
             return query
@@ -112,26 +149,15 @@ class IndonesianTextProcessor:
         Returns:
             List of extracted keywords
         """
-        # Remove special characters and extra whitespace
-        cleaned_text = re.sub(r'[^\w\s]', ' ', text)
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip().lower()
+        # Remove special characters (a table lookup for ASCII text) and split into words
+        cleaned_text = text.translate(_ASCII_NON_WORD_TABLE) if text.isascii() else _NON_WORD_RE.sub(' ', text)
+        words = cleaned_text.lower().split()
         
-        # Split into words
-        words = cleaned_text.split()
+        # Count word frequency (only words longer than 3 characters)
+        word_counts = Counter(word for word in words if len(word) > 3)
         
-        # Count word frequency
-        word_counts = {}
-        for word in words:
-            if len(word) > 3:  # Only consider words longer than 3 characters
-                word_counts[word] = word_counts.get(word, 0) + 1
-        
-        # Sort by frequency
-        sorted_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        # Get top keywords
-        keywords = [word for word, count in sorted_words[:max_keywords]]
-        
-        return keywords
+        # Get the most frequent words as keywords
+        return [word for word, _ in word_counts.most_common(max_keywords)]
     
     def clean_html(self, html_text: str) -> str:
         """
@@ -143,11 +169,8 @@ class IndonesianTextProcessor:
         Returns:
             Cleaned text
         """
-        # Remove HTML tags
-        clean_text = re.sub(r'<[^>]+>', ' ', html_text)
-        # Remove extra whitespace
-        clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-        return clean_text
+        # Replace HTML tags and the whitespace around them with a single space in one pass
+        return _TAG_OR_WHITESPACE_RE.sub(' ', html_text).strip()
     
     def normalize_whitespace(self, text: str) -> str:
         """
@@ -159,7 +182,8 @@ class IndonesianTextProcessor:
         Returns:
             Text with normalized whitespace
         """
-        return re.sub(r'\s+', ' ', text).strip()
+        # str.split() without arguments drops leading/trailing whitespace and collapses runs
+        return ' '.join(text.split())
     
     def truncate_text(self, text: str, max_length: int = 1000, add_ellipsis: bool = True) -> str:
         """
@@ -176,14 +200,8 @@ class IndonesianTextProcessor:
         if len(text) <= max_length:
             return text
             
-        # Truncate at the last space before max_length
-        truncated = text[:max_length]
-        last_space = truncated.rfind(' ')
+        # Truncate at the last space before max_length (searched in place, without an extra slice)
+        last_space = text.rfind(' ', 0, max_length)
+        truncated = text[:last_space if last_space > 0 else max_length]
         
-        if last_space > 0:
-            truncated = truncated[:last_space]
-            
-        if add_ellipsis:
-            truncated += "..."
-            
-        return truncated
\ No newline at end of file
+        return truncated + "..." if add_ellipsis else truncated
\ No newline at end of file
@@ -1,17 +1,41 @@
 import requests
 import json
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:  # Fall back to requests' in-memory multipart encoding
+    MultipartEncoder = None
 
 # API base URL
 API_BASE_URL = "http://localhost:8000/api/v1"
 
+# Reports are written to disk in chunks of this size
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Number of example requests sent concurrently
+EXAMPLE_WORKERS = 4
+
+# requests.Session is not thread-safe, so each worker thread keeps its own
+_thread_local = threading.local()
+_thread_sessions: List[requests.Session] = []
+_thread_sessions_lock = threading.Lock()
+
 def search_documents(
     query: str,
     verbosity: str = "detailed",
     format_style: str = "simple",
     citations: bool = True,
-    max_results: int = 5
+    max_results: int = 5,
+    session: Optional[requests.Session] = None
 ) -> Dict[str, Any]:
     """
     Search for legal documents using the API.
@@ -22,6 +46,7 @@ def search_documents(
         format_style: Response format (simple, legal, technical)
         citations: Whether to include citations
         max_results: Maximum number of results to return
+        session: Session to reuse connections across calls (None for a one-off request)
         
     Returns:
         API response as a dictionary
@@ -38,7 +63,7 @@ def search_documents(
     }
     
     # Send the request
-    response = requests.post(
+    response = (session or requests).post(
         f"{API_BASE_URL}/search/query",
         json=payload
     )
@@ -47,13 +72,14 @@ def search_documents(
     response.raise_for_status()
     
     # Parse the response
-    data = response.json()
+    data = _parse_json(response)
     
     return data
 
 def simple_search(
     query: str,
-    max_results: int = 5
+    max_results: int = 5,
+    session: Optional[requests.Session] = None
 ) -> Dict[str, Any]:
     """
     Simple search using query parameters.
@@ -61,6 +87,7 @@ def simple_search(
     Args:
         query: The search query
         max_results: Maximum number of results to return
+        session: Session to reuse connections across calls (None for a one-off request)
         
     Returns:
         API response as a dictionary
@@ -75,7 +102,7 @@ def simple_search(
     }
     
     # Send the request
-    response = requests.get(
+    response = (session or requests).get(
         f"{API_BASE_URL}/search/simple",
         params=params
     )
@@ -84,7 +111,7 @@ def simple_search(
     response.raise_for_status()
     
     # Parse the response
-    data = response.json()
+    data = _parse_json(response)
     
     return data
 
@@ -94,7 +121,8 @@ def generate_report(
     format_style: str = "simple",
     citations: bool = True,
     max_results: int = 5,
-    output_file: Optional[str] = None
+    output_file: Optional[str] = None,
+    session: Optional[requests.Session] = None
 ) -> None:
     """
     Generate an HTML report of search results.
@@ -106,6 +134,7 @@ def generate_report(
         citations: Whether to include citations
         max_results: Maximum number of results to return
         output_file: Output file path (or None to use auto-generated name)
+        session: Session to reuse connections across calls (None for a one-off request)
     """
     # Create the request payload
     payload = {
@@ -118,34 +147,40 @@ def generate_report(
         }
     }
     
-    # Send the request
-    response = requests.post(
+    # Send the request, streaming the report body instead of buffering it
+    with (session or requests).post(
         f"{API_BASE_URL}/search/report",
-        json=payload
-    )
-    
-    # Check for errors
-    response.raise_for_status()
-    
-    # Save the response content to a file
-    if output_file is None:
-        # Generate a filename based on the query
-        safe_query = query.replace(' ', '_')
-        timestamp = int(time.time())
-        output_file = f"legal_report_{safe_query}_{timestamp}.html"
-    
-    with open(output_file, "wb") as f:
-        f.write(response.content)
+        json=payload,
+        stream=True
+    ) as response:
+        # Check for errors
+        response.raise_for_status()
+        
+        # Save the response content to a file
+        if output_file is None:
+            # Generate a filename based on the query
+            safe_query = query.replace(' ', '_')
+            timestamp = int(time.time())
+            output_file = f"legal_report_{safe_query}_{timestamp}.html"
+        
+        with open(output_file, "wb") as f:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
     
     print(f"Report saved to {output_file}")
 
-def extract_pdf_content(pdf_url: str, title: str = "PDF Document") -> Dict[str, Any]:
+def extract_pdf_content(
+    pdf_url: str,
+    title: str = "PDF Document",
+    session: Optional[requests.Session] = None
+) -> Dict[str, Any]:
     """
     Extract content from a PDF file.
     
     Args:
         pdf_url: URL of the PDF file
         title: Title of the document
+        session: Session to reuse connections across calls (None for a one-off request)
         
     Returns:
         API response as a dictionary
@@ -157,7 +192,7 @@ def extract_pdf_content(pdf_url: str, title: str = "PDF Document") -> Dict[str,
     }
     
     # Send the request
-    response = requests.post(
+    response = (session or requests).post(
         f"{API_BASE_URL}/documents/extract-pdf",
         json=payload
     )
@@ -166,41 +201,73 @@ def extract_pdf_content(pdf_url: str, title: str = "PDF Document") -> Dict[str,
     response.raise_for_status()
     
     # Parse the response
-    data = response.json()
+    data = _parse_json(response)
     
     return data
 
-def upload_pdf(pdf_file_path: str, title: str = "Uploaded PDF Document") -> Dict[str, Any]:
+def upload_pdf(
+    pdf_file_path: str,
+    title: str = "Uploaded PDF Document",
+    session: Optional[requests.Session] = None
+) -> Dict[str, Any]:
     """
     Upload and extract content from a PDF file.
     
     Args:
         pdf_file_path: Path to the PDF file
         title: Title of the document
+        session: Session to reuse connections across calls (None for a one-off request)
         
     Returns:
         API response as a dictionary
     """
     # Open the PDF file
     with open(pdf_file_path, "rb") as f:
-        files = {"file": (pdf_file_path, f, "application/pdf")}
-        data = {"title": title}
-        
-        # Send the request
-        response = requests.post(
-            f"{API_BASE_URL}/documents/upload-pdf",
-            files=files,
-            data=data
-        )
+        if MultipartEncoder is not None:
+            # Stream the multipart body from the file instead of building it in memory
+            encoder = MultipartEncoder(fields={
+                "title": title,
+                "file": (pdf_file_path, f, "application/pdf")
+            })
+            response = (session or requests).post(
+                f"{API_BASE_URL}/documents/upload-pdf",
+                data=encoder,
+                headers={"Content-Type": encoder.content_type}
+            )
+        else:
+            files = {"file": (pdf_file_path, f, "application/pdf")}
+            data = {"title": title}
+            
+            # Send the request
+            response = (session or requests).post(
+                f"{API_BASE_URL}/documents/upload-pdf",
+                files=files,
+                data=data
+            )
     
     # Check for errors
     response.raise_for_status()
     
     # Parse the response
-    data = response.json()
+    data = _parse_json(response)
     
     return data
 
+def _parse_json(response: requests.Response) -> Dict[str, Any]:
+    """
+    Parse a JSON response body.
+    
+    Args:
+        response: HTTP response from the API
+        
+    Returns:
+        Parsed response as a dictionary
+    """
+    if orjson is not None:
+        # orjson parses the raw bytes directly
+        return orjson.loads(response.content)
+    return response.json()
+
 def pretty_print_response(data: Dict[str, Any]) -> None:
     """
     Pretty print API response.
@@ -208,65 +275,118 @@ def pretty_print_response(data: Dict[str, Any]) -> None:
     Args:
         data: API response dictionary
     """
-    print(json.dumps(data, indent=2, ensure_ascii=False))
+    if orjson is not None:
+        print(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8"))
+    else:
+        print(json.dumps(data, indent=2, ensure_ascii=False))
 
-def main():
-    """Example usage of the BPK Legal Document API."""
-    # Example 1: Search for documents
-    print("Example 1: Search for documents")
-    print("-" * 50)
-    result = search_documents(
-        query="hak tanah ulayat",
-        verbosity="detailed",
-        format_style="simple",
-        citations=True,
-        max_results=3
-    )
-    print(f"Found {len(result['documents'])} documents")
-    print(f"Response: {result['response'][:200]}...")
-    print()
-    
-    # Example 2: Simple search
-    print("Example 2: Simple search")
-    print("-" * 50)
-    result = simple_search(
-        query="peraturan daerah",
-        max_results=2
-    )
-    print(f"Found {len(result['documents'])} documents")
-    print(f"Response: {result['response'][:200]}...")
-    print()
-    
-    # Example 3: Generate a report
-    print("Example 3: Generate a report")
-    print("-" * 50)
-    generate_report(
-        query="undang-undang agraria",
-        verbosity="comprehensive",
-        format_style="legal",
-        citations=True,
-        max_results=5
-    )
-    print()
+def _thread_session() -> requests.Session:
+    """
+    Get the calling thread's session, creating it on first use.
     
-    # Example 4: Extract PDF content (if you have a PDF URL)
-    # pdf_url = "https://example.com/document.pdf"
-    # result = extract_pdf_content(pdf_url)
-    # print("Example 4: Extract PDF content")
-    # print("-" * 50)
-    # print(f"Title: {result['metadata']['title']}")
-    # print(f"Pages: {result['metadata']['pages']}")
-    # print(f"Content preview: {result['content'][:200]}...")
-    # print()
+    Returns:
+        Session reused by every call made from this thread
+    """
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = _thread_local.session = requests.Session()
+        with _thread_sessions_lock:
+            _thread_sessions.append(session)
+    return session
+
+def _call_with_thread_session(func: Callable[..., Any], **kwargs: Any) -> Any:
+    """
+    Call an example function with the current worker thread's session.
     
-    # Example 5: Upload PDF (if you have a local PDF file)
-    # pdf_file_path = "path/to/your/document.pdf"
-    # result = upload_pdf(pdf_file_path)
-    # print("Example 5: Upload PDF")
-    # print("-" * 50)
-    # print(f"Title: {result['metadata']['title']}")
-    # print(f"Pages: {result['metadata']['pages']}")
-    # print(f"Content preview: {result['content'][:200]}...")
+    Args:
+        func: Client function accepting a ``session`` keyword
+        **kwargs: Arguments forwarded to ``func``
+        
+    Returns:
+        Whatever ``func`` returns
+    """
+    return func(session=_thread_session(), **kwargs)
+
+def _close_thread_sessions() -> None:
+    """Close every session created by the worker threads."""
+    with _thread_sessions_lock:
+        while _thread_sessions:
+            _thread_sessions.pop().close()
+
+def main():
+    """Example usage of the BPK Legal Document API."""
+    # Run the independent examples concurrently; each worker thread reuses
+    # its own session's keep-alive connections
+    try:
+        with ThreadPoolExecutor(max_workers=EXAMPLE_WORKERS) as executor:
+            search_future = executor.submit(
+                _call_with_thread_session,
+                search_documents,
+                query="hak tanah ulayat",
+                verbosity="detailed",
+                format_style="simple",
+                citations=True,
+                max_results=3
+            )
+            simple_future = executor.submit(
+                _call_with_thread_session,
+                simple_search,
+                query="peraturan daerah",
+                max_results=2
+            )
+            report_future = executor.submit(
+                _call_with_thread_session,
+                generate_report,
+                query="undang-undang agraria",
+                verbosity="comprehensive",
+                format_style="legal",
+                citations=True,
+                max_results=5
+            )
+            
+            # Example 1: Search for documents
+            print("Example 1: Search for documents")
+            print("-" * 50)
+            result = search_future.result()
+            print(f"Found {len(result['documents'])} documents")
+            print(f"Response: {result['response'][:200]}...")
+            print()
+            
+            # Example 2: Simple search
+            print("Example 2: Simple search")
+            print("-" * 50)
+            result = simple_future.result()
+            print(f"Found {len(result['documents'])} documents")
+            print(f"Response: {result['response'][:200]}...")
+            print()
+            
+            # Example 3: Generate a report
+            print("Example 3: Generate a report")
+            print("-" * 50)
+            report_future.result()
+            print()
+            
+            # Example 4: Extract PDF content (if you have a PDF URL)
+            # pdf_url = "https://example.com/document.pdf"
+            # result = executor.submit(_call_with_thread_session, extract_pdf_content, pdf_url=pdf_url).result()
+            # print("Example 4: Extract PDF content")
+            # print("-" * 50)
+            # print(f"Title: {result['metadata']['title']}")
+            # print(f"Pages: {result['metadata']['pages']}")
+            # print(f"Content preview: {result['content'][:200]}...")
+            # print()
+            
+            # Example 5: Upload PDF (if you have a local PDF file)
+            # pdf_file_path = "path/to/your/document.pdf"
+            # result = executor.submit(_call_with_thread_session, upload_pdf, pdf_file_path=pdf_file_path).result()
+            # print("Example 5: Upload PDF")
+            # print("-" * 50)
+            # print(f"Title: {result['metadata']['title']}")
+            # print(f"Pages: {result['metadata']['pages']}")
+            # print(f"Content preview: {result['content'][:200]}...")
+    finally:
+        # The pool has shut down, so no thread is still using its session
+        _close_thread_sessions()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
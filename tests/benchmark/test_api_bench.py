@@ -0,0 +1,43 @@
+import pytest
+
+# Benchmarks need the pytest-benchmark plugin (see requirements-dev.txt)
+pytest.importorskip("pytest_benchmark")
+
+SEARCH_PAYLOAD = {
+    "query": "test query",
+    "preferences": {
+        "verbosity": "detailed",
+        "format": "simple",
+        "citations": True,
+        "max_results": 5
+    }
+}
+
+
+@pytest.mark.benchmark(group="search")
+@pytest.mark.usefixtures("override_services")
+def test_bench_search_query(benchmark, client):
+    """Benchmark the search query endpoint with mocked services."""
+    response = benchmark(client.post, "/api/v1/search/query", json=SEARCH_PAYLOAD)
+    
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group="documents")
+@pytest.mark.usefixtures("override_services")
+def test_bench_get_document(benchmark, client):
+    """Benchmark the get document endpoint with mocked services."""
+    response = benchmark(client.get, "/api/v1/documents/doc_123")
+    
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group="documents")
+@pytest.mark.usefixtures("override_services")
+def test_bench_extract_pdf_content(benchmark, client):
+    """Benchmark the extract PDF content endpoint with mocked services."""
+    payload = {"pdf_url": "https://example.com/test.pdf", "title": "Test PDF"}
+    
+    response = benchmark(client.post, "/api/v1/documents/extract-pdf", json=payload)
+    
+    assert response.status_code == 200
\ No newline at end of file
@@ -1,42 +1,104 @@
-import os
-import sys
 import json
-from typing import Dict, Any, List, Generator, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Generator, Optional
 import pytest
-from fastapi import FastAPI
-from fastapi.testclient import TestClient
 from unittest.mock import MagicMock, patch
 
-# Add the project root to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
-from app.main import app
-from app.config import get_settings, Settings
 from app.domain.models import Document, SearchResult, UserPreferences
 from app.core.exceptions import DocumentNotFoundError, ScraperError
-from app.infrastructure.ai.openai_client import OpenAIClient
-from app.infrastructure.ai.indobert import IndoBERTClient
-from app.infrastructure.scrapers.bpk_scraper import BPKScraper
-from app.services.document_service import DocumentService
-from app.services.query_service import QueryService
-from app.utils.pdf import PDFExtractor
 
+# The app and the classes used as mock specs are imported inside the fixtures that need them,
+# so running a subset of tests does not import the whole application up front
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+    import httpx
+    from fastapi.testclient import TestClient
+    from app.config import Settings
 
-@pytest.fixture
-def test_app() -> FastAPI:
+
+# Static sample data, built once (the preferences model is frozen, so it is safe to share)
+_SAMPLE_USER_PREFERENCES = UserPreferences(
+    verbosity="detailed",
+    format="simple",
+    citations=True,
+    max_results=5
+)
+
+_SAMPLE_HTML = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Test Legal Document</title>
+    </head>
+    <body>
+        <div class="card">
+            <h3 class="fw-bold text-gray-800 mb-5">
+                <a href="/Home/Detail/12345">Test Legal Document 1</a>
+            </h3>
+            <div class="text-gray-600">
+                <span>Regulation</span>
+                <span>2023-01-01</span>
+            </div>
+            <div class="card-text">
+                This is a test legal document content preview.
+            </div>
+        </div>
+        <div class="card">
+            <h3 class="fw-bold text-gray-800 mb-5">
+                <a href="/Home/Detail/67890">Test Legal Document 2</a>
+            </h3>
+            <div class="text-gray-600">
+                <span>Law</span>
+                <span>2023-01-02</span>
+            </div>
+            <div class="card-text">
+                This is another test legal document content preview.
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+
+def _mock_documents(with_ids: bool = False) -> List[Document]:
+    """Build the two documents returned by the mock scraper and document service."""
+    documents = []
+    for number, doc_id in ((1, "doc_123"), (2, "doc_456")):
+        metadata = {"id": doc_id} if with_ids else {}
+        metadata.update({
+            "title": f"Test Document {number}",
+            "source": f"https://example.com/doc{number}",
+            "type": "Legal Document",
+            "date": f"2023-01-0{number}"
+        })
+        documents.append(Document(content=f"Test content {number}", metadata=metadata))
+    return documents
+
+
+@pytest.fixture(scope="session")
+def test_app() -> "FastAPI":
     """Fixture for FastAPI application."""
+    from app.main import app
     return app
 
 
-@pytest.fixture
-def client() -> TestClient:
+@pytest.fixture(scope="session")
+def client(test_app: "FastAPI") -> "TestClient":
     """Fixture for FastAPI test client."""
-    return TestClient(app)
+    from fastapi.testclient import TestClient
+    return TestClient(test_app)
 
 
-@pytest.fixture
-def test_settings() -> Settings:
+@pytest.fixture(scope="session")
+def asgi_transport(test_app: "FastAPI") -> "httpx.ASGITransport":
+    """Fixture for an httpx transport that calls the app in-process (for concurrent async requests)."""
+    import httpx
+    return httpx.ASGITransport(app=test_app)
+
+
+@pytest.fixture(scope="session")
+def test_settings() -> "Settings":
     """Fixture for test settings."""
+    from app.config import Settings
     return Settings(
         API_V1_STR="/api/v1",
         PROJECT_NAME="Test BPK Legal Document API",
@@ -57,7 +119,7 @@ def test_settings() -> Settings:
 
 
 @pytest.fixture
-def mock_settings(test_settings: Settings) -> Generator:
+def mock_settings(test_settings: "Settings") -> Generator:
     """Mock settings fixture."""
     with patch("app.config.get_settings", return_value=test_settings):
         yield test_settings
@@ -66,6 +128,8 @@ def mock_settings(test_settings: Settings) -> Generator:
 @pytest.fixture
 def mock_openai_client() -> MagicMock:
     """Fixture for mock OpenAI client."""
+    from app.infrastructure.ai.openai_client import OpenAIClient
+    
     mock_client = MagicMock(spec=OpenAIClient)
     mock_client.is_available = True
     
@@ -84,6 +148,8 @@ def mock_openai_client() -> MagicMock:
 @pytest.fixture
 def mock_indobert_client() -> MagicMock:
     """Fixture for mock IndoBERT client."""
+    from app.infrastructure.ai.indobert import IndoBERTClient
+    
     mock_client = MagicMock(spec=IndoBERTClient)
     mock_client.is_available = True
     
@@ -93,6 +159,9 @@ def mock_indobert_client() -> MagicMock:
     # Mock calculate_similarity method
     mock_client.calculate_similarity.return_value = 0.75
     
+    # Mock rank_indices method (keeps the original order)
+    mock_client.rank_indices.side_effect = lambda query, texts: list(range(len(texts)))
+    
     # Mock rank_documents method
     mock_client.rank_documents.return_value = [
         {
@@ -111,6 +180,8 @@ def mock_indobert_client() -> MagicMock:
 @pytest.fixture
 def mock_pdf_extractor() -> MagicMock:
     """Fixture for mock PDF extractor."""
+    from app.utils.pdf import PDFExtractor
+    
     mock_extractor = MagicMock(spec=PDFExtractor)
     mock_extractor.is_available = True
     
@@ -142,29 +213,12 @@ def mock_pdf_extractor() -> MagicMock:
 @pytest.fixture
 def mock_bpk_scraper(mock_openai_client: MagicMock, mock_indobert_client: MagicMock) -> MagicMock:
     """Fixture for mock BPK scraper."""
+    from app.infrastructure.scrapers.bpk_scraper import BPKScraper
+    
     mock_scraper = MagicMock(spec=BPKScraper)
     
     # Mock search method
-    mock_docs = [
-        Document(
-            content="Test content 1",
-            metadata={
-                "title": "Test Document 1",
-                "source": "https://example.com/doc1",
-                "type": "Legal Document",
-                "date": "2023-01-01"
-            }
-        ),
-        Document(
-            content="Test content 2",
-            metadata={
-                "title": "Test Document 2",
-                "source": "https://example.com/doc2",
-                "type": "Legal Document",
-                "date": "2023-01-02"
-            }
-        )
-    ]
+    mock_docs = _mock_documents()
     mock_scraper.search.return_value = mock_docs
     
     # Mock preprocess_query method
@@ -173,6 +227,9 @@ def mock_bpk_scraper(mock_openai_client: MagicMock, mock_indobert_client: MagicM
     # Mock generate_html_report method
     mock_scraper.generate_html_report.return_value = "test_report.html"
     
+    # Mock render_html_report method
+    mock_scraper.render_html_report.return_value = "<html>test report</html>"
+    
     # Set mock clients
     mock_scraper.openai_client = mock_openai_client
     mock_scraper.indobert_client = mock_indobert_client
@@ -183,44 +240,25 @@ def mock_bpk_scraper(mock_openai_client: MagicMock, mock_indobert_client: MagicM
 @pytest.fixture
 def mock_document_service(mock_bpk_scraper: MagicMock, mock_pdf_extractor: MagicMock) -> MagicMock:
     """Fixture for mock document service."""
+    from app.services.document_service import DocumentService
+    
     mock_service = MagicMock(spec=DocumentService)
     
     # Set mock PDF extractor
     mock_service.pdf_extractor = mock_pdf_extractor
     
     # Mock search_documents method
-    mock_docs = [
-        Document(
-            content="Test content 1",
-            metadata={
-                "id": "doc_123",
-                "title": "Test Document 1",
-                "source": "https://example.com/doc1",
-                "type": "Legal Document",
-                "date": "2023-01-01"
-            }
-        ),
-        Document(
-            content="Test content 2",
-            metadata={
-                "id": "doc_456",
-                "title": "Test Document 2",
-                "source": "https://example.com/doc2",
-                "type": "Legal Document",
-                "date": "2023-01-02"
-            }
-        )
-    ]
+    mock_docs = _mock_documents(with_ids=True)
     mock_service.search_documents.return_value = mock_docs
     
     # Mock get_document_by_id method
+    docs_by_id = {doc.metadata["id"]: doc for doc in mock_docs}
+    
     def get_doc_by_id(doc_id: str) -> Document:
-        if doc_id == "doc_123":
-            return mock_docs[0]
-        elif doc_id == "doc_456":
-            return mock_docs[1]
-        else:
-            raise DocumentNotFoundError(doc_id)
+        try:
+            return docs_by_id[doc_id]
+        except KeyError:
+            raise DocumentNotFoundError(doc_id) from None
     
     mock_service.get_document_by_id.side_effect = get_doc_by_id
     
@@ -239,6 +277,9 @@ def mock_document_service(mock_bpk_scraper: MagicMock, mock_pdf_extractor: Magic
     # Mock generate_report method
     mock_service.generate_report.return_value = "test_report.html"
     
+    # Mock render_report method
+    mock_service.render_report.return_value = "<html>test report</html>"
+    
     # Set up documents dictionary
     mock_service.documents = {
         "doc_123": mock_docs[0],
@@ -261,6 +302,8 @@ def mock_document_service(mock_bpk_scraper: MagicMock, mock_pdf_extractor: Magic
 @pytest.fixture
 def mock_query_service(mock_document_service: MagicMock, mock_openai_client: MagicMock) -> MagicMock:
     """Fixture for mock query service."""
+    from app.services.query_service import QueryService
+    
     mock_service = MagicMock(spec=QueryService)
     
     # Set mock dependencies
@@ -295,9 +338,28 @@ def mock_query_service(mock_document_service: MagicMock, mock_openai_client: Mag
     # Mock generate_report method
     mock_service.generate_report.return_value = "test_report.html"
     
+    # Mock render_report method
+    mock_service.render_report.return_value = "<html>test report</html>"
+    
     return mock_service
 
 
+@pytest.fixture
+def override_services(
+    test_app: "FastAPI",
+    mock_query_service: MagicMock,
+    mock_document_service: MagicMock
+) -> Generator:
+    """Fixture that routes the API's service dependencies to the mock services."""
+    from app.api.dependencies import get_document_service, get_query_service
+    
+    test_app.dependency_overrides[get_query_service] = lambda: mock_query_service
+    test_app.dependency_overrides[get_document_service] = lambda: mock_document_service
+    yield
+    test_app.dependency_overrides.pop(get_query_service, None)
+    test_app.dependency_overrides.pop(get_document_service, None)
+
+
 @pytest.fixture
 def sample_document() -> Document:
     """Fixture for a sample document."""
@@ -335,51 +397,13 @@ def sample_search_result() -> SearchResult:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_user_preferences() -> UserPreferences:
     """Fixture for sample user preferences."""
-    return UserPreferences(
-        verbosity="detailed",
-        format="simple",
-        citations=True,
-        max_results=5
-    )
+    return _SAMPLE_USER_PREFERENCES
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_html_content() -> str:
     """Fixture for sample HTML content from a web page."""
-    return """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Test Legal Document</title>
-    </head>
-    <body>
-        <div class="card">
-            <h3 class="fw-bold text-gray-800 mb-5">
-                <a href="/Home/Detail/12345">Test Legal Document 1</a>
-            </h3>
-            <div class="text-gray-600">
-                <span>Regulation</span>
-                <span>2023-01-01</span>
-            </div>
-            <div class="card-text">
-                This is a test legal document content preview.
-            </div>
-        </div>
-        <div class="card">
-            <h3 class="fw-bold text-gray-800 mb-5">
-                <a href="/Home/Detail/67890">Test Legal Document 2</a>
-            </h3>
-            <div class="text-gray-600">
-                <span>Law</span>
-                <span>2023-01-02</span>
-            </div>
-            <div class="card-text">
-                This is another test legal document content preview.
-            </div>
-        </div>
-    </body>
-    </html>
-    """
\ No newline at end of file
+    return _SAMPLE_HTML
\ No newline at end of file
@@ -1,3 +1,5 @@
+import asyncio
+import httpx
 import pytest
 import requests
 import os
@@ -6,21 +8,24 @@ from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
+# Request body shared by the flow tests (never mutated)
+SEARCH_PAYLOAD = {
+    "query": "test query",
+    "preferences": {
+        "verbosity": "detailed",
+        "format": "simple",
+        "citations": True,
+        "max_results": 5
+    }
+}
+
 
 @pytest.mark.e2e
 class TestFullAPIFlow:
     """End-to-end tests for the full API flow with mocked backend services."""
     
-    @patch("app.api.dependencies.get_query_service")
-    @patch("app.api.dependencies.get_document_service")
-    def test_search_and_get_document_flow(
-        self,
-        mock_get_document_service,
-        mock_get_query_service,
-        client,
-        mock_query_service,
-        mock_document_service
-    ):
+    @pytest.mark.usefixtures("override_services")
+    def test_search_and_get_document_flow(self, client):
         """
         Test the full search and document retrieval flow.
         
@@ -28,27 +33,13 @@ class TestFullAPIFlow:
         2. Get a specific document from the search results
         3. Generate a report
         """
-        # Setup mocks
-        mock_get_query_service.return_value = mock_query_service
-        mock_get_document_service.return_value = mock_document_service
-        
         # Step 1: Search for documents
-        search_payload = {
-            "query": "test legal document",
-            "preferences": {
-                "verbosity": "detailed",
-                "format": "simple",
-                "citations": True,
-                "max_results": 5
-            }
-        }
-        
-        search_response = client.post("/api/v1/search/query", json=search_payload)
+        search_response = client.post("/api/v1/search/query", json=SEARCH_PAYLOAD)
         assert search_response.status_code == 200
         search_result = search_response.json()
         
         # Verify search result
-        assert search_result["original_query"] == "test legal document"
+        assert search_result["original_query"] == "test query"
         assert len(search_result["documents"]) > 0
         assert "response" in search_result
         
@@ -65,14 +56,29 @@ class TestFullAPIFlow:
         assert "metadata" in document
         assert document["metadata"]["id"] == document_id
         
-        # Step 3: Generate a report
-        # Use patching to avoid actual file creation
-        with patch("fastapi.responses.FileResponse") as mock_file_response:
-            mock_file_response.return_value.status_code = 200
-            report_response = client.post("/api/v1/search/report", json=search_payload)
+        # Step 3: Generate a report (rendered in memory, no file is created)
+        report_response = client.post("/api/v1/search/report", json=SEARCH_PAYLOAD)
         
         assert report_response.status_code == 200
     
+    @pytest.mark.usefixtures("override_services")
+    def test_concurrent_independent_requests(self, asgi_transport):
+        """Test that independent requests can be issued concurrently against the app."""
+        async def run():
+            async with httpx.AsyncClient(transport=asgi_transport, base_url="http://test") as client:
+                return await asyncio.gather(
+                    client.post("/api/v1/search/query", json=SEARCH_PAYLOAD),
+                    client.get("/api/v1/documents/doc_123"),
+                    client.get("/api/v1/documents/doc_456")
+                )
+        
+        search_response, first_response, second_response = asyncio.run(run())
+        
+        assert search_response.status_code == 200
+        assert search_response.json()["documents"]
+        assert first_response.json()["metadata"]["id"] == "doc_123"
+        assert second_response.json()["metadata"]["id"] == "doc_456"
+    
     @patch("app.infrastructure.scrapers.bpk_scraper.BPKScraper.search")
     @patch("app.api.dependencies.get_openai_client")
     @patch("app.api.dependencies.get_indobert_client")
@@ -112,51 +118,52 @@ class TestFullAPIFlow:
 class TestErrorFlows:
     """End-to-end tests for error scenarios."""
     
-    def test_invalid_query_flow(self, client):
-        """Test flow with an invalid (empty) query."""
-        # Make request with empty query
-        payload = {
-            "query": "",  # Empty query
-            "preferences": {
-                "verbosity": "detailed",
-                "format": "simple",
-                "citations": True,
-                "max_results": 5
-            }
-        }
-        
-        response = client.post("/api/v1/search/query", json=payload)
-        
-        # Verify error response
-        assert response.status_code == 422
-        data = response.json()
-        assert "detail" in data
-        assert "timestamp" in data
-        assert "status_code" in data
-    
-    def test_non_existent_document_flow(self, client):
-        """Test flow with a non-existent document ID."""
-        # Try to get a non-existent document
-        response = client.get("/api/v1/documents/non_existent_id")
+    @pytest.mark.parametrize(
+        "method, url, payload, expected_statuses, expected_keys",
+        [
+            pytest.param(
+                "POST",
+                "/api/v1/search/query",
+                {
+                    "query": "",  # Empty query
+                    "preferences": {
+                        "verbosity": "detailed",
+                        "format": "simple",
+                        "citations": True,
+                        "max_results": 5
+                    }
+                },
+                (422,),
+                ("detail", "timestamp", "status_code"),
+                id="invalid_query"
+            ),
+            pytest.param(
+                "GET",
+                "/api/v1/documents/non_existent_id",
+                None,
+                (404,),
+                ("detail", "timestamp", "status_code"),
+                id="non_existent_document"
+            ),
+            pytest.param(
+                "POST",
+                "/api/v1/documents/extract-pdf",
+                {
+                    "pdf_url": "not-a-valid-url",
+                    "title": "Invalid PDF"
+                },
+                (400, 422, 500),
+                ("detail",),
+                id="invalid_pdf_url"
+            )
+        ]
+    )
+    def test_error_flow(self, client, method, url, payload, expected_statuses, expected_keys):
+        """Test that invalid requests get an error response."""
+        response = client.request(method, url, json=payload)
         
         # Verify error response
-        assert response.status_code == 404
-        data = response.json()
-        assert "detail" in data
-        assert "timestamp" in data
-        assert "status_code" in data
-    
-    def test_invalid_pdf_url_flow(self, client):
-        """Test flow with an invalid PDF URL."""
-        # Try to extract content from an invalid PDF URL
-        payload = {
-            "pdf_url": "not-a-valid-url",
-            "title": "Invalid PDF"
-        }
-        
-        response = client.post("/api/v1/documents/extract-pdf", json=payload)
-        
-        # Response should indicate error
-        assert response.status_code in [400, 422, 500]
+        assert response.status_code in expected_statuses
         data = response.json()
-        assert "detail" in data
\ No newline at end of file
+        for key in expected_keys:
+            assert key in data
\ No newline at end of file
@@ -1,36 +1,51 @@
+import dataclasses
+import io
 import json
+import mmap
+import re
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from unittest.mock import patch
+from PyPDF2 import PdfWriter
 
 from app.api.dependencies import get_query_service, get_document_service
+from app.api.routes import documents as documents_routes
+from app.config import get_settings
 from app.core.exceptions import InvalidQueryError, DocumentNotFoundError
 
+# Request bodies shared by the search tests (never mutated)
+SEARCH_PAYLOAD = {
+    "query": "test query",
+    "preferences": {
+        "verbosity": "detailed",
+        "format": "simple",
+        "citations": True,
+        "max_results": 5
+    }
+}
+
+EMPTY_QUERY_PAYLOAD = {**SEARCH_PAYLOAD, "query": ""}
+BLANK_QUERY_PAYLOAD = {**SEARCH_PAYLOAD, "query": "   "}
+
+
+def _blank_pdf() -> bytes:
+    """Build a one-page PDF without text."""
+    writer = PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
 
 @pytest.mark.integration
+@pytest.mark.usefixtures("override_services")
 class TestSearchRoutes:
     """Tests for the search routes."""
     
-    @patch("app.api.routes.search.get_query_service")
-    def test_search_query_endpoint(self, mock_get_query_service, client, mock_query_service):
+    def test_search_query_endpoint(self, client, mock_query_service):
         """Test the search query endpoint."""
-        # Setup mock
-        mock_get_query_service.return_value = mock_query_service
-        
-        # Define request payload
-        payload = {
-            "query": "test query",
-            "preferences": {
-                "verbosity": "detailed",
-                "format": "simple",
-                "citations": True,
-                "max_results": 5
-            }
-        }
-        
         # Make request
-        response = client.post("/api/v1/search/query", json=payload)
+        response = client.post("/api/v1/search/query", json=SEARCH_PAYLOAD)
         
         # Assert response
         assert response.status_code == 200
@@ -43,26 +58,13 @@ class TestSearchRoutes:
         # Verify service called
         mock_query_service.process_query.assert_called_once()
     
-    @patch("app.api.routes.search.get_query_service")
-    def test_search_query_invalid_query(self, mock_get_query_service, client, mock_query_service):
-        """Test the search query endpoint with an invalid query."""
+    def test_search_query_invalid_query(self, client, mock_query_service):
+        """Test the search query endpoint with a query the service rejects."""
         # Setup mock to raise exception
-        mock_get_query_service.return_value = mock_query_service
         mock_query_service.process_query.side_effect = InvalidQueryError("Invalid query")
         
-        # Define request payload with empty query
-        payload = {
-            "query": "",
-            "preferences": {
-                "verbosity": "detailed",
-                "format": "simple",
-                "citations": True,
-                "max_results": 5
-            }
-        }
-        
-        # Make request
-        response = client.post("/api/v1/search/query", json=payload)
+        # Make request (a blank query passes request validation and reaches the service)
+        response = client.post("/api/v1/search/query", json=BLANK_QUERY_PAYLOAD)
         
         # Assert response
         assert response.status_code == 400
@@ -70,12 +72,20 @@ class TestSearchRoutes:
         assert "detail" in data
         assert "Invalid query" in data["detail"]
     
-    @patch("app.api.routes.search.get_query_service")
-    def test_simple_search_endpoint(self, mock_get_query_service, client, mock_query_service):
-        """Test the simple search endpoint."""
-        # Setup mock
-        mock_get_query_service.return_value = mock_query_service
+    def test_search_query_empty_query(self, client, mock_query_service):
+        """Test that an empty query is rejected by request validation."""
+        # Make request
+        response = client.post("/api/v1/search/query", json=EMPTY_QUERY_PAYLOAD)
         
+        # Assert response
+        assert response.status_code == 422
+        assert "detail" in response.json()
+        
+        # Verify service not called
+        mock_query_service.process_query.assert_not_called()
+    
+    def test_simple_search_endpoint(self, client, mock_query_service):
+        """Test the simple search endpoint."""
         # Make request
         response = client.get("/api/v1/search/simple?query=test%20query&max_results=5")
         
@@ -90,43 +100,46 @@ class TestSearchRoutes:
         # Verify service called
         mock_query_service.process_query.assert_called_once()
     
-    @patch("app.api.routes.search.get_query_service")
-    def test_generate_report_endpoint(self, mock_get_query_service, client, mock_query_service):
+    def test_generate_report_endpoint(self, client, mock_query_service):
         """Test the generate report endpoint."""
         # Setup mock
-        mock_get_query_service.return_value = mock_query_service
-        mock_query_service.generate_report.return_value = "test_report.html"
+        mock_query_service.render_report.return_value = "<html>test report</html>"
         
-        # Define request payload
-        payload = {
-            "query": "test query",
-            "preferences": {
-                "verbosity": "detailed",
-                "format": "simple",
-                "citations": True,
-                "max_results": 5
-            }
-        }
+        # Make request
+        response = client.post("/api/v1/search/report", json=SEARCH_PAYLOAD)
+        
+        # Assert response
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+        assert response.headers["content-disposition"] == (
+            'attachment; filename="legal_report_test_query.html"; '
+            "filename*=UTF-8''legal_report_test_query.html"
+        )
+        assert response.text == "<html>test report</html>"
+    
+    def test_generate_report_non_ascii_filename(self, client, mock_query_service):
+        """Test the generate report endpoint encodes non-ASCII queries in the filename."""
+        # Setup mock
+        mock_query_service.render_report.return_value = "<html>test report</html>"
         
         # Make request
-        with patch("fastapi.responses.FileResponse") as mock_file_response:
-            mock_file_response.return_value.status_code = 200
-            response = client.post("/api/v1/search/report", json=payload)
+        response = client.post("/api/v1/search/report", json={**SEARCH_PAYLOAD, "query": 'pajak "daerah" é'})
         
         # Assert response
         assert response.status_code == 200
+        assert response.headers["content-disposition"] == (
+            'attachment; filename="legal_report_pajak__daerah___.html"; '
+            "filename*=UTF-8''legal_report_pajak_%22daerah%22_%C3%A9.html"
+        )
 
 
 @pytest.mark.integration
+@pytest.mark.usefixtures("override_services")
 class TestDocumentRoutes:
     """Tests for the document routes."""
     
-    @patch("app.api.routes.documents.get_document_service")
-    def test_get_document_endpoint(self, mock_get_document_service, client, mock_document_service):
+    def test_get_document_endpoint(self, client, mock_document_service):
         """Test the get document endpoint."""
-        # Setup mock
-        mock_get_document_service.return_value = mock_document_service
-        
         # Make request
         response = client.get("/api/v1/documents/doc_123")
         
@@ -140,11 +153,9 @@ class TestDocumentRoutes:
         # Verify service called
         mock_document_service.get_document_by_id.assert_called_once_with("doc_123")
     
-    @patch("app.api.routes.documents.get_document_service")
-    def test_get_document_not_found(self, mock_get_document_service, client, mock_document_service):
+    def test_get_document_not_found(self, client, mock_document_service):
         """Test the get document endpoint with a non-existent document ID."""
         # Setup mock to raise exception
-        mock_get_document_service.return_value = mock_document_service
         mock_document_service.get_document_by_id.side_effect = DocumentNotFoundError("doc_999")
         
         # Make request
@@ -156,12 +167,8 @@ class TestDocumentRoutes:
         assert "detail" in data
         assert "not found" in data["detail"]
     
-    @patch("app.api.routes.documents.get_document_service")
-    def test_extract_pdf_content_endpoint(self, mock_get_document_service, client, mock_document_service):
+    def test_extract_pdf_content_endpoint(self, client, mock_document_service):
         """Test the extract PDF content endpoint."""
-        # Setup mock
-        mock_get_document_service.return_value = mock_document_service
-        
         # Define request payload
         payload = {
             "pdf_url": "https://example.com/test.pdf",
@@ -181,11 +188,9 @@ class TestDocumentRoutes:
         # Verify service called
         mock_document_service.extract_pdf_content.assert_called_once()
     
-    @patch("app.api.routes.documents.get_document_service")
-    def test_extract_pdf_content_failure(self, mock_get_document_service, client, mock_document_service):
+    def test_extract_pdf_content_failure(self, client, mock_document_service):
         """Test the extract PDF content endpoint when extraction fails."""
         # Setup mock to return None
-        mock_get_document_service.return_value = mock_document_service
         mock_document_service.extract_pdf_content.return_value = None
         
         # Define request payload
@@ -201,4 +206,73 @@ class TestDocumentRoutes:
         assert response.status_code == 422
         data = response.json()
         assert "detail" in data
-        assert "Failed to extract content" in data["detail"]
\ No newline at end of file
+        assert "Failed to extract content" in data["detail"]
+    
+    @pytest.mark.parametrize(
+        "upload",
+        [
+            ("spoofed.pdf", b"%PDF-1.4 not really", "text/plain"),
+            ("fake.pdf", b"<html>not a pdf</html>", "application/pdf"),
+            ("empty.pdf", b"", "application/pdf"),
+        ],
+        ids=["spoofed-mime", "non-pdf-bytes", "empty"],
+    )
+    def test_upload_pdf_rejects_non_pdf(self, client, mock_document_service, upload):
+        """Test the upload PDF endpoint rejects files that are not PDFs."""
+        # Make request
+        response = client.post("/api/v1/documents/upload-pdf", files={"file": upload})
+        
+        # Assert response
+        assert response.status_code == 415
+        assert response.json() == {"detail": "Uploaded file must be a PDF"}
+        
+        # Verify extraction never ran
+        mock_document_service.pdf_extractor.extract_from_binary.assert_not_called()
+    
+    def test_upload_pdf_too_large(self, client, mock_document_service, monkeypatch):
+        """Test the upload PDF endpoint rejects files over the size limit."""
+        # Shrink the limit below the upload size
+        small_settings = dataclasses.replace(get_settings(), MAX_UPLOAD_BYTES=16)
+        monkeypatch.setattr(documents_routes, "get_settings", lambda: small_settings)
+        
+        # Make request
+        response = client.post(
+            "/api/v1/documents/upload-pdf",
+            files={"file": ("large.pdf", _blank_pdf(), "application/pdf")},
+        )
+        
+        # Assert response
+        assert response.status_code == 413
+        assert response.json() == {"detail": "Uploaded file exceeds the maximum size of 16 bytes"}
+        mock_document_service.pdf_extractor.extract_from_binary.assert_not_called()
+    
+    def test_upload_pdf_endpoint(self, client, mock_document_service):
+        """Test the upload PDF endpoint extracts from the spooled, mapped file."""
+        body = _blank_pdf()
+        seen = {}
+        
+        def extract_from_binary(pdf_binary, source, title):
+            # The mapping is closed once the request ends, so inspect it here
+            seen["mapped"] = isinstance(pdf_binary, mmap.mmap)
+            seen["body"] = pdf_binary[:]
+            return "Test binary PDF content.", {"title": title, "source": source, "pages": 1, "type": "pdf"}
+        
+        mock_document_service.pdf_extractor.extract_from_binary.side_effect = extract_from_binary
+        
+        # Make request
+        response = client.post(
+            "/api/v1/documents/upload-pdf",
+            files={"file": ("report.pdf", body, "application/pdf")},
+            data={"title": "Uploaded Report"},
+        )
+        
+        # Assert response
+        assert response.status_code == 200
+        data = response.json()
+        assert data["content"] == "Test binary PDF content."
+        assert data["metadata"]["title"] == "Uploaded Report"
+        assert re.fullmatch(r"upload_[0-9a-f]{16}", data["metadata"]["id"])
+        
+        # Verify extraction ran over the mapped upload
+        assert seen == {"mapped": True, "body": body}
+        assert data["metadata"]["id"] in mock_document_service.documents
\ No newline at end of file
@@ -0,0 +1,67 @@
+import pytest
+from unittest.mock import patch
+
+from app.core import cache
+from app.core.cache import TTLCache
+
+
+@pytest.mark.core
+class TestTTLCache:
+    """Tests for the TTLCache."""
+    
+    def test_set_and_get(self):
+        """Test storing and retrieving a value."""
+        ttl_cache = TTLCache(ttl=60)
+        ttl_cache.set(("query", "prefs"), "result")
+        
+        assert ttl_cache.get(("query", "prefs")) == "result"
+        assert ttl_cache.get(("query", "other")) is None
+    
+    def test_expired_entry(self):
+        """Test that expired entries are not returned."""
+        ttl_cache = TTLCache(ttl=10)
+        
+        with patch.object(cache.time, "monotonic", return_value=100.0):
+            ttl_cache.set(("query",), "result")
+        
+        with patch.object(cache.time, "monotonic", return_value=111.0):
+            assert ttl_cache.get(("query",)) is None
+        
+        # Expired entry should be purged
+        assert len(ttl_cache) == 0
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        ttl_cache = TTLCache(ttl=60, maxsize=2)
+        ttl_cache.set(("a",), 1)
+        ttl_cache.set(("b",), 2)
+        
+        # Touch "a" so "b" becomes least recently used
+        ttl_cache.get(("a",))
+        ttl_cache.set(("c",), 3)
+        
+        assert ttl_cache.get(("a",)) == 1
+        assert ttl_cache.get(("b",)) is None
+        assert ttl_cache.get(("c",)) == 3
+    
+    def test_invalidate_prefix(self):
+        """Test invalidating entries by key prefix."""
+        ttl_cache = TTLCache(ttl=60)
+        ttl_cache.set(("hak tanah", "concise"), 1)
+        ttl_cache.set(("hak tanah", "detailed"), 2)
+        ttl_cache.set(("peraturan", "detailed"), 3)
+        
+        removed = ttl_cache.invalidate("hak tanah")
+        
+        assert removed == 2
+        assert ttl_cache.get(("hak tanah", "concise")) is None
+        assert ttl_cache.get(("peraturan", "detailed")) == 3
+    
+    def test_invalidate_all(self):
+        """Test clearing the whole cache."""
+        ttl_cache = TTLCache(ttl=60)
+        ttl_cache.set(("a",), 1)
+        ttl_cache.set(("b",), 2)
+        
+        assert ttl_cache.invalidate() == 2
+        assert len(ttl_cache) == 0
\ No newline at end of file
@@ -0,0 +1,139 @@
+import json
+import logging
+import logging.handlers
+import sys
+import pytest
+from datetime import datetime
+
+from app.core import logging as app_logging
+from app.core.logging import JsonFormatter, setup_logging, shutdown_logging
+
+
+def _make_record(msg: str = "Test message", exc_info=None) -> logging.LogRecord:
+    """Create a log record for formatter tests."""
+    return logging.LogRecord(
+        name="test_logger",
+        level=logging.INFO,
+        pathname="test.py",
+        lineno=10,
+        msg=msg,
+        args=None,
+        exc_info=exc_info
+    )
+
+
+@pytest.mark.core
+class TestJsonFormatter:
+    """Tests for the JsonFormatter."""
+    
+    def test_format_basic_fields(self):
+        """Test that standard fields are included in the JSON output."""
+        formatter = JsonFormatter()
+        record = _make_record()
+        
+        data = json.loads(formatter.format(record))
+        
+        assert data["message"] == "Test message"
+        assert data["level"] == "INFO"
+        assert data["name"] == "test_logger"
+        assert data["lineno"] == 10
+        assert data["timestamp"] == datetime.fromtimestamp(record.created).isoformat()
+    
+    def test_format_extra_attributes(self):
+        """Test that extra attributes are included and reserved ones are not."""
+        formatter = JsonFormatter()
+        record = _make_record()
+        record.status_code = 200
+        record.client_host = "127.0.0.1"
+        
+        data = json.loads(formatter.format(record))
+        
+        assert data["status_code"] == 200
+        assert data["client_host"] == "127.0.0.1"
+        assert "msg" not in data
+        assert "args" not in data
+        assert "levelno" not in data
+    
+    def test_format_non_serializable_extra(self):
+        """Test that non-JSON extras are rendered as strings."""
+        formatter = JsonFormatter()
+        record = _make_record()
+        record.payload = object()
+        
+        data = json.loads(formatter.format(record))
+        
+        assert data["payload"].startswith("<object object")
+    
+    def test_format_exception(self):
+        """Test that exception info is formatted and cached on the record."""
+        formatter = JsonFormatter()
+        try:
+            raise ValueError("Test error")
+        except ValueError:
+            record = _make_record(exc_info=sys.exc_info())
+        
+        data = json.loads(formatter.format(record))
+        
+        assert "ValueError: Test error" in data["exception"]
+        assert record.exc_text == data["exception"]
+
+
+@pytest.mark.core
+class TestSetupLogging:
+    """Tests for setup_logging."""
+    
+    @pytest.fixture(autouse=True)
+    def private_state(self, monkeypatch):
+        """Give each test its own queue and listener so shutting it down leaves app logging alone."""
+        monkeypatch.setattr(app_logging, "_state", app_logging._LogState())
+        yield
+        shutdown_logging()
+    
+    def test_setup_logging_writes_file_via_queue(self, tmp_path):
+        """Test that queued records reach the file handler with exception info."""
+        log_file = tmp_path / "test.log"
+        logger = setup_logging(
+            name="test_queue_logger",
+            log_file=str(log_file),
+            json_format=True
+        )
+        
+        try:
+            raise ValueError("Queued error")
+        except ValueError:
+            logger.error("Something failed: %s", "details", exc_info=True)
+        
+        # Flush the background listener
+        shutdown_logging()
+        
+        data = json.loads(log_file.read_text().strip().splitlines()[-1])
+        assert data["message"] == "Something failed: details"
+        assert "ValueError: Queued error" in data["exception"]
+    
+    def test_loggers_share_listener_and_file_handler(self, tmp_path):
+        """Test that loggers with the same output share one listener and one open file."""
+        log_file = str(tmp_path / "test.log")
+        first = setup_logging(name="test_shared_first", log_file=log_file)
+        listener = app_logging._state.listener
+        second = setup_logging(name="test_shared_second", log_file=log_file)
+        
+        assert app_logging._state.listener is listener
+        assert first.handlers[0].targets is second.handlers[0].targets
+        
+        first.info("first record")
+        second.info("second record")
+        shutdown_logging()
+        
+        lines = (tmp_path / "test.log").read_text().splitlines()
+        assert len(lines) == 2
+    
+    def test_records_after_shutdown_are_written(self, tmp_path):
+        """Test that loggers write directly once the listener has been stopped."""
+        log_file = tmp_path / "test.log"
+        logger = setup_logging(name="test_after_shutdown", log_file=str(log_file))
+        
+        shutdown_logging()
+        logger.info("late record")
+        
+        assert not any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers)
+        assert "late record" in log_file.read_text()
\ No newline at end of file
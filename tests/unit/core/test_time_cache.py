@@ -0,0 +1,43 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from app.core import time_cache
+from app.core.time_cache import iso_now
+
+
+@pytest.mark.core
+class TestIsoNow:
+    """Tests for the cached ISO timestamp helper."""
+    
+    def test_iso_now_format(self):
+        """Test that iso_now returns a parseable ISO timestamp."""
+        result = iso_now()
+        
+        # Should parse back into a datetime with whole seconds
+        parsed = datetime.fromisoformat(result)
+        assert parsed.microsecond == 0
+    
+    def test_iso_now_cached_within_second(self):
+        """Test that the timestamp is reused within the same second."""
+        with patch.object(time_cache.time, "time", return_value=1700000000.1):
+            first = iso_now()
+        
+        with patch.object(time_cache.time, "time", return_value=1700000000.9), \
+                patch.object(time_cache, "datetime") as mock_datetime:
+            second = iso_now()
+        
+        # Should not format again for the same second
+        mock_datetime.fromtimestamp.assert_not_called()
+        assert first == second
+    
+    def test_iso_now_refreshes_next_second(self):
+        """Test that the timestamp is refreshed when the second changes."""
+        with patch.object(time_cache.time, "time", return_value=1700000000.5):
+            first = iso_now()
+        
+        with patch.object(time_cache.time, "time", return_value=1700000001.5):
+            second = iso_now()
+        
+        assert first != second
+        assert second == datetime.fromtimestamp(1700000001).isoformat()
\ No newline at end of file
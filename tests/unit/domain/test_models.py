@@ -53,6 +53,15 @@ class TestDocument:
         assert doc.content == "Test page content"
         assert doc.metadata["title"] == "Test Document"
     
+    def test_document_from_dict_trusted(self):
+        """Test that trusted dictionaries build the same Document without validation."""
+        data = {
+            "page_content": "Test page content",
+            "metadata": {"title": "Test Document"}
+        }
+        
+        assert Document.from_dict(data, _trusted=True) == Document.from_dict(data)
+    
     def test_document_from_dict_validation(self):
         """Test validation when creating a Document from an invalid dictionary."""
         # Try with invalid data
@@ -67,11 +76,9 @@ class TestDocument:
                 self.page_content = page_content
                 self.metadata = metadata or {}
         
-        # Patch import
-        import sys
-        sys.modules['langchain_core.documents'] = type('mockmodule', (), {
-            'Document': MockLangChainDocument
-        })
+        # Patch the LangChain Document class resolved at import time
+        from app.domain import models
+        monkeypatch.setattr(models, "_LangChainDocument", MockLangChainDocument)
         
         # Create document
         doc = Document(
@@ -86,9 +93,15 @@ class TestDocument:
         assert isinstance(lc_doc, MockLangChainDocument)
         assert lc_doc.page_content == "Test content"
         assert lc_doc.metadata["title"] == "Test Document"
+    
+    def test_to_langchain_document_unavailable(self, monkeypatch):
+        """Test that the document is returned unchanged without LangChain."""
+        from app.domain import models
+        monkeypatch.setattr(models, "_LangChainDocument", None)
         
-        # Clean up
-        del sys.modules['langchain_core.documents']
+        doc = Document(content="Test content")
+        
+        assert doc.to_langchain_document() is doc
 
 
 class TestSearchQuery:
@@ -118,27 +131,17 @@ class TestSearchQuery:
         assert query.max_pages == 5  # Default
         assert query.max_results == 10  # Default
     
-    def test_search_query_validation(self):
+    @pytest.mark.parametrize("kwargs", [
+        pytest.param({"query": ""}, id="empty_query"),
+        pytest.param({"query": "test", "max_pages": 0}, id="max_pages_too_low"),
+        pytest.param({"query": "test", "max_pages": 21}, id="max_pages_too_high"),
+        pytest.param({"query": "test", "max_results": 0}, id="max_results_too_low"),
+        pytest.param({"query": "test", "max_results": 51}, id="max_results_too_high"),
+    ])
+    def test_search_query_validation(self, kwargs):
         """Test validation for SearchQuery."""
-        # Empty query should fail
-        with pytest.raises(ValidationError):
-            SearchQuery(query="")
-        
-        # Max pages too low
-        with pytest.raises(ValidationError):
-            SearchQuery(query="test", max_pages=0)
-        
-        # Max pages too high
-        with pytest.raises(ValidationError):
-            SearchQuery(query="test", max_pages=21)
-        
-        # Max results too low
-        with pytest.raises(ValidationError):
-            SearchQuery(query="test", max_results=0)
-        
-        # Max results too high
         with pytest.raises(ValidationError):
-            SearchQuery(query="test", max_results=51)
+            SearchQuery(**kwargs)
 
 
 class TestUserPreferences:
@@ -182,7 +185,7 @@ class TestUserPreferences:
         )
         
         # Convert to dict
-        prefs_dict = prefs.dict()
+        prefs_dict = prefs.model_dump()
         
         # Check dict values
         assert prefs_dict["verbosity"] == "comprehensive"
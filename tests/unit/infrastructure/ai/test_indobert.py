@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.cache import TTLCache
+from app.infrastructure.ai.indobert import IndoBERTClient
+
+
+@pytest.fixture
+def indobert_client() -> IndoBERTClient:
+    """IndoBERT client with the model replaced by canned embeddings."""
+    client = IndoBERTClient.__new__(IndoBERTClient)
+    client.is_available = True
+    client.get_embeddings = MagicMock()
+    return client
+
+
+@pytest.mark.unit
+class TestIndoBERTRanking:
+    """Tests for IndoBERT document ranking."""
+    
+    def test_rank_documents_single_batch(self, indobert_client):
+        """Test that the query and documents are embedded in one call."""
+        indobert_client.get_embeddings.return_value = [
+            [1.0, 0.0],
+            [0.0, 1.0],
+            [1.0, 1.0],
+            [2.0, 0.0]
+        ]
+        documents = [{"content": "a"}, {"content": "b"}, {"content": "c"}]
+        
+        ranked = indobert_client.rank_documents("query", documents)
+        
+        indobert_client.get_embeddings.assert_called_once_with(["query", "a", "b", "c"])
+        assert [doc["content"] for doc in ranked] == ["c", "b", "a"]
+        assert ranked[0]["relevance_score"] == pytest.approx(1.0)
+        assert ranked[1]["relevance_score"] == pytest.approx(0.7071, abs=1e-4)
+        assert ranked[2]["relevance_score"] == 0.0
+    
+    def test_rank_documents_empty_content(self, indobert_client):
+        """Test that documents without content score zero and are not embedded."""
+        indobert_client.get_embeddings.return_value = [[1.0, 0.0], [1.0, 0.0]]
+        documents = [{"content": ""}, {"content": "b"}, {}]
+        
+        ranked = indobert_client.rank_documents("query", documents)
+        
+        indobert_client.get_embeddings.assert_called_once_with(["query", "b"])
+        assert [doc.get("content") for doc in ranked] == ["b", "", None]
+        assert [doc["relevance_score"] for doc in ranked] == [1.0, 0.0, 0.0]
+    
+    def test_rank_indices(self, indobert_client):
+        """Test that texts are ranked by index without touching the inputs."""
+        indobert_client.get_embeddings.return_value = [[1.0, 0.0], [0.0, 1.0], [1.0, 0.0]]
+        
+        order = indobert_client.rank_indices("query", ["a", None, "b"])
+        
+        indobert_client.get_embeddings.assert_called_once_with(["query", "a", "b"])
+        assert order == [2, 0, 1]
+    
+    def test_calculate_similarity(self, indobert_client):
+        """Test cosine similarity for lists, arrays and zero vectors."""
+        assert indobert_client.calculate_similarity([1.0, 0.0], [1.0, 1.0]) == pytest.approx(0.7071, abs=1e-4)
+        assert indobert_client.calculate_similarity(np.array([3.0, 4.0]), np.array([3.0, 4.0])) == pytest.approx(1.0)
+        assert indobert_client.calculate_similarity([1.0, 0.0], [-1.0, 0.0]) == 0.0
+        assert indobert_client.calculate_similarity([0.0, 0.0], [1.0, 0.0]) == 0.0
+    
+    def test_rank_documents_zero_embedding(self, indobert_client):
+        """Test that zero embeddings give a similarity of zero."""
+        indobert_client.get_embeddings.return_value = [[0.0, 0.0], [1.0, 0.0]]
+        
+        ranked = indobert_client.rank_documents("query", [{"content": "a"}])
+        
+        assert ranked[0]["relevance_score"] == 0.0
+
+
+@pytest.mark.unit
+class TestIndoBERTEmbeddings:
+    """Tests for IndoBERT embedding batching."""
+    
+    def test_get_embeddings_length_sorted_batches(self):
+        """Test that texts are batched by token length and returned in input order."""
+        client = IndoBERTClient.__new__(IndoBERTClient)
+        client.is_available = True
+        client.batch_size = 2
+        client._embedding_cache = TTLCache(ttl=60)
+        client.tokenizer = MagicMock(side_effect=lambda texts, **kwargs: {
+            "input_ids": [[0] * len(text) for text in texts]
+        })
+        client._get_batch_embeddings = MagicMock(side_effect=lambda batch: np.array([[float(len(text))] for text in batch]))
+        
+        embeddings = client.get_embeddings(["ccc", "a", "dddd", "bb"])
+        
+        # Batches should group the shortest texts together
+        batches = [call.args[0] for call in client._get_batch_embeddings.call_args_list]
+        assert batches == [["a", "bb"], ["ccc", "dddd"]]
+        assert embeddings.tolist() == [[3.0], [1.0], [4.0], [2.0]]
+    
+    def test_get_embeddings_cached(self):
+        """Test that repeated texts are embedded only once."""
+        client = IndoBERTClient.__new__(IndoBERTClient)
+        client.is_available = True
+        client.batch_size = 16
+        client._embedding_cache = TTLCache(ttl=60)
+        client.tokenizer = MagicMock(side_effect=lambda texts, **kwargs: {
+            "input_ids": [[0] * len(text) for text in texts]
+        })
+        client._get_batch_embeddings = MagicMock(side_effect=lambda batch: np.array([[float(len(text))] for text in batch]))
+        
+        first = client.get_embeddings(["a", "bb", "a"])
+        second = client.get_embeddings(["bb", "ccc"])
+        
+        # Only unseen texts should reach the model
+        batches = [call.args[0] for call in client._get_batch_embeddings.call_args_list]
+        assert batches == [["a", "bb"], ["ccc"]]
+        assert first.tolist() == [[1.0], [2.0], [1.0]]
+        assert second.tolist() == [[2.0], [3.0]]
+    
+    def test_get_embeddings_unavailable(self):
+        """Test that dummy embeddings are returned when the model is unavailable."""
+        client = IndoBERTClient.__new__(IndoBERTClient)
+        client.is_available = False
+        
+        embeddings = client.get_embeddings(["a", "b"])
+        
+        assert embeddings.shape == (2, 768)
+        assert not embeddings.any()
+        assert client.get_embeddings_as_list(["a"]) == [[0.0] * 768]
\ No newline at end of file
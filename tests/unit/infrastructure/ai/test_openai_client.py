@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.exceptions import OpenAIError
+from app.infrastructure.ai.openai_client import OpenAIClient
+
+
+def _completion(content: str) -> MagicMock:
+    """Build a fake chat completion with the given content."""
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+
+@pytest.fixture
+def openai_client() -> OpenAIClient:
+    """OpenAI client with a mocked async API client."""
+    client = OpenAIClient(api_key=None)
+    client.is_available = True
+    client.aclient = MagicMock()
+    client.aclient.chat.completions.create = AsyncMock(
+        side_effect=lambda **kwargs: _completion(kwargs["messages"][0]["content"].upper())
+    )
+    return client
+
+
+@pytest.mark.unit
+class TestOpenAIClientAsync:
+    """Tests for the async OpenAI client methods."""
+    
+    def test_ainvoke(self, openai_client):
+        """Test that ainvoke wraps a string prompt and returns the content."""
+        result = asyncio.run(openai_client.ainvoke("hello"))
+        
+        assert result == "HELLO"
+        kwargs = openai_client.aclient.chat.completions.create.call_args.kwargs
+        assert kwargs["messages"] == [{"role": "user", "content": "hello"}]
+    
+    def test_abatch_invoke_preserves_order(self, openai_client):
+        """Test that batched prompts return results in prompt order."""
+        results = asyncio.run(openai_client.abatch_invoke(["a", "b", "c"]))
+        
+        assert results == ["A", "B", "C"]
+        assert openai_client.aclient.chat.completions.create.await_count == 3
+    
+    def test_ainvoke_error(self, openai_client):
+        """Test that API failures are raised as OpenAIError."""
+        openai_client.aclient.chat.completions.create = AsyncMock(side_effect=RuntimeError("boom"))
+        
+        with pytest.raises(OpenAIError):
+            asyncio.run(openai_client.ainvoke("hello"))
+    
+    def test_ainvoke_unavailable(self):
+        """Test that an unavailable client returns the placeholder response."""
+        client = OpenAIClient(api_key=None)
+        
+        assert asyncio.run(client.ainvoke("hello")) == "OpenAI processing unavailable"
+
+
+@pytest.mark.unit
+class TestOpenAIClientKeywords:
+    """Tests for keyword extraction."""
+    
+    def test_extract_keywords_cached(self):
+        """Test that repeated queries reuse the extracted keywords."""
+        client = OpenAIClient(api_key=None)
+        client.is_available = True
+        client.invoke = MagicMock(return_value="pajak, undang-undang")
+        
+        first = client.extract_keywords("Pajak Penghasilan")
+        second = client.extract_keywords("  pajak penghasilan ")
+        
+        assert first == second == ["pajak", "undang-undang"]
+        client.invoke.assert_called_once()
+    
+    def test_extract_keywords_fallback_not_cached(self):
+        """Test that failed extractions fall back without being cached."""
+        client = OpenAIClient(api_key=None)
+        client.is_available = True
+        client.invoke = MagicMock(side_effect=[OpenAIError("boom"), "pajak"])
+        
+        assert client.extract_keywords("pajak penghasilan") == ["pajak", "penghasilan"]
+        assert client.extract_keywords("pajak penghasilan") == ["pajak"]
\ No newline at end of file
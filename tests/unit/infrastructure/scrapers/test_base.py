@@ -0,0 +1,257 @@
+import asyncio
+import httpx
+import pytest
+from bs4 import BeautifulSoup
+from unittest.mock import MagicMock, patch
+
+from app.core.exceptions import DependencyNotFoundError
+from app.infrastructure.scrapers import base
+from app.infrastructure.scrapers.base import BaseScraper, _compile_selector
+
+
+def _streamed_response(body: bytes, content_type: str = "text/html") -> MagicMock:
+    """Build a fake streamed requests response."""
+    response = MagicMock(headers={"Content-Type": content_type})
+    response.__enter__.return_value = response
+    response.iter_content.side_effect = lambda size: (body[i:i + size] for i in range(0, len(body), size))
+    return response
+
+
+class DummyScraper(BaseScraper):
+    """Minimal concrete scraper for testing the base class."""
+    
+    def search(self, query, max_pages=5, max_results=10):
+        return []
+
+
+@pytest.mark.scraper
+class TestBaseScraperSession:
+    """Tests for the shared scraper session."""
+    
+    def test_session_reused_between_pages(self):
+        """Test that page fetches share one session."""
+        scraper = DummyScraper()
+        
+        with patch.object(scraper, "create_session") as mock_create_session:
+            mock_create_session.return_value.get.side_effect = lambda *args, **kwargs: _streamed_response(b"<p>ok</p>")
+            
+            first = scraper.get_page_content("https://example.com/a")
+            second = scraper.get_page_content("https://example.com/b")
+        
+        mock_create_session.assert_called_once()
+        assert first.get_text() == "ok"
+        assert second.get_text() == "ok"
+    
+    def test_close_releases_session(self):
+        """Test that closing the scraper closes its session."""
+        with patch.object(DummyScraper, "create_session") as mock_create_session:
+            with DummyScraper() as scraper:
+                session = scraper.session
+            
+            session.close.assert_called_once()
+            assert scraper._session is None
+    
+    def test_get_page_tree(self, monkeypatch):
+        """Test that pages parse into a selectolax tree when it is installed."""
+        scraper = DummyScraper()
+        monkeypatch.setattr(scraper, "_fetch_html", lambda url, params=None, max_bytes=None: b"<p class='x'>ok</p>")
+        
+        if base.LexborHTMLParser is not None:
+            assert scraper.get_page_tree("https://example.com/a").css_first("p.x").text() == "ok"
+        
+        monkeypatch.setattr(base, "LexborHTMLParser", None)
+        with pytest.raises(DependencyNotFoundError):
+            scraper.get_page_tree("https://example.com/a")
+
+
+@pytest.mark.scraper
+class TestBaseScraperFetch:
+    """Tests for fetching page bodies."""
+    
+    def test_fetch_html_capped(self, monkeypatch):
+        """Test that page bodies are read only up to the size cap."""
+        monkeypatch.setattr(base, "STREAM_CHUNK_SIZE", 4)
+        scraper = DummyScraper()
+        scraper._session = MagicMock()
+        scraper._session.get.return_value = _streamed_response(b"<p>" + b"x" * 100 + b"</p>")
+        
+        assert scraper._fetch_html("https://example.com/a", max_bytes=10) == b"<p>xxxxxxx"
+    
+    def test_fetch_html_skips_non_html(self):
+        """Test that non-HTML responses are not returned for parsing."""
+        scraper = DummyScraper()
+        scraper._session = MagicMock()
+        scraper._session.get.return_value = _streamed_response(b"%PDF-1.4", "application/pdf")
+        
+        assert scraper._fetch_html("https://example.com/a.pdf") is None
+    
+    def test_afetch_html_capped(self):
+        """Test that async page bodies are read only up to the size cap."""
+        scraper = DummyScraper()
+        scraper._aclient = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, html="<p>" + "x" * 100 + "</p>")
+        ))
+        
+        assert asyncio.run(scraper._afetch_html("https://example.com/a", max_bytes=10)) == b"<p>xxxxxxx"
+
+
+@pytest.mark.scraper
+class TestBaseScraperSelectors:
+    """Tests for CSS selector extraction."""
+    
+    def test_extract_elements_with_compiled_selectors(self):
+        """Test that the first matching selector is used and compiled selectors are reused."""
+        scraper = DummyScraper()
+        soup = BeautifulSoup("<h1> Title </h1><p class='x'>a</p><p class='x'>b</p>", "html.parser")
+        
+        assert scraper.extract_elements(soup, [".missing", "h1"]) == "Title"
+        assert scraper.extract_all_elements(soup, [".missing", "p.x"]) == ["a", "b"]
+        assert scraper.extract_elements(soup, [".missing"]) is None
+        assert _compile_selector("p.x") is _compile_selector("p.x")
+    
+    @pytest.mark.parametrize("parser_name", ["lxml", "html.parser"])
+    def test_selectors_match_across_parsers(self, sample_html_content, parser_name):
+        """Test that the lxml and pure-Python parsers give the same extraction results."""
+        if parser_name == "lxml":
+            pytest.importorskip("lxml")
+        
+        scraper = DummyScraper()
+        soup = BeautifulSoup(sample_html_content, parser_name)
+        
+        assert scraper.extract_all_elements(soup, ["h3 a"]) == ["Test Legal Document 1", "Test Legal Document 2"]
+        assert scraper.extract_elements(soup, [".card-text"]) == "This is a test legal document content preview."
+
+
+@pytest.mark.scraper
+class TestBaseScraperPdfLinks:
+    """Tests for PDF link extraction."""
+    
+    HTML = (
+        b'<a href="/docs/one.pdf"> Peraturan <b>Satu</b> </a>'
+        b'<a href="https://example.org/two.PDF"></a>'
+        b'<a href="/docs/three.pdf?download=1#page=2"></a>'
+        b'<a href="/page.html">Page</a><a href="/guide.pdf.html">Guide</a><a>No link</a>'
+    )
+    
+    EXPECTED = [
+        {
+            "url": "https://example.com/docs/one.pdf",
+            "text": "Peraturan Satu",
+            "source_page": "https://example.com/list"
+        },
+        {
+            "url": "https://example.org/two.PDF",
+            "text": "two.PDF",
+            "source_page": "https://example.com/list"
+        },
+        {
+            "url": "https://example.com/docs/three.pdf?download=1#page=2",
+            "text": "three.pdf",
+            "source_page": "https://example.com/list"
+        }
+    ]
+    
+    @pytest.mark.parametrize("use_selectolax", [True, False])
+    def test_find_pdf_anchors(self, monkeypatch, use_selectolax):
+        """Test that both full-page parser backends extract the same PDF links."""
+        if not use_selectolax:
+            monkeypatch.setattr(base, "LexborHTMLParser", None)
+        elif base.LexborHTMLParser is None:
+            pytest.skip("selectolax not installed")
+        
+        scraper = DummyScraper()
+        links = scraper._build_pdf_links(scraper._find_pdf_anchors(self.HTML), "https://example.com/list")
+        
+        assert links == self.EXPECTED
+    
+    def test_streamed_pdf_anchors(self):
+        """Test that PDF links are collected from a page fed in small chunks."""
+        if base.etree is None:
+            pytest.skip("lxml not installed")
+        
+        scraper = DummyScraper()
+        parser, collector = scraper._new_pdf_anchor_parser()
+        for start in range(0, len(self.HTML), 7):
+            parser.feed(self.HTML[start:start + 7])
+        anchors = scraper._close_pdf_anchor_parser(parser, collector)
+        
+        assert scraper._build_pdf_links(anchors, "https://example.com/list") == self.EXPECTED
+    
+    def test_fetch_pdf_anchors_capped(self, monkeypatch):
+        """Test that streamed pages are parsed only up to the size cap."""
+        if base.etree is None:
+            pytest.skip("lxml not installed")
+        
+        monkeypatch.setattr(base, "STREAM_CHUNK_SIZE", 8)
+        scraper = DummyScraper()
+        scraper._session = MagicMock()
+        body = b'<a href="/one.pdf">One</a>' + b"x" * 100 + b'<a href="/two.pdf">Two</a>'
+        scraper._session.get.return_value = _streamed_response(body)
+        
+        assert scraper._fetch_pdf_anchors("https://example.com/a", max_bytes=40) == [("/one.pdf", "One")]
+    
+    def test_fetch_pdf_anchors_skips_non_html(self):
+        """Test that non-HTML responses are not fed to the streaming parser."""
+        scraper = DummyScraper()
+        scraper._session = MagicMock()
+        scraper._session.get.return_value = _streamed_response(b"%PDF-1.4", "application/pdf")
+        
+        assert scraper._fetch_pdf_anchors("https://example.com/a.pdf") is None
+    
+    def test_afetch_pdf_anchors_skips_non_html(self):
+        """Test that non-HTML async responses are not fed to the streaming parser."""
+        scraper = DummyScraper()
+        scraper._aclient = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=b"%PDF-1.4", headers={"Content-Type": "application/pdf"})
+        ))
+        
+        assert asyncio.run(scraper._afetch_pdf_anchors("https://example.com/a.pdf")) is None
+    
+    def test_streamed_pdf_anchors_empty_page(self):
+        """Test that an empty page yields no PDF links."""
+        if base.etree is None:
+            pytest.skip("lxml not installed")
+        
+        parser, collector = DummyScraper._new_pdf_anchor_parser()
+        
+        assert DummyScraper._close_pdf_anchor_parser(parser, collector) == []
+
+
+@pytest.mark.scraper
+class TestBaseScraperAsync:
+    """Tests for concurrent page fetching."""
+    
+    def test_afind_pdf_links_batch(self):
+        """Test that PDF links are found for each page in URL order."""
+        pages = {
+            "/a": '<a href="/docs/one.pdf">One</a><a href="/about">About</a>',
+            "/b": '<a href="https://cdn.example.com/two.PDF"></a>'
+        }
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path not in pages:
+                return httpx.Response(404)
+            return httpx.Response(200, text=pages[request.url.path])
+        
+        async def run():
+            scraper = DummyScraper()
+            scraper._aclient = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return await scraper.afind_pdf_links_batch([
+                    "https://example.com/a",
+                    "https://example.com/b",
+                    "https://example.com/missing"
+                ], concurrency=2)
+            finally:
+                await scraper.aclose()
+        
+        results = asyncio.run(run())
+        
+        assert results[0] == [{
+            "url": "https://example.com/docs/one.pdf",
+            "text": "One",
+            "source_page": "https://example.com/a"
+        }]
+        assert results[1][0]["url"] == "https://cdn.example.com/two.PDF"
+        assert results[1][0]["text"] == "two.PDF"
+        assert results[2] == []
\ No newline at end of file
@@ -0,0 +1,306 @@
+import asyncio
+import re
+import pytest
+from selectolax.lexbor import LexborHTMLParser
+from unittest.mock import MagicMock, patch
+
+from app.domain.models import Document
+from app.infrastructure.scrapers.bpk_scraper import BPKScraper
+
+DETAIL_TEXT = "Peraturan tentang pajak daerah dan retribusi daerah. " * 10
+
+
+def _pages(search_html: str) -> dict:
+    """Build fake responses for a search page and its detail pages."""
+    return {
+        "https://peraturan.bpk.go.id/Search": search_html.encode(),
+        "https://peraturan.bpk.go.id/Home/Detail/1": f'<div class="card-body">{DETAIL_TEXT}</div>'.encode(),
+        "https://peraturan.bpk.go.id/Home/Detail/2": f'<div class="card-body">{DETAIL_TEXT}</div>'.encode(),
+    }
+
+
+@pytest.mark.scraper
+class TestBPKScraperSearchResults:
+    """Tests for parsing peraturan.bpk.go.id search results."""
+    
+    def _scrape(self, search_html: str):
+        scraper = BPKScraper()
+        pages = _pages(search_html)
+        
+        with patch.object(scraper, "_fetch_html", side_effect=lambda url, params=None, max_bytes=None: pages.get(url)):
+            return scraper.scrape_peraturan_bpk("pajak", max_pages=1)
+    
+    def test_card_results(self):
+        """Test that card results yield documents with their metadata."""
+        documents = self._scrape(
+            '<div class="card"><h3 class="fw-bold text-gray-800 mb-5">'
+            '<a href="/Home/Detail/1">Peraturan Satu</a></h3>'
+            '<div class="text-gray-600"><span>Regulation</span><span>2023-01-01</span></div></div>'
+        )
+        
+        assert len(documents) == 1
+        assert documents[0].metadata["title"] == "Peraturan Satu"
+        assert documents[0].metadata["type"] == "Regulation"
+        assert documents[0].metadata["date"] == "2023-01-01"
+        assert documents[0].content == DETAIL_TEXT.strip()
+    
+    def test_title_link_priority(self):
+        """Test that the first title selector with a detail link wins."""
+        tree = LexborHTMLParser(
+            '<div class="card"><a href="/about">Tentang</a><a href="/Home/Detail/1">Lampiran</a>'
+            '<h3><a href="/Details/2">Peraturan Dua</a></h3></div>'
+        )
+        
+        results = BPKScraper()._parse_search_results(tree, 1)
+        
+        assert [(result["title"], result["link"]) for result in results] == [
+            ("Peraturan Dua", "https://peraturan.bpk.go.id/Details/2")
+        ]
+    
+    def test_absolute_link(self):
+        """Test that result links resolve against the site root."""
+        scraper = BPKScraper()
+        
+        assert scraper._absolute_link("/Home/Detail/1") == "https://peraturan.bpk.go.id/Home/Detail/1"
+        assert scraper._absolute_link("Home/Detail/1") == "https://peraturan.bpk.go.id/Home/Detail/1"
+        assert scraper._absolute_link("//cdn.bpk.go.id/a.pdf") == "https://cdn.bpk.go.id/a.pdf"
+        assert scraper._absolute_link("http://example.com/x") == "http://example.com/x"
+    
+    def test_content_container_with_enough_text(self):
+        """Test that short content containers are skipped for the next candidate."""
+        scraper = BPKScraper()
+        result = {
+            "title": "Satu",
+            "link": "https://peraturan.bpk.go.id/Home/Detail/1",
+            "type": "Law",
+            "date": "2023",
+            "preview": "",
+            "page": 1
+        }
+        doc_tree = LexborHTMLParser(f'<div class="card-body">Menu</div><article>{DETAIL_TEXT}</article>')
+        
+        document = scraper._build_result_document(result, doc_tree)
+        
+        assert document.content == DETAIL_TEXT.strip()
+    
+    def test_content_from_paragraphs(self):
+        """Test that long paragraphs are joined when no container has enough text."""
+        paragraphs = ["Pasal 1 mengatur ketentuan umum pajak daerah.", "Pasal 2 mengatur objek pajak."] * 3
+        doc_tree = LexborHTMLParser("".join(f"<p>{text}</p>" for text in paragraphs) + "<p>Menu</p>")
+        
+        content = BPKScraper._extract_content(doc_tree)
+        
+        assert content == "\n\n".join(paragraphs)
+    
+    def test_content_from_body_without_scripts(self):
+        """Test that the body text fallback leaves out scripts and styles."""
+        doc_tree = LexborHTMLParser(
+            f'<body><span>{DETAIL_TEXT}</span><script>var x = 1;</script><style>b {{}}</style></body>'
+        )
+        
+        content = BPKScraper._extract_content(doc_tree)
+        
+        assert content == DETAIL_TEXT.strip()
+    
+    def test_content_invisible_characters_removed(self):
+        """Test that byte order marks and zero-width spaces are dropped from content."""
+        scraper = BPKScraper()
+        result = {
+            "title": "Satu",
+            "link": "https://peraturan.bpk.go.id/Home/Detail/1",
+            "type": "Law",
+            "date": "2023",
+            "preview": "",
+            "page": 1
+        }
+        doc_tree = LexborHTMLParser(f'<article>\ufeff{DETAIL_TEXT}Pasal\xa01\u200b</article>')
+        
+        document = scraper._build_result_document(result, doc_tree)
+        
+        assert document.content == f"{DETAIL_TEXT}Pasal 1"
+    
+    def test_detail_link_fallback(self):
+        """Test that bare detail links are used when no result containers match."""
+        documents = self._scrape(
+            '<ul><li><a href="/Home/Detail/1">Peraturan Satu</a></li>'
+            '<li><a href="/Home/Detail/2">Peraturan Dua</a></li></ul>'
+        )
+        
+        assert [doc.metadata["title"] for doc in documents] == ["Peraturan Satu", "Peraturan Dua"]
+        assert documents[1].metadata["source"] == "https://peraturan.bpk.go.id/Home/Detail/2"
+    
+    def test_duplicate_links_fetched_once(self):
+        """Test that a document linked twice is fetched once."""
+        scraper = BPKScraper()
+        pages = _pages(
+            '<a href="/Home/Detail/1">Peraturan Satu</a>'
+            '<a href="https://PERATURAN.bpk.go.id/Home/Detail/1/">Peraturan Satu</a>'
+        )
+        
+        with patch.object(scraper, "_fetch_html", side_effect=lambda url, params=None, max_bytes=None: pages.get(url)) as mock_fetch:
+            documents = scraper.scrape_peraturan_bpk("pajak", max_pages=1)
+        
+        assert len(documents) == 1
+        assert mock_fetch.call_count == 2
+    
+    def test_detail_executor_shared_between_searches(self):
+        """Test that searches reuse one detail page executor until the scraper is closed."""
+        scraper = BPKScraper()
+        pages = _pages('<a href="/Home/Detail/1">Peraturan Satu</a>')
+        
+        with patch.object(scraper, "_fetch_html", side_effect=lambda url, params=None, max_bytes=None: pages.get(url)):
+            scraper.scrape_peraturan_bpk("pajak", max_pages=1)
+            executor = scraper.detail_executor
+            scraper.scrape_peraturan_bpk("retribusi", max_pages=1)
+        
+        assert scraper.detail_executor is executor
+        
+        scraper.close()
+        assert scraper._detail_executor is None
+    
+    def test_async_scrape_matches_sync(self):
+        """Test that the async scraper fetches detail pages and keeps result order."""
+        scraper = BPKScraper()
+        pages = _pages(
+            '<ul><li><a href="/Home/Detail/1">Peraturan Satu</a></li>'
+            '<li><a href="/Home/Detail/2">Peraturan Dua</a></li></ul>'
+        )
+        
+        async def fetch(url, params=None, max_bytes=None):
+            return pages.get(url)
+        
+        with patch.object(scraper, "_afetch_html", side_effect=fetch) as mock_fetch:
+            documents = asyncio.run(scraper.ascrape_peraturan_bpk("pajak", max_pages=1))
+        
+        assert [doc.metadata["title"] for doc in documents] == ["Peraturan Satu", "Peraturan Dua"]
+        assert mock_fetch.call_count == 3
+
+
+@pytest.mark.scraper
+class TestBPKScraperSearch:
+    """Tests for the combined search pipeline."""
+    
+    def test_helpers_created_on_first_use(self):
+        """Test that the PDF extractor and text processor are built lazily and kept."""
+        with patch("app.infrastructure.scrapers.bpk_scraper.PDFExtractor") as mock_extractor, \
+                patch("app.infrastructure.scrapers.bpk_scraper.IndonesianTextProcessor") as mock_processor:
+            scraper = BPKScraper()
+            
+            mock_extractor.assert_not_called()
+            mock_processor.assert_not_called()
+            
+            assert scraper.pdf_extractor is scraper.pdf_extractor
+            assert scraper.text_processor is scraper.text_processor
+            mock_extractor.assert_called_once_with()
+            mock_processor.assert_called_once_with()
+    
+    def test_search_preprocesses_query_once(self):
+        """Test that search hands the processed query on without processing it again."""
+        scraper = BPKScraper()
+        scraper.pdf_extractor.is_available = True
+        
+        with patch.object(scraper, "preprocess_query", return_value="pajak daerah") as mock_preprocess, \
+                patch.object(scraper, "_fetch_html", return_value=None), \
+                patch.object(scraper, "find_pdf_links", return_value=[]):
+            scraper.search("pajak", max_pages=1)
+        
+        mock_preprocess.assert_called_once_with("pajak")
+    
+    def test_search_ranks_merged_documents_once(self):
+        """Test that search ranks the merged documents in a single IndoBERT pass."""
+        indobert_client = MagicMock(is_available=True)
+        indobert_client.rank_indices.side_effect = lambda query, texts: list(range(len(texts)))[::-1]
+        scraper = BPKScraper(indobert_client=indobert_client)
+        scraper.pdf_extractor.is_available = True
+        pages = _pages('<a href="/Home/Detail/1">Peraturan Satu</a><a href="/Home/Detail/2">Peraturan Dua</a>')
+        
+        with patch.object(scraper, "preprocess_query", return_value="pajak"), \
+                patch.object(scraper, "_fetch_html", side_effect=lambda url, params=None, max_bytes=None: pages.get(url)), \
+                patch.object(scraper, "find_pdf_links", return_value=[]):
+            documents = scraper.search("pajak", max_pages=1)
+        
+        indobert_client.rank_indices.assert_called_once()
+        assert [doc.metadata["title"] for doc in documents] == ["Peraturan Dua", "Peraturan Satu"]
+    
+    def test_search_pdf_documents_deduplicated_in_order(self):
+        """Test that each PDF is extracted once and documents keep link order."""
+        scraper = BPKScraper()
+        scraper.pdf_extractor.is_available = True
+        links = [
+            {"url": f"https://peraturan.bpk.go.id/files/{name}.pdf", "text": name, "source_page": "page"}
+            for name in ("satu", "dua", "satu")
+        ]
+        
+        with patch.object(scraper, "find_pdf_links", return_value=links), \
+                patch.object(scraper.pdf_extractor, "download_and_extract",
+                             side_effect=lambda url, headers, title: (f"isi {title}", {"title": title})) as mock_extract:
+            documents = scraper.search_pdf_documents("pajak", max_pages=1, preprocessed=True, rank=False)
+        
+        assert [doc.metadata["title"] for doc in documents] == ["satu", "dua"]
+        assert mock_extract.call_count == 2
+
+
+@pytest.mark.scraper
+class TestBPKScraperPreprocessQuery:
+    """Tests for query preprocessing."""
+    
+    def test_enhanced_query_cached(self):
+        """Test that repeated queries reuse the OpenAI enhancement."""
+        openai_client = MagicMock(is_available=True)
+        openai_client.invoke.return_value = " hak ulayat masyarakat hukum adat "
+        scraper = BPKScraper(openai_client=openai_client)
+        
+        first = scraper.preprocess_query("hak tanah adat")
+        second = scraper.preprocess_query("  Hak Tanah Adat")
+        
+        assert first == second == "hak ulayat masyarakat hukum adat"
+        openai_client.invoke.assert_called_once()
+    
+    def test_short_query_skips_openai(self):
+        """Test that queries below the word threshold use the rule-based enhancement."""
+        openai_client = MagicMock(is_available=True)
+        scraper = BPKScraper(openai_client=openai_client)
+        
+        result = scraper.preprocess_query("ulayat")
+        
+        openai_client.invoke.assert_not_called()
+        assert result == scraper.text_processor.enhance_query_with_legal_terms("ulayat")
+
+
+@pytest.mark.scraper
+class TestBPKScraperReport:
+    """Tests for the HTML report."""
+    
+    def test_saved_report_matches_rendered(self, tmp_path, monkeypatch):
+        """Test that the report written piece by piece matches the rendered report."""
+        monkeypatch.chdir(tmp_path)
+        scraper = BPKScraper()
+        documents = [
+            Document(content="Isi\nperaturan", metadata={"title": "Satu", "source": "https://a", "type": "Law", "date": "2023"}),
+            Document(content="Isi PDF", metadata={"title": "Dua", "source": "https://b", "type": "Law (PDF)"})
+        ]
+        
+        filename = scraper.generate_html_report("pajak daerah?", documents, "Jawaban\nsingkat")
+        rendered = scraper.render_html_report("pajak daerah?", documents, "Jawaban\nsingkat")
+        
+        with open(filename, encoding="utf-8") as f:
+            saved = f.read()
+        
+        search_date = re.compile(r"Search Date:</strong> [^<]*")
+        assert filename.startswith("bpk_report_pajak_daerah_")
+        assert search_date.sub("", saved) == search_date.sub("", rendered)
+        assert "2. Dua" in saved
+    
+    def test_report_escapes_scraped_text(self):
+        """Test that scraped titles and content cannot inject markup into the report."""
+        documents = [
+            Document(content="a < b", metadata={"title": "<script>alert(1)</script>", "source": "https://a?x=1&y=2"})
+        ]
+        
+        report = BPKScraper().render_html_report("<b>pajak</b>", documents, "Jawaban")
+        
+        assert "<script>" not in report
+        assert "&lt;script&gt;alert(1)&lt;/script&gt;" in report
+        assert "https://a?x=1&amp;y=2" in report
+        assert "&lt;b&gt;pajak&lt;/b&gt;" in report
+        assert "a &lt; b" in report
\ No newline at end of file
@@ -0,0 +1,81 @@
+import pytest
+
+from app.core.cache import TTLCache
+from app.services.document_service import DocumentService, _document_id
+
+
+@pytest.mark.service
+class TestDocumentServiceSearchCache:
+    """Tests for caching scraped documents in the DocumentService."""
+    
+    def test_search_documents_uses_cache(self, mock_bpk_scraper):
+        """Test that repeated searches are served from the cache."""
+        service = DocumentService(bpk_scraper=mock_bpk_scraper, search_cache=TTLCache(ttl=60))
+        
+        first = service.search_documents("hak tanah ulayat")
+        second = service.search_documents("hak tanah ulayat")
+        
+        # Should only scrape once, and still register the documents
+        mock_bpk_scraper.search.assert_called_once()
+        assert second == first
+        assert all(service.documents[doc.metadata["id"]] is doc for doc in second)
+    
+    def test_search_documents_cache_keyed_by_limits(self, mock_bpk_scraper):
+        """Test that different page and result limits are cached separately."""
+        service = DocumentService(bpk_scraper=mock_bpk_scraper, search_cache=TTLCache(ttl=60))
+        
+        service.search_documents("hak tanah ulayat", max_pages=1)
+        service.search_documents("hak tanah ulayat", max_pages=2)
+        
+        assert mock_bpk_scraper.search.call_count == 2
+    
+    def test_search_documents_does_not_cache_empty_results(self, mock_bpk_scraper):
+        """Test that searches without documents are scraped again."""
+        mock_bpk_scraper.search.return_value = []
+        service = DocumentService(bpk_scraper=mock_bpk_scraper, search_cache=TTLCache(ttl=60))
+        
+        service.search_documents("hak tanah ulayat")
+        service.search_documents("hak tanah ulayat")
+        
+        assert mock_bpk_scraper.search.call_count == 2
+    
+    def test_invalidate_cache(self, mock_bpk_scraper):
+        """Test invalidating cached documents for a query."""
+        service = DocumentService(bpk_scraper=mock_bpk_scraper, search_cache=TTLCache(ttl=60))
+        
+        service.search_documents("hak tanah ulayat")
+        assert service.invalidate_cache("hak tanah ulayat") == 1
+        
+        service.search_documents("hak tanah ulayat")
+        assert mock_bpk_scraper.search.call_count == 2
+    
+    def test_search_documents_without_cache(self, mock_bpk_scraper):
+        """Test that every search scrapes when the cache is disabled."""
+        service = DocumentService(bpk_scraper=mock_bpk_scraper)
+        
+        service.search_documents("hak tanah ulayat")
+        service.search_documents("hak tanah ulayat")
+        
+        assert mock_bpk_scraper.search.call_count == 2
+        assert service.invalidate_cache() == 0
+
+
+@pytest.mark.service
+class TestDocumentServiceIds:
+    """Tests for document ID generation."""
+    
+    def test_document_id_stable(self):
+        """Test that IDs depend only on the prefix and content."""
+        assert _document_id("doc", "Isi peraturan") == _document_id("doc", "Isi peraturan")
+        assert _document_id("doc", "Isi peraturan") != _document_id("doc", "Isi peraturan lain")
+        assert _document_id("pdf", "Isi peraturan").startswith("pdf_")
+        assert len(_document_id("doc", "Isi peraturan")) == len("doc_") + 16
+    
+    def test_search_documents_registers_ids(self, mock_bpk_scraper):
+        """Test that searched documents are stored under their content IDs."""
+        service = DocumentService(bpk_scraper=mock_bpk_scraper)
+        
+        documents = service.search_documents("hak tanah ulayat")
+        
+        assert documents[0].metadata["id"] == _document_id("doc", "Test content 1")
+        assert service.get_document_by_id(documents[0].metadata["id"]) is documents[0]
\ No newline at end of file
@@ -0,0 +1,110 @@
+import pytest
+
+from app.core.cache import TTLCache
+from app.domain.models import Document, UserPreferences
+from app.services.query_service import QueryService
+
+
+@pytest.mark.service
+class TestQueryServiceCache:
+    """Tests for search result caching in the QueryService."""
+    
+    def test_process_query_uses_cache(self, mock_document_service):
+        """Test that repeated queries are served from the cache."""
+        service = QueryService(
+            document_service=mock_document_service,
+            result_cache=TTLCache(ttl=60)
+        )
+        
+        first = service.process_query("hak tanah ulayat")
+        second = service.process_query("hak tanah ulayat")
+        
+        # Should only search once
+        assert second is first
+        mock_document_service.search_documents.assert_called_once()
+    
+    def test_process_query_cache_keyed_by_preferences(self, mock_document_service):
+        """Test that different preferences are cached separately."""
+        service = QueryService(
+            document_service=mock_document_service,
+            result_cache=TTLCache(ttl=60)
+        )
+        
+        service.process_query("hak tanah ulayat", UserPreferences(verbosity="concise"))
+        service.process_query("hak tanah ulayat", UserPreferences(verbosity="detailed"))
+        
+        assert mock_document_service.search_documents.call_count == 2
+    
+    def test_process_query_does_not_cache_empty_results(self, mock_document_service):
+        """Test that results without documents are not cached."""
+        mock_document_service.search_documents.return_value = []
+        service = QueryService(
+            document_service=mock_document_service,
+            result_cache=TTLCache(ttl=60)
+        )
+        
+        service.process_query("hak tanah ulayat")
+        service.process_query("hak tanah ulayat")
+        
+        assert mock_document_service.search_documents.call_count == 2
+    
+    def test_invalidate_cache(self, mock_document_service):
+        """Test invalidating cached results for a query."""
+        service = QueryService(
+            document_service=mock_document_service,
+            result_cache=TTLCache(ttl=60)
+        )
+        
+        service.process_query("hak tanah ulayat")
+        assert service.invalidate_cache("hak tanah ulayat") == 1
+        
+        service.process_query("hak tanah ulayat")
+        assert mock_document_service.search_documents.call_count == 2
+    
+    def test_process_query_without_cache(self, mock_document_service):
+        """Test that no caching happens when the cache is disabled."""
+        service = QueryService(document_service=mock_document_service)
+        
+        service.process_query("hak tanah ulayat")
+        service.process_query("hak tanah ulayat")
+        
+        assert mock_document_service.search_documents.call_count == 2
+        assert service.invalidate_cache() == 0
+
+
+@pytest.mark.service
+class TestQueryServiceKeywords:
+    """Tests for keyword extraction without OpenAI."""
+    
+    def test_simple_keyword_extraction(self, mock_document_service):
+        """Test that short words, punctuation and repeats are dropped."""
+        service = QueryService(document_service=mock_document_service)
+        
+        keywords = service._simple_keyword_extraction("Hak atas Tanah, tanah ULAYAT dan undang-undang?")
+        
+        assert keywords == ["atas", "tanah", "ulayat", "undang"]
+    
+    def test_simple_keyword_extraction_limit(self, mock_document_service):
+        """Test that at most max_keywords keywords are returned."""
+        service = QueryService(document_service=mock_document_service)
+        
+        assert service._simple_keyword_extraction("pajak bumi bangunan daerah kota", max_keywords=2) == ["pajak", "bumi"]
+
+
+@pytest.mark.service
+class TestQueryServiceSimpleResponse:
+    """Tests for the response generated without OpenAI."""
+    
+    def test_simple_response_previews(self, mock_document_service):
+        """Test that previews are flattened to one line and long content is truncated."""
+        service = QueryService(document_service=mock_document_service)
+        documents = [
+            Document(content="Pasal 1\nKetentuan umum", metadata={"title": "Satu"}),
+            Document(content="x" * 250, metadata={"title": "Dua"})
+        ]
+        
+        response = service._generate_simple_response("pajak", documents)
+        
+        assert "Preview: Pasal 1 Ketentuan umum\n" in response
+        assert f"Preview: {'x' * 200}...\n" in response
+        assert response.endswith("review the full documents in the search results.")
\ No newline at end of file
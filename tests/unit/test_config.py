@@ -0,0 +1,39 @@
+import pytest
+
+from app.config import _env_bool
+
+
+@pytest.mark.core
+class TestEnvBool:
+    """Tests for reading boolean environment variables."""
+    
+    @pytest.mark.parametrize("value", ["1", "true", "True", "T", "yes", "Y", "on", " ON "])
+    def test_true_values(self, monkeypatch, value):
+        """Test that the common truthy spellings read as True."""
+        monkeypatch.setenv("FLAG", value)
+        
+        assert _env_bool("FLAG", False) is True
+    
+    @pytest.mark.parametrize("value", ["0", "false", "FALSE", "f", "no", "N", "off"])
+    def test_false_values(self, monkeypatch, value):
+        """Test that the common falsy spellings read as False."""
+        monkeypatch.setenv("FLAG", value)
+        
+        assert _env_bool("FLAG", True) is False
+    
+    def test_unset_uses_default(self, monkeypatch):
+        """Test that an unset or empty variable falls back to the default."""
+        monkeypatch.delenv("FLAG", raising=False)
+        assert _env_bool("FLAG", True) is True
+        
+        monkeypatch.setenv("FLAG", "")
+        assert _env_bool("FLAG", True) is True
+        assert _env_bool("FLAG", False) is False
+    
+    @pytest.mark.parametrize("value", ["maybe", "2", "enabled"])
+    def test_invalid_value_raises(self, monkeypatch, value):
+        """Test that unrecognised values are rejected instead of read as False."""
+        monkeypatch.setenv("FLAG", value)
+        
+        with pytest.raises(ValueError, match="FLAG"):
+            _env_bool("FLAG", False)
\ No newline at end of file
@@ -0,0 +1,129 @@
+import io
+import os
+import tempfile
+import pytest
+from PyPDF2 import PdfWriter
+from unittest.mock import MagicMock, patch
+
+from app.utils import pdf
+from app.utils.pdf import PDFExtractor
+
+
+def _blank_pdf() -> bytes:
+    """Build a one-page PDF without text."""
+    writer = PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _streamed_response(body: bytes) -> MagicMock:
+    """Build a fake streamed requests response."""
+    response = MagicMock(headers={"Content-Length": str(len(body))})
+    response.__enter__.return_value = response
+    response.iter_content.side_effect = lambda size: (body[i:i + size] for i in range(0, len(body), size))
+    return response
+
+
+@pytest.mark.utils
+class TestPDFExtractorDownload:
+    """Tests for downloading PDFs with the PDFExtractor."""
+    
+    def test_downloads_share_session(self):
+        """Test that PDFs are streamed over one shared session."""
+        extractor = PDFExtractor()
+        body = _blank_pdf()
+        
+        with patch.object(extractor, "create_session") as mock_create_session:
+            mock_get = mock_create_session.return_value.get
+            mock_get.side_effect = lambda *args, **kwargs: _streamed_response(body)
+            
+            first = extractor.download_and_extract("https://example.com/a.pdf", title="A")
+            second = extractor.download_and_extract("https://example.com/b.pdf", title="B")
+        
+        mock_create_session.assert_called_once()
+        assert mock_get.call_count == 2
+        assert mock_get.call_args.kwargs["stream"] is True
+        assert first[1]["pages"] == 1
+        assert second[1]["title"] == "B"
+    
+    def test_download_failure(self):
+        """Test that a failed download returns no content."""
+        extractor = PDFExtractor()
+        
+        with patch.object(extractor, "create_session") as mock_create_session:
+            response = _streamed_response(b"")
+            response.raise_for_status.side_effect = Exception("404")
+            mock_create_session.return_value.get.return_value = response
+            
+            assert extractor.download_and_extract("https://example.com/missing.pdf") == (None, None)
+    
+    def test_extract_from_binary(self):
+        """Test that PDF bytes are parsed in memory."""
+        extractor = PDFExtractor()
+        
+        content, metadata = extractor.extract_from_binary(_blank_pdf(), source="upload", title="Blank")
+        
+        assert content == ""
+        assert metadata["source"] == "upload"
+        assert metadata["title"] == "Blank"
+        assert metadata["pages"] == 1
+    
+    def test_identical_pdf_parsed_once(self):
+        """Test that identical PDF bytes are only parsed once."""
+        extractor = PDFExtractor()
+        body = _blank_pdf()
+        
+        with patch.object(extractor, "_parse", wraps=extractor._parse) as mock_parse:
+            first = extractor.extract_from_binary(body, source="upload:a.pdf", title="A")
+            second = extractor.extract_from_binary(body, source="upload:b.pdf", title="B")
+        
+        mock_parse.assert_called_once()
+        assert second[0] == first[0]
+        assert second[1]["source"] == "upload:b.pdf"
+        assert second[1]["title"] == "B"
+    
+    def test_pymupdf_backend(self):
+        """Test that the PyMuPDF backend produces the same content layout."""
+        extractor = PDFExtractor()
+        page = MagicMock()
+        page.get_text.return_value = "Pasal 1"
+        doc = MagicMock()
+        doc.__enter__.return_value = doc
+        doc.__iter__.return_value = iter([page])
+        doc.metadata = {"format": "PDF 1.7", "title": "", "author": "BPK"}
+        doc.page_count = 1
+        extractor.backend = "pymupdf"
+        extractor._pdf_module = MagicMock()
+        extractor._pdf_module.open.return_value = doc
+        
+        content, metadata = extractor.extract_from_binary(b"%PDF-1.7", source="upload", title="Scan")
+        
+        assert content == "\n--- Page 1 ---\nPasal 1"
+        assert metadata["title"] == "Scan"
+        assert metadata["author"] == "BPK"
+        assert metadata["pages"] == 1
+    
+    def test_download_file_by_size(self, monkeypatch):
+        """Test that downloads go to memory, a named file or a spool depending on their size."""
+        monkeypatch.setattr(pdf, "PDF_SPOOL_MAX_SIZE", 10)
+        
+        with PDFExtractor._new_download_file(10) as small, PDFExtractor._new_download_file(11) as large, \
+                PDFExtractor._new_download_file(None) as unknown:
+            assert type(small) is io.BytesIO
+            assert os.path.isfile(large.name)
+            assert isinstance(unknown, tempfile.SpooledTemporaryFile)
+    
+    def test_pymupdf_source_avoids_copies(self, tmp_path):
+        """Test that PyMuPDF gets a path or the BytesIO itself, and reads other streams once."""
+        buffer = io.BytesIO(b"%PDF-1.7")
+        assert PDFExtractor._pymupdf_source(buffer) == {"stream": buffer}
+        
+        with tempfile.NamedTemporaryFile(dir=tmp_path, suffix=".pdf") as named:
+            named.write(b"%PDF-1.7")
+            assert PDFExtractor._pymupdf_source(named) == {"filename": named.name}
+        
+        with tempfile.TemporaryFile() as anonymous:
+            anonymous.write(b"%PDF-1.7")
+            assert PDFExtractor._pymupdf_source(anonymous) == {"stream": b"%PDF-1.7"}
\ No newline at end of file
@@ -1,15 +1,23 @@
+import sys
 import pytest
 from unittest.mock import MagicMock, patch
 
 from app.utils.text import IndonesianTextProcessor
 
 
+@pytest.fixture(scope="module")
+def processor() -> IndonesianTextProcessor:
+    """Text processor shared by the tests that do not replace its stemmer."""
+    return IndonesianTextProcessor()
+
+
 class TestIndonesianTextProcessor:
     """Tests for the IndonesianTextProcessor."""
     
     def test_initialization_without_sastrawi(self):
         """Test initialization without Sastrawi."""
-        with patch("app.utils.text.IndonesianTextProcessor.has_stemmer", False):
+        # A None entry in sys.modules makes the Sastrawi import raise ImportError
+        with patch.dict(sys.modules, {"Sastrawi.Stemmer.StemmerFactory": None}):
             processor = IndonesianTextProcessor()
             assert processor.has_stemmer is False
             assert processor.stemmer is None
@@ -43,10 +51,20 @@ class TestIndonesianTextProcessor:
         mock_stemmer.stem.assert_called_once_with(text)
         assert result == "ini adalah teks bahasa indonesia"
     
-    def test_enhance_query_with_legal_terms(self):
-        """Test enhance_query_with_legal_terms method."""
+    def test_stem_text_cached(self):
+        """Test that repeated texts are stemmed only once."""
         processor = IndonesianTextProcessor()
+        processor.stemmer = MagicMock()
+        processor.stemmer.stem.side_effect = lambda text: text.lower()
+        processor.has_stemmer = True
+        
+        assert processor.stem_text("Peraturan") == "peraturan"
+        assert processor.stem_text("Peraturan") == "peraturan"
         
+        processor.stemmer.stem.assert_called_once_with("Peraturan")
+    
+    def test_enhance_query_with_legal_terms(self, processor):
+        """Test enhance_query_with_legal_terms method."""
         # Test with query containing legal terms
         query = "hak tanah"
         result = processor.enhance_query_with_legal_terms(query)
@@ -56,10 +74,8 @@ class TestIndonesianTextProcessor:
         assert "pertanahan" in result
         assert "agraria" in result
     
-    def test_enhance_query_with_legal_terms_no_matches(self):
+    def test_enhance_query_with_legal_terms_no_matches(self, processor):
         """Test enhance_query_with_legal_terms with no matches."""
-        processor = IndonesianTextProcessor()
-        
         # Test with query containing no legal terms
         query = "ini adalah contoh"
         result = processor.enhance_query_with_legal_terms(query)
@@ -67,10 +83,8 @@ class TestIndonesianTextProcessor:
         # Should return original query unchanged
         assert result == query
     
-    def test_extract_keywords(self):
+    def test_extract_keywords(self, processor):
         """Test extract_keywords method."""
-        processor = IndonesianTextProcessor()
-        
         # Test with a sample text
         text = "Peraturan daerah tentang hak tanah ulayat masyarakat adat di provinsi Papua"
         keywords = processor.extract_keywords(text, max_keywords=5)
@@ -84,10 +98,16 @@ class TestIndonesianTextProcessor:
         # Words with <= 3 characters should be filtered out
         assert "di" not in keywords
     
-    def test_clean_html(self):
-        """Test clean_html method."""
-        processor = IndonesianTextProcessor()
+    def test_extract_keywords_strips_punctuation(self, processor):
+        """Test extract_keywords removes punctuation from ASCII and non-ASCII text."""
+        ascii_keywords = processor.extract_keywords("Undang-Undang (UU), pasal_1; agraria.", max_keywords=5)
+        unicode_keywords = processor.extract_keywords("\u201cUndang-Undang\u201d (UU), pasal_1; agraria.", max_keywords=5)
         
+        assert ascii_keywords == ["undang", "pasal_1", "agraria"]
+        assert unicode_keywords == ascii_keywords
+    
+    def test_clean_html(self, processor):
+        """Test clean_html method."""
         # Test with HTML content
         html = "<div><h1>Judul</h1><p>Teks <b>tebal</b> dan <i>miring</i>.</p></div>"
         result = processor.clean_html(html)
@@ -106,10 +126,8 @@ class TestIndonesianTextProcessor:
         assert "dan" in result
         assert "miring" in result
     
-    def test_normalize_whitespace(self):
+    def test_normalize_whitespace(self, processor):
         """Test normalize_whitespace method."""
-        processor = IndonesianTextProcessor()
-        
         # Test with text containing excessive whitespace
         text = "  Ini    adalah  \t  teks  \n  dengan  banyak  spasi  "
         result = processor.normalize_whitespace(text)
@@ -117,10 +135,8 @@ class TestIndonesianTextProcessor:
         # Should normalize whitespace
         assert result == "Ini adalah teks dengan banyak spasi"
     
-    def test_truncate_text(self):
+    def test_truncate_text(self, processor):
         """Test truncate_text method."""
-        processor = IndonesianTextProcessor()
-        
         # Test with long text
         text = "Ini adalah teks yang sangat panjang dan akan dipotong pada batas maksimum."
         